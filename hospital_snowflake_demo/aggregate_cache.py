@@ -0,0 +1,153 @@
+"""
+Aggregate-aware cache for admission trends
+
+The admission trend queries differ only in grain, window and slice:
+get_admission_trends(days) for every period choice, the Physician view's
+filtered trends and department breakdown, and the monthly trends in
+get_strategic_metrics. All of them can be derived from one compact extract:
+daily admissions by department and admission type. The extract holds only
+additive measures, so the derivation is exact:
+
+- admission and emergency counts
+- sum and count of charges
+- sum and count of lengths of stay
+
+Averages are recomputed from those sums and counts. DEPARTMENTS_ACTIVE is
+the number of departments with admissions in a period.
+
+The extract is held as an in-process OLAP cube (olap_cube.Cube). The
+dimensions are date, department and admission type, plus a weather band
+derived from the date when marketplace weather is available.
+
+AggregateCache fetches the extract once for a window (at least
+MIN_WINDOW_DAYS, so a year of monthly trends fits). It then answers these
+requests from the cube in milliseconds, with no warehouse query:
+
+- shorter windows
+- day, week or month grain
+- department, admission type and weather slices
+
+It counts how many requests were satisfied locally.
+"""
+
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from olap_cube import Cube
+
+MIN_WINDOW_DAYS = 366
+GRAINS = {'day': 'D', 'week': 'W-SUN', 'month': 'M'}
+DIMENSIONS = ['ADMISSION_DATE', 'DEPARTMENT_NAME', 'ADMISSION_TYPE']
+MEASURES = ['ADMISSIONS', 'EMERGENCY_ADMISSIONS', 'TOTAL_CHARGES', 'CHARGED_ADMISSIONS', 'LOS_DAYS', 'LOS_ADMISSIONS']
+FACT_COLUMNS = DIMENSIONS + MEASURES + ['AS_OF']
+UNKNOWN_WEATHER = 'Unknown'
+
+
+def weather_band(weather: pd.DataFrame):
+    """Label mapping from admission dates to a weather band (Wet, Cold, Mild or Hot)"""
+    if weather is None or len(weather) == 0:
+        return lambda dates: np.full(len(dates), UNKNOWN_WEATHER, dtype=object)
+    daily = weather.assign(WEATHER_DATE=pd.to_datetime(weather['WEATHER_DATE'])).set_index('WEATHER_DATE')
+    band = pd.Series(np.select(
+        [daily['PRECIPITATION_MM'] >= 1.0, daily['AVG_TEMPERATURE_C'] < 12, daily['AVG_TEMPERATURE_C'] >= 25],
+        ['Wet', 'Cold', 'Hot'], 'Mild'), index=daily.index)
+    band = band[~band.index.duplicated()]
+    return lambda dates: band.reindex(pd.to_datetime(dates)).fillna(UNKNOWN_WEATHER).to_numpy(dtype=object)
+
+
+def build_cube(facts: pd.DataFrame, weather: pd.DataFrame = None) -> Cube:
+    """Admissions cube over an extract, with a WEATHER dimension derived from the date"""
+    facts = facts.assign(ADMISSION_DATE=pd.to_datetime(facts['ADMISSION_DATE']))
+    if 'ADMISSION_TYPE' not in facts:
+        facts = facts.assign(ADMISSION_TYPE='All')
+    cube = Cube.from_frame(facts, DIMENSIONS, MEASURES)
+    return cube.derive('WEATHER', 'ADMISSION_DATE', weather_band(weather))
+
+
+def summarize(cube: Cube, grain: str = 'day', where: dict = None, by=()) -> pd.DataFrame:
+    """Admission measures per period (and ``by`` dimensions); ``grain=None`` for the whole window"""
+    if grain is not None:
+        freq = GRAINS[grain]
+        cube = cube.derive('PERIOD', 'ADMISSION_DATE',
+                           lambda dates: pd.DatetimeIndex(dates).to_period(freq).start_time)
+    keys = (['PERIOD'] if grain is not None else []) + list(by)
+    out = cube.aggregate(keys, where, MEASURES, distinct=['DEPARTMENT_NAME'])
+    out = out.rename(columns={'DEPARTMENT_NAME_COUNT': 'DEPARTMENTS_ACTIVE'})
+    out = out[out['ADMISSIONS'] > 0]
+    out['AVG_CHARGES'] = out['TOTAL_CHARGES'] / out['CHARGED_ADMISSIONS'].where(out['CHARGED_ADMISSIONS'] > 0)
+    out['AVG_LOS_DAYS'] = out['LOS_DAYS'] / out['LOS_ADMISSIONS'].where(out['LOS_ADMISSIONS'] > 0)
+    if not keys:
+        return out.reset_index(drop=True)
+    ascending = [False] * (grain is not None) + [True] * len(by)
+    return out.sort_values(keys, ascending=ascending, ignore_index=True)
+
+
+def rollup(facts: pd.DataFrame, grain: str = 'day', by_department: bool = False) -> pd.DataFrame:
+    """Aggregate daily facts to a coarser grain, one row per period (and department)"""
+    return summarize(build_cube(facts), grain, by=['DEPARTMENT_NAME'] if by_department else ())
+
+
+class AggregateCache:
+    """Admission extract, fetched once per window and sliced locally from a cube"""
+
+    def __init__(self, fetch, min_days: int = MIN_WINDOW_DAYS, today=date.today, weather=None):
+        self._fetch = fetch
+        self._weather = weather
+        self.min_days = min_days
+        self._today = today
+        self._lock = threading.Lock()
+        self._cube = None
+        self._as_of = None
+        self._days = 0
+        self._fetched_on = None
+        self.local_hits = 0
+        self.warehouse_queries = 0
+
+    def cube(self, days: int, count: bool = True):
+        """(cube, as_of) covering the last ``days`` days, fetching the extract when needed"""
+        with self._lock:
+            if self._cube is None or days > self._days or self._fetched_on != self._today():
+                window = max(int(days), self.min_days)
+                fetched = self._fetch(window)
+                if len(fetched) == 0:
+                    # A failed or timed-out fetch keeps serving the previous extract
+                    return self._cube, self._as_of
+                weather = self._weather() if self._weather is not None else None
+                self._cube, self._as_of = build_cube(fetched, weather), pd.Timestamp(fetched['AS_OF'].iloc[0])
+                self._days, self._fetched_on = window, self._today()
+                self.warehouse_queries += 1
+            elif count:
+                self.local_hits += 1
+            return self._cube, self._as_of
+
+    def labels(self, dimension: str, days: int = MIN_WINDOW_DAYS) -> list:
+        """Labels of a dimension, for filter options (not counted as a request)"""
+        cube, _ = self.cube(days, count=False)
+        if cube is None:
+            return []
+        return [label for label in cube.labels[dimension] if not pd.isna(label)]
+
+    def rollup(self, days: int, grain: str = 'day', departments=None, by_department: bool = False,
+               where: dict = None) -> pd.DataFrame:
+        """Admissions over the last ``days`` days at the given grain, for an optional slice"""
+        cube, as_of = self.cube(days)
+        if cube is None:
+            return pd.DataFrame()
+        start = as_of - pd.Timedelta(days=int(days))
+        where = {'ADMISSION_DATE': lambda dates: dates >= start, **(where or {})}
+        if departments is not None:
+            where['DEPARTMENT_NAME'] = departments
+        return summarize(cube, grain, where, by=['DEPARTMENT_NAME'] if by_department else ())
+
+    def invalidate(self):
+        """Drop the cached extract; the next request fetches it again"""
+        with self._lock:
+            self._cube, self._days = None, 0
+
+    def stats(self) -> dict:
+        requests = self.local_hits + self.warehouse_queries
+        return {'requests': requests, 'local_hits': self.local_hits, 'warehouse_queries': self.warehouse_queries,
+                'local_rate': self.local_hits / requests if requests else 0.0}
@@ -0,0 +1,158 @@
+"""
+Rules-based alert engine for the dashboard action items
+
+Each rule is a threshold evaluated as one vectorized mask over a loader's
+frame. Matching rows become a structured alert record (level, headline and
+pre-formatted detail lines), and the records are rendered in one batch with
+a single markdown block per alert instead of one element per row.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+ALERT_COLUMNS = ['RULE', 'LEVEL', 'HEADLINE', 'COUNT', 'ITEMS']
+
+# Utilization thresholds behind the capacity recommendations in
+# loaders.get_capacity_recommendations
+HIGH_DEMAND_UTILIZATION = 90
+NEAR_CAPACITY_UTILIZATION = 80
+REALLOCATION_UTILIZATION = 60
+UNDER_UTILIZATION = 40
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Threshold rule evaluated as a boolean mask over a frame"""
+    name: str
+    level: str  # streamlit callout: error, warning, info or success
+    condition: Callable[[pd.DataFrame], pd.Series]
+    headline: str  # formatted with {count}
+    detail: Optional[Callable[[pd.DataFrame], pd.Series]] = None
+    max_items: Optional[int] = None
+
+
+def fmt(series: pd.Series, spec: str) -> pd.Series:
+    """Format a numeric column with a format spec, e.g. ``fmt(s, '{:.1f}%')``"""
+    return series.map(spec.format)
+
+
+def evaluate_rules(df: pd.DataFrame, rules: list) -> pd.DataFrame:
+    """Evaluate alert rules over a frame and return one record per triggered rule"""
+    records = []
+    if len(df) == 0:
+        return pd.DataFrame(records, columns=ALERT_COLUMNS)
+    for rule in rules:
+        mask = rule.condition(df).fillna(False).to_numpy(dtype=bool)
+        count = int(mask.sum())
+        if count == 0:
+            continue
+        items = []
+        if rule.detail is not None:
+            matched = df.loc[mask]
+            if rule.max_items is not None:
+                matched = matched.head(rule.max_items)
+            items = rule.detail(matched).tolist()
+        records.append({
+            'RULE': rule.name,
+            'LEVEL': rule.level,
+            'HEADLINE': rule.headline.format(count=count),
+            'COUNT': count,
+            'ITEMS': items,
+        })
+    return pd.DataFrame(records, columns=ALERT_COLUMNS)
+
+
+def render_alerts(alerts: pd.DataFrame):
+    """Render alert records: a callout per alert followed by its detail lines"""
+    for alert in alerts.itertuples(index=False):
+        getattr(st, alert.LEVEL)(alert.HEADLINE)
+        if alert.ITEMS:
+            st.markdown("\n".join(alert.ITEMS))
+
+
+def recommendation_priority(df: pd.DataFrame) -> pd.Series:
+    """Priority label for each capacity recommendation"""
+    utilization = df['UTILIZATION_PERCENTAGE']
+    return pd.Series(np.select(
+        [utilization > HIGH_DEMAND_UTILIZATION,
+         utilization > NEAR_CAPACITY_UTILIZATION,
+         (utilization > UNDER_UTILIZATION) & (utilization <= REALLOCATION_UTILIZATION)],
+        ['🔴 High Priority', '🟡 Medium Priority', '🟠 Review Required'],
+        default='🟢 Optimal'
+    ), index=df.index)
+
+
+CAPACITY_ALERT_RULES = [
+    AlertRule(
+        name='capacity_increase',
+        level='error',
+        condition=lambda df: df['UTILIZATION_PERCENTAGE'] > HIGH_DEMAND_UTILIZATION,
+        headline="🚨 **Critical**: {count} departments need immediate capacity increases",
+        detail=lambda df: ("- **" + df['DEPARTMENT_NAME'] + "**: Add " + df['RECOMMENDED_BED_CHANGE'].astype(str)
+                           + " beds (Current: " + fmt(df['UTILIZATION_PERCENTAGE'], '{:.1f}') + "% utilization)"),
+    ),
+    AlertRule(
+        name='capacity_watch',
+        level='warning',
+        condition=lambda df: df['UTILIZATION_PERCENTAGE'].between(
+            NEAR_CAPACITY_UTILIZATION, HIGH_DEMAND_UTILIZATION, inclusive='right'),
+        headline="⚠️ **Watch List**: {count} departments approaching capacity",
+        detail=lambda df: ("- **" + df['DEPARTMENT_NAME'] + "**: Monitor closely (Current: "
+                           + fmt(df['UTILIZATION_PERCENTAGE'], '{:.1f}') + "% utilization)"),
+    ),
+    AlertRule(
+        name='capacity_underutilized',
+        level='info',
+        condition=lambda df: df['UTILIZATION_PERCENTAGE'] <= UNDER_UTILIZATION,
+        headline="💡 **Optimization**: {count} departments may have excess capacity",
+        detail=lambda df: ("- **" + df['DEPARTMENT_NAME'] + "**: Consider reallocation (Current: "
+                           + fmt(df['UTILIZATION_PERCENTAGE'], '{:.1f}') + "% utilization)"),
+    ),
+]
+
+PROVIDER_ALERT_RULES = [
+    AlertRule(
+        name='provider_low_success',
+        level='warning',
+        condition=lambda df: df['PROVIDER_SUCCESS_RATE'] < 70,
+        headline="⚠️ **Performance Alert**: {count} providers with success rate < 70%",
+        detail=lambda df: ("- **" + df['PROVIDER_NAME'] + "** (" + df['PROVIDER_CREDENTIALS'] + "): "
+                           + fmt(df['PROVIDER_SUCCESS_RATE'], '{:.1f}') + "% success rate"),
+        max_items=3,
+    ),
+    AlertRule(
+        name='provider_high_utilization',
+        level='info',
+        condition=lambda df: df['SERVICES_PER_DAY'] > 8,
+        headline="📊 **High Utilization**: {count} providers with >8 services/day",
+    ),
+]
+
+SERVICE_OPPORTUNITY_RULES = [
+    AlertRule(
+        name='service_expansion',
+        level='info',
+        condition=lambda df: df['TOTAL_INTERVENTIONS'] > 50,
+        headline="💡 **Expansion Opportunities**:",
+        detail=lambda df: ("- **" + df['SERVICE_TYPE'] + "**: "
+                           + fmt(df['SUCCESSFUL_INTERVENTIONS'] / df['TOTAL_INTERVENTIONS'] * 100, '{:.1f}')
+                           + "% success rate with high volume"),
+        max_items=3,
+    ),
+]
+
+DEPARTMENT_GROWTH_RULES = [
+    AlertRule(
+        name='department_below_median_revenue',
+        level='info',
+        condition=lambda df: df['TOTAL_DEPARTMENT_REVENUE'] < df['TOTAL_DEPARTMENT_REVENUE'].median(),
+        headline="💡 **Growth Potential**: {count} departments below median revenue",
+        detail=lambda df: ("- **" + df['DEPARTMENT_NAME'] + "**: "
+                           + fmt(df['TOTAL_DEPARTMENT_REVENUE'], '${:,.0f}') + " revenue opportunity"),
+        max_items=3,
+    ),
+]
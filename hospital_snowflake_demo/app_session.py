@@ -0,0 +1,77 @@
+"""
+Session provider for the hospital analytics dashboard
+
+The Snowpark session is resolved on first use rather than at import, so the
+page header and sidebar render before any connection work happens. Inside
+Streamlit-in-Snowflake the active session is used. Self-hosted, queries run
+on a bounded SessionPool shared by every Streamlit session in the process:
+Snowpark sessions created from ``st.secrets["connections"]["snowflake"]``,
+or connections to the local DuckDB stand-in when Snowflake is not configured.
+
+Cached loaders share results across users, so they run under the service
+role. Per-user queries that are not cached (the paginated patient lists) use
+get_role_session(), which binds pooled sessions to the Snowflake role of the
+selected dashboard role.
+"""
+
+import os
+from datetime import timedelta
+
+import streamlit as st
+
+# Dashboard roles with a Snowflake role of their own (sql/01_setup_environment.sql)
+ROLE_BINDINGS = {
+    "Clinical Administrator": "CLINICAL_ADMIN",
+    "Physician": "PHYSICIAN",
+    "Nurse": "NURSE",
+    "Analyst": "ANALYST",
+}
+
+
+def _session_factory():
+    """Factory for pooled sessions: Snowpark when a connection is configured, else local"""
+    try:
+        from snowflake.snowpark import Session
+        config = dict(st.secrets["connections"]["snowflake"])
+    except Exception:
+        from local_backend import LocalSession
+        base = LocalSession.from_data_dir()
+        return base.connect
+    config.setdefault("client_session_keep_alive", True)
+    return lambda: Session.builder.configs(config).create()
+
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """Return the active Snowpark session, or a session pool outside SiS"""
+    try:
+        from snowflake.snowpark.context import get_active_session
+        return get_active_session()
+    except Exception:
+        pass
+    from session_pool import POOL_SIZE, SessionPool
+    pool = SessionPool(
+        _session_factory(),
+        max_size=int(os.environ.get("HOSPITAL_DEMO_POOL_SIZE", POOL_SIZE)),
+        acquire_timeout=timedelta(seconds=float(os.environ.get("HOSPITAL_DEMO_POOL_TIMEOUT", 30))),
+    )
+    pool.start_keepalive()
+    return pool
+
+
+def get_role_session():
+    """Session for per-user queries, bound to the selected role's Snowflake role when pooled"""
+    session = get_session()
+    role = ROLE_BINDINGS.get(st.session_state.get("user_role"))
+    if role is None or not hasattr(session, 'bound'):
+        return session
+    return session.bound(role)
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache_warmer():
+    """Start the background cache warmer once per process, if enabled (HOSPITAL_DEMO_CACHE_WARMER=1)"""
+    if os.environ.get("HOSPITAL_DEMO_CACHE_WARMER", "0") != "1":
+        return None
+    from cache_warmer import start_cache_warmer
+    return start_cache_warmer()
@@ -0,0 +1,114 @@
+"""
+Approximate query mode for exploratory views
+
+Loaders called with ``approximate=True`` run a rewritten query:
+
+- ``COUNT(DISTINCT x)`` becomes ``APPROX_COUNT_DISTINCT(x)`` (HyperLogLog)
+- ``MEDIAN(x)`` becomes ``APPROX_PERCENTILE(x, 0.5)``
+- the loader's fact table is read with ``SAMPLE BERNOULLI (p)``, but only when
+  catalog metadata shows it is big enough for sampling to pay off
+
+Counts and sums over sampled rows are scaled back up by 100 / p. Each
+approximate count then gets a ``<COLUMN>_CI`` column: the half-width of its
+95% confidence interval. The interval combines the Bernoulli sampling
+variance with the HyperLogLog standard error, and the charts draw it as
+error bars.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Relative standard error of Snowflake's APPROX_COUNT_DISTINCT (a session may
+# report its own as ``approx_distinct_rse``)
+APPROX_DISTINCT_RSE = 0.0162
+Z_95 = 1.96
+# Sample tables above this many rows, reading about SAMPLE_TARGET_ROWS of them
+SAMPLE_MIN_ROWS = 1_000_000
+SAMPLE_TARGET_ROWS = 500_000
+
+STOP_WORDS = r"(?:ON|WHERE|GROUP|ORDER|LEFT|RIGHT|INNER|FULL|JOIN|LIMIT|HAVING|SAMPLE)\b"
+
+
+@dataclass(frozen=True)
+class ApproxSpec:
+    """How a loader's result is approximated
+
+    ``count_columns`` and ``sum_columns`` are additive over the rows of
+    ``sample_table`` and are scaled up when it is sampled (a distinct count of
+    that table's row key counts as additive). ``distinct_columns`` are
+    APPROX_COUNT_DISTINCT outputs. A loader with distinct counts over non-key
+    columns of the fact table must not set ``sample_table``, because those
+    counts do not scale with the sample.
+    """
+    sample_table: Optional[str] = None
+    count_columns: tuple = ()
+    sum_columns: tuple = ()
+    distinct_columns: tuple = ()
+
+
+def approximate_sql(query: str, sample_table: str = None, sample_pct: float = None) -> str:
+    """Rewrite a loader query to use approximate aggregates and optional table sampling"""
+    query = re.sub(r"\bCOUNT\(\s*DISTINCT\s+", "APPROX_COUNT_DISTINCT(", query, flags=re.I)
+    query = re.sub(r"\bMEDIAN\(([^()]*)\)", r"APPROX_PERCENTILE(\1, 0.5)", query, flags=re.I)
+    if sample_table and sample_pct:
+        reference = rf"(HOSPITAL_DEMO\.RAW_DATA\.{sample_table}\b(?:\s+(?:AS\s+)?(?!{STOP_WORDS})\w+)?)"
+        query = re.sub(reference, rf"\1 SAMPLE BERNOULLI ({sample_pct:g})", query, flags=re.I)
+    return query
+
+
+def sample_percent(row_count) -> Optional[float]:
+    """Sampling percentage for a table of ``row_count`` rows, or None to read it whole"""
+    if row_count is None or pd.isna(row_count) or row_count < max(SAMPLE_MIN_ROWS, 1):
+        return None
+    percent = round(max(100.0 * SAMPLE_TARGET_ROWS / row_count, 0.1), 2)
+    return percent if percent < 100 else None
+
+
+def scale_estimates(df: pd.DataFrame, spec: ApproxSpec, sample_pct: float = None,
+                    distinct_rse: float = APPROX_DISTINCT_RSE) -> pd.DataFrame:
+    """Scale sampled counts and sums and add 95% confidence half-widths"""
+    df = df.copy()
+    fraction = sample_pct / 100.0 if sample_pct else 1.0
+    for column in dict.fromkeys(spec.count_columns + spec.sum_columns + spec.distinct_columns):
+        if column not in df.columns:
+            continue
+        observed = df[column].astype(float)
+        estimate = observed / fraction if column in spec.count_columns + spec.sum_columns else observed
+        variance = np.zeros(len(df))
+        if column in spec.count_columns and fraction < 1:
+            # Bernoulli sampling: Var(c / f) = N (1 - f) / f, estimated from c
+            variance = variance + observed.to_numpy() * (1 - fraction) / fraction ** 2
+        if column in spec.distinct_columns:
+            variance = variance + (distinct_rse * estimate.to_numpy()) ** 2
+        df[column] = estimate
+        if column in spec.count_columns + spec.distinct_columns:
+            df[f"{column}_CI"] = Z_95 * np.sqrt(variance)
+    return df
+
+
+def ci_column(df: pd.DataFrame, column: str) -> Optional[str]:
+    """Name of a column's confidence-interval column for error bars, if it has one"""
+    return f"{column}_CI" if f"{column}_CI" in df.columns else None
+
+
+def total_ci(df: pd.DataFrame, column: str) -> Optional[float]:
+    """95% half-width for the sum of a column's independent estimates"""
+    if f"{column}_CI" not in df.columns:
+        return None
+    return float(np.sqrt((df[f"{column}_CI"] ** 2).sum()))
+
+
+def relative_error(exact: pd.DataFrame, approximate: pd.DataFrame, keys: list, columns: list) -> pd.Series:
+    """Largest relative error per column between an exact and an approximate result"""
+    merged = exact.merge(approximate, on=keys, how='left', suffixes=('', '_APPROX'))
+    errors = {}
+    for column in columns:
+        truth = merged[column].astype(float)
+        estimate = merged[f"{column}_APPROX"].astype(float).fillna(0)
+        denominator = truth.abs().where(truth != 0, 1)
+        errors[column] = float(((estimate - truth).abs() / denominator).max())
+    return pd.Series(errors)
@@ -0,0 +1,266 @@
+"""
+Batched audit logging of dashboard data access
+
+sql/05_rbac_governance.sql defines ANALYTICS.AUDIT_LOG and a
+LOG_DATA_ACCESS procedure, but calling the procedure per loader call would
+add a warehouse round trip to every page. Instead every loader call made for
+a page (``audited``, applied by ``loaders.guarded``) and every view served
+from a snapshot is recorded as an access event: user, dashboard role,
+Streamlit session, dataset, the tables it reads, its filters and the rows
+returned. A loader called by another audited loader is covered by the
+outer call's event. Recording only appends to an in-memory buffer. An AuditWriter
+thread writes the buffer in multi-row INSERTs:
+
+- as soon as BATCH_SIZE events are waiting, and otherwise every
+  FLUSH_INTERVAL
+- at most MAX_BUFFERED events are held; past that the oldest are dropped
+  and counted, so a warehouse outage never grows memory or blocks a page
+- a failed INSERT puts its batch back for the next flush
+- at exit the buffer is flushed; whatever can't be written is appended to
+  HOSPITAL_DEMO_AUDIT_SPILL and re-queued by the next process
+
+Calls made off a page (the cache warmer, snapshot and report jobs) are not
+user access and are not recorded. HOSPITAL_DEMO_AUDIT=0 turns recording off.
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDIT_TABLE = "HOSPITAL_DEMO.ANALYTICS.AUDIT_LOG"
+AUDIT_COLUMNS = ['access_timestamp', 'user_name', 'role_name', 'session_id', 'dataset', 'table_accessed',
+                 'filters', 'rows_returned']
+BATCH_SIZE = 100
+FLUSH_INTERVAL = timedelta(seconds=5)
+MAX_BUFFERED = 10_000
+MAX_FILTER_CHARS = 1000
+RECENT_FLUSHES = 20
+DEFAULT_SPILL_PATH = os.path.join(BASE_DIR, ".cache", "audit_spill.jsonl")
+
+
+def insert_sql(count: int) -> str:
+    """Multi-row INSERT of ``count`` events, bound by position"""
+    row = f"({', '.join('?' for _ in AUDIT_COLUMNS)})"
+    return f"INSERT INTO {AUDIT_TABLE} ({', '.join(AUDIT_COLUMNS)}) VALUES " + ", ".join([row] * count)
+
+
+def insert_events(session, events: list):
+    """Write events to AUDIT_LOG in one statement"""
+    params = [event.get(column) for event in events for column in AUDIT_COLUMNS]
+    session.sql(insert_sql(len(events)), params=params).collect()
+
+
+class AuditWriter:
+    """Bounded in-memory buffer of access events, written in batches by a background thread"""
+
+    def __init__(self, write=None, batch_size: int = BATCH_SIZE, flush_interval: timedelta = FLUSH_INTERVAL,
+                 max_buffered: int = MAX_BUFFERED, spill_path: str = None):
+        self._write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.spill_path = spill_path
+        self.written = 0
+        self.dropped = 0
+        self.flushes = deque(maxlen=RECENT_FLUSHES)
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _bounded(self):
+        while len(self._buffer) > self.max_buffered:
+            self._buffer.popleft()
+            self.dropped += 1
+
+    def submit(self, event: dict):
+        """Queue an event; never blocks on the warehouse"""
+        with self._lock:
+            self._buffer.append(event)
+            self._bounded()
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def flush(self, all_events: bool = False) -> int:
+        """Write one batch (or everything buffered); returns the events written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    return written
+                start = time.perf_counter()
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    with self._lock:
+                        self._buffer.extendleft(reversed(batch))
+                        self._bounded()
+                    self._record(len(batch), start, type(e).__name__)
+                    logger.warning("Audit log flush of %d events failed; keeping them: %s", len(batch), e)
+                    return written
+                self.written += len(batch)
+                written += len(batch)
+                self._record(len(batch), start, None)
+                if not all_events and len(self._buffer) < self.batch_size:
+                    return written
+
+    def _record(self, events: int, start: float, error: str):
+        self.flushes.append((datetime.now(), events, round((time.perf_counter() - start) * 1000, 1), error))
+
+    def run(self):
+        """Flush loop: a batch as soon as one is full, otherwise whatever is waiting every interval"""
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval.total_seconds())
+            self._wake.clear()
+            if self._buffer:
+                self.flush()
+
+    def start(self) -> threading.Thread:
+        self._restore_spill()
+        self._thread = threading.Thread(target=self.run, name='audit-writer', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def close(self, timeout: float = 10):
+        """Stop the thread and flush everything; events that can't be written are spilled to disk"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush(all_events=True)
+        if self._buffer and self.spill_path:
+            with self._lock:
+                events = list(self._buffer)
+                self._buffer.clear()
+            os.makedirs(os.path.dirname(self.spill_path) or '.', exist_ok=True)
+            with open(self.spill_path, 'a') as f:
+                f.writelines(json.dumps(event) + '\n' for event in events)
+            logger.warning("Spilled %d unwritten audit events to %s", len(events), self.spill_path)
+
+    def _restore_spill(self):
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        claimed = f"{self.spill_path}.{os.getpid()}"
+        try:
+            os.replace(self.spill_path, claimed)
+        except OSError:
+            return  # another process took it
+        with open(claimed) as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        with self._lock:
+            self._buffer.extendleft(reversed(events))
+            self._bounded()
+        os.remove(claimed)
+        logger.info("Re-queued %d spilled audit events", len(events))
+
+    def recent(self) -> pd.DataFrame:
+        """The most recent flushes, newest first"""
+        return pd.DataFrame(list(self.flushes)[::-1], columns=['At', 'Events', 'ms', 'Error'])
+
+
+@st.cache_resource(show_spinner=False)
+def get_audit_writer():
+    """Start the process-wide audit writer, flushed at exit (None when HOSPITAL_DEMO_AUDIT=0)"""
+    if os.environ.get("HOSPITAL_DEMO_AUDIT", "1") == "0":
+        return None
+    from app_session import get_session
+
+    writer = AuditWriter(lambda events: insert_events(get_session(), events),
+                         spill_path=os.environ.get("HOSPITAL_DEMO_AUDIT_SPILL", DEFAULT_SPILL_PATH))
+    writer.start()
+    atexit.register(writer.close)
+    return writer
+
+
+def _page_session_id():
+    """The Streamlit session of the page being run, or None off a page"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def current_user():
+    """Signed-in user of the page (Snowflake user name in SiS), if any"""
+    try:
+        user = st.user.to_dict() if hasattr(st, 'user') else dict(st.experimental_user)
+    except Exception:
+        return None
+    return user.get('user_name') or user.get('email')
+
+
+def record_access(dataset: str, filters: dict = None, rows: int = None, tables=()):
+    """Queue an access event for the current page"""
+    session_id = _page_session_id()
+    if session_id is None:
+        return
+    writer = get_audit_writer()
+    if writer is None:
+        return
+    writer.submit({
+        'access_timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f'),
+        'user_name': current_user(),
+        'role_name': st.session_state.get('user_role'),
+        'session_id': session_id,
+        'dataset': dataset,
+        'table_accessed': ', '.join(sorted(tables)) or None,
+        'filters': json.dumps(filters or {}, default=str, sort_keys=True)[:MAX_FILTER_CHARS],
+        'rows_returned': rows,
+    })
+
+
+_in_audited = contextvars.ContextVar('in_audited_loader', default=False)
+
+
+def audited(func):
+    """Wrap a loader so each call from a page is recorded as an access to it"""
+    from freshness import loader_sources
+
+    name = func.__name__
+    tables = loader_sources(func)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _in_audited.get():
+            # Called by another audited loader, whose access is the one recorded
+            return func(*args, **kwargs)
+        token = _in_audited.set(True)
+        try:
+            value = func(*args, **kwargs)
+        finally:
+            _in_audited.reset(token)
+        try:
+            filters = dict(signature.bind(*args, **kwargs).arguments)
+            record_access(name, filters, len(value) if isinstance(value, pd.DataFrame) else None, tables)
+        except Exception:
+            logger.exception("Recording access to %s failed", name)
+        return value
+
+    for attr in ('clear', 'wait', 'status', 'ttl', 'max_stale'):
+        if hasattr(func, attr):
+            setattr(wrapper, attr, getattr(func, attr))
+    return wrapper
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Headless batch reports per department and per role
+
+Department heads want a weekly report without clicking through the
+dashboard. This script writes one report per department and one per
+snapshot role view (snapshots.SNAPSHOT_VIEWS):
+
+1. the base data is loaded once, in this process, through the dashboard's
+   own loaders (BASE_LOADERS), so every department report shares one set of
+   warehouse scans, and the disk cache, plan guardrails and warehouse routing
+   apply as in the app
+2. role reports use each view's ``build``, the same figures the dashboard
+   shows
+3. reports are rendered on a process pool. Each worker receives the base
+   data once (pool initializer) and slices it to its department; workers
+   never query the warehouse.
+
+Each report is a directory with ``report.html`` (figures, KPIs and the
+data appendix), ``report.pdf`` with ``--pdf`` and ``appendix/*.csv`` with
+every row behind the report. ``index.html`` links them all.
+
+Usage (e.g. weekly from cron, after the nightly load):
+    python batch_reports.py                                  # every department and role
+    python batch_reports.py --departments Cardiology --roles CEO --out /srv/reports/week-50
+    python batch_reports.py --pdf                            # needs kaleido and weasyprint
+"""
+
+import argparse
+import base64
+import html
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from snapshots import SNAPSHOT_VIEWS, Dashboard
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_LOADERS = [
+    'get_department_performance_summary',
+    'get_daily_department_admissions',
+    'get_admission_forecasts',
+    'get_bed_capacity_analysis',
+    'get_bed_turnover_analysis',
+    'get_capacity_recommendations',
+    'get_allied_health_department_integration',
+]
+REPORT_WEEKS = 12  # admissions history shown in department reports
+APPENDIX_PREVIEW_ROWS = 25
+
+_base = None  # base data in each worker, set by _init_worker
+
+
+def load_base_data(loader_module=None) -> dict:
+    """Every base loader's result, for all departments"""
+    loader_module = loader_module or importlib.import_module('loaders')
+    base = {}
+    for name in BASE_LOADERS:
+        start = time.perf_counter()
+        base[name] = getattr(loader_module, name)()
+        logger.info("Loaded %s: %d rows in %.1f ms", name, len(base[name]), (time.perf_counter() - start) * 1000)
+    return base
+
+
+def _department_rows(df: pd.DataFrame, department: str) -> pd.DataFrame:
+    return df[df['DEPARTMENT_NAME'] == department].reset_index(drop=True) if len(df) > 0 else df
+
+
+def _first(df: pd.DataFrame, column: str):
+    return df[column].iloc[0].item() if len(df) > 0 and pd.notnull(df[column].iloc[0]) else None
+
+
+def build_department(department: str, base: dict) -> Dashboard:
+    """KPIs, tables and figures for one department, from the shared base data"""
+    tables = {name.removeprefix('get_'): _department_rows(df, department) for name, df in base.items()}
+    performance = tables['department_performance_summary']
+    daily = tables['daily_department_admissions'].assign(
+        ADMISSION_DATE=lambda df: pd.to_datetime(df['ADMISSION_DATE']))
+    forecasts = tables['admission_forecasts']
+    capacity = tables['bed_capacity_analysis']
+    recommendations = tables['capacity_recommendations']
+    turnover = tables['bed_turnover_analysis']
+    allied = tables['allied_health_department_integration']
+    dashboard = Dashboard(tables=tables, row_counts={name: len(df) for name, df in tables.items()})
+
+    last_day = daily['ADMISSION_DATE'].max() if len(daily) > 0 else None
+    week = daily[daily['ADMISSION_DATE'] > last_day - timedelta(days=7)] if last_day is not None else daily
+    prior = (daily[(daily['ADMISSION_DATE'] <= last_day - timedelta(days=7))
+                   & (daily['ADMISSION_DATE'] > last_day - timedelta(days=14))] if last_day is not None else daily)
+    dashboard.kpis = {
+        'admissions_last_7_days': int(week['ADMISSIONS'].sum()),
+        'admissions_prior_7_days': int(prior['ADMISSIONS'].sum()),
+        'total_admissions': _first(performance, 'ADMISSIONS'),
+        'total_revenue': _first(performance, 'TOTAL_DEPARTMENT_REVENUE'),
+        'avg_length_of_stay': _first(performance, 'AVG_LENGTH_OF_STAY'),
+        'emergency_rate': _first(performance, 'EMERGENCY_RATE'),
+        'bed_utilization': _first(capacity, 'AVG_UTILIZATION_RATE'),
+        'recommended_bed_change': _first(recommendations, 'RECOMMENDED_BED_CHANGE'),
+    }
+
+    if len(daily) > 0:
+        recent = daily[daily['ADMISSION_DATE'] > last_day - timedelta(weeks=REPORT_WEEKS)]
+        fig_admissions = go.Figure()
+        fig_admissions.add_trace(go.Scatter(x=recent['ADMISSION_DATE'], y=recent['ADMISSIONS'],
+                                            mode='lines', name='Admissions'))
+        if len(forecasts) > 0:
+            fig_admissions.add_trace(go.Scatter(x=forecasts['FORECAST_DATE'], y=forecasts['ADMISSIONS_FORECAST'],
+                                                mode='lines', name='Forecast', line=dict(dash='dash')))
+        fig_admissions.update_layout(title=f'Daily Admissions (Last {REPORT_WEEKS} Weeks) and Forecast')
+        dashboard.figures['admissions'] = fig_admissions
+
+    if len(performance) > 0:
+        row = performance.iloc[0]
+        revenue_data = pd.DataFrame({
+            'Service Line': ['Admissions', 'Procedures', 'Medications', 'Allied Health'],
+            'Revenue': [row['ADMISSION_REVENUE'], row['PROCEDURE_REVENUE'], row['MEDICATION_REVENUE'],
+                        row['ALLIED_REVENUE']],
+        }).fillna(0)
+        dashboard.figures['revenue_mix'] = px.pie(revenue_data, values='Revenue', names='Service Line',
+                                                  title='Revenue Distribution by Service Line')
+
+    if len(allied) > 0:
+        services = allied.groupby('SERVICE_TYPE')['SERVICES_PROVIDED'].sum().reset_index()
+        dashboard.figures['allied_services'] = px.bar(services, x='SERVICE_TYPE', y='SERVICES_PROVIDED',
+                                                      title='Allied Health Services by Type')
+
+    if len(turnover) > 0:
+        dashboard.figures['bed_turnover'] = px.bar(turnover, x='BED_TYPE', y='ANNUAL_TURNOVER_RATE',
+                                                   color='TURNOVER_CATEGORY', title='Annual Bed Turnover by Bed Type')
+    return dashboard
+
+
+def build_role(role: str) -> Dashboard:
+    """A snapshot role view's content, from its own build"""
+    return importlib.import_module(SNAPSHOT_VIEWS[role]).build()
+
+
+def _slug(name: str) -> str:
+    return ''.join(c if c.isalnum() else '_' for c in name.lower()).strip('_')
+
+
+def _format(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return '—'
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, int):
+        return f"{value:,}"
+    if isinstance(value, float):
+        return f"{value:,.0f}" if value.is_integer() else f"{value:,.1f}"
+    return html.escape(str(value))
+
+
+def _figure_html(fig, static: bool, include_plotlyjs) -> str:
+    if static:
+        svg = base64.b64encode(fig.to_image(format='svg')).decode()
+        return f'<img src="data:image/svg+xml;base64,{svg}">'
+    return fig.to_html(full_html=False, include_plotlyjs=include_plotlyjs)
+
+
+def render_html(title: str, dashboard: Dashboard, static: bool = False) -> str:
+    """A report page: KPIs, figures and the data appendix (static images for PDF output)"""
+    kpis = ''.join(f"<tr><th>{html.escape(name.replace('_', ' ').title())}</th><td>{_format(value)}</td></tr>"
+                   for name, value in dashboard.kpis.items())
+    figures = ''.join(f'<div class="figure">{_figure_html(fig, static, "cdn" if i == 0 else False)}</div>'
+                      for i, fig in enumerate(dashboard.figures.values()))
+    appendix = ''.join(
+        f"<h3>{html.escape(name.replace('_', ' ').title())} ({len(df):,} rows, "
+        f"<a href=\"appendix/{name}.csv\">CSV</a>)</h3>"
+        + df.head(APPENDIX_PREVIEW_ROWS).to_html(index=False, na_rep='—', float_format=lambda v: f"{v:,.2f}")
+        for name, df in dashboard.tables.items() if len(df) > 0
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; font-size: 0.85em; }}
+th, td {{ border: 1px solid #ccc; padding: 0.25em 0.5em; text-align: left; }}
+.figure {{ page-break-inside: avoid; }}
+</style></head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>Generated {date.today().isoformat()}</p>
+<h2>Key Metrics</h2><table>{kpis}</table>
+<h2>Charts</h2>{figures}
+<h2>Data Appendix</h2>{appendix}
+</body></html>
+"""
+
+
+def write_report(directory: str, title: str, dashboard: Dashboard, pdf: bool = False) -> str:
+    """Write report.html, appendix CSVs and optionally report.pdf; returns the directory"""
+    os.makedirs(os.path.join(directory, 'appendix'), exist_ok=True)
+    for name, df in dashboard.tables.items():
+        df.to_csv(os.path.join(directory, 'appendix', f"{name}.csv"), index=False)
+    with open(os.path.join(directory, 'report.html'), 'w') as f:
+        f.write(render_html(title, dashboard))
+    if pdf:
+        from weasyprint import HTML
+        HTML(string=render_html(title, dashboard, static=True), base_url=directory).write_pdf(
+            os.path.join(directory, 'report.pdf'))
+    return directory
+
+
+def _init_worker(base: dict):
+    global _base
+    _base = base
+
+
+def _department_report(department: str, out: str, pdf: bool) -> tuple:
+    start = time.perf_counter()
+    directory = os.path.join(out, 'departments', _slug(department))
+    write_report(directory, f"{department} Weekly Report", build_department(department, _base), pdf)
+    return 'department', department, directory, time.perf_counter() - start
+
+
+def _role_report(role: str, dashboard: Dashboard, out: str, pdf: bool) -> tuple:
+    start = time.perf_counter()
+    directory = os.path.join(out, 'roles', _slug(role))
+    write_report(directory, f"{role} Weekly Report", dashboard, pdf)
+    return 'role', role, directory, time.perf_counter() - start
+
+
+def write_index(out: str, results: list):
+    links = ''.join(f'<li>{kind.title()}: <a href="{os.path.relpath(directory, out)}/report.html">'
+                    f'{html.escape(name)}</a></li>' for kind, name, directory, _ in sorted(results))
+    with open(os.path.join(out, 'index.html'), 'w') as f:
+        f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Weekly Reports</title></head>'
+                f'<body><h1>Weekly Reports {date.today().isoformat()}</h1><ul>{links}</ul></body></html>\n')
+
+
+def generate(out: str, departments: list = None, roles: list = None, workers: int = None,
+             pdf: bool = False, loader_module=None) -> list:
+    """Load the base data once and render every report on a process pool"""
+    base = load_base_data(loader_module)
+    performance = base['get_department_performance_summary']
+    if departments is None:
+        departments = performance['DEPARTMENT_NAME'].tolist() if len(performance) > 0 else []
+    role_dashboards = {role: build_role(role) for role in (list(SNAPSHOT_VIEWS) if roles is None else roles)}
+    os.makedirs(out, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(base,)) as pool:
+        futures = [pool.submit(_department_report, department, out, pdf) for department in departments]
+        futures += [pool.submit(_role_report, role, dashboard, out, pdf) for role, dashboard in role_dashboards.items()]
+        results = [future.result() for future in futures]
+    write_index(out, results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "reports", date.today().isoformat()),
+                        help="Output directory (default reports/<today>)")
+    parser.add_argument("--departments", nargs="+", help="Only these departments (default: all)")
+    parser.add_argument("--roles", nargs="*", choices=list(SNAPSHOT_VIEWS), default=list(SNAPSHOT_VIEWS),
+                        help="Role reports to write (default: every snapshot view)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--pdf", action="store_true", help="Also write report.pdf")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.pdf and not all(importlib.util.find_spec(package) for package in ('kaleido', 'weasyprint')):
+        parser.error("--pdf needs the optional kaleido and weasyprint packages")
+
+    start = time.perf_counter()
+    results = generate(args.out, args.departments, args.roles, args.workers, args.pdf)
+    print("=" * 80)
+    print(f"{len(results)} reports in {time.perf_counter() - start:.1f} s -> {args.out}/index.html")
+    print("=" * 80)
+    for kind, name, directory, seconds in sorted(results):
+        print(f"{kind:<12}{name:<40}{seconds * 1000:>8.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
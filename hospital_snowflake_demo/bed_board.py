@@ -0,0 +1,150 @@
+"""
+Live bed board with incremental (delta) refresh
+
+get_bed_utilization used to find the latest status of every bed from the
+whole of BED_AVAILABILITY_RAW on each refresh. BedBoard instead keeps the
+current state of every active bed in memory:
+
+- one full snapshot on first use, with the table's high watermark on
+  LOAD_TIMESTAMP
+- on each refresh, only availability rows loaded after the watermark are
+  fetched and applied
+
+The watermark is LOAD_TIMESTAMP, stamped by the warehouse when a row is
+written. Every row of one load (a COPY) carries the same timestamp and
+commits atomically, so once one of its rows is seen all of them are, and the
+delta query can be strictly after the watermark: a refresh with no new load
+fetches no rows. LAST_UPDATED comes from the source file and can be older
+than rows already seen. Applying a delta is idempotent: a row replaces a
+bed's state only when it is newer (by status date, then LAST_UPDATED).
+Department counts are recomputed only for departments whose beds changed.
+The changed departments are reported so the view can highlight them.
+
+Refreshes are throttled to REFRESH_INTERVAL, the live board's cadence. A
+change to the bed inventory or departments (detected by the freshness probe)
+invalidates the board, and the next refresh takes a new snapshot.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+REFRESH_INTERVAL = timedelta(seconds=30)
+STATE_COLUMNS = ['BED_ID', 'DEPARTMENT_NAME', 'BED_TYPE', 'STATUS_DATE', 'LAST_UPDATED', 'CURRENT_STATUS']
+MAINTENANCE_STATUSES = ('Maintenance', 'Cleaning', 'Out of Service')
+UTILIZATION_COLUMNS = ['DEPARTMENT_NAME', 'TOTAL_BEDS', 'OCCUPIED_BEDS', 'AVAILABLE_BEDS', 'MAINTENANCE_BEDS',
+                       'UTILIZATION_RATE']
+
+
+def department_counts(state: pd.DataFrame) -> pd.DataFrame:
+    """Bed counts and utilization per department, as in the original bed utilization query"""
+    status = state['CURRENT_STATUS']
+    counts = state.assign(
+        OCCUPIED_BEDS=(status == 'Occupied').astype(int),
+        AVAILABLE_BEDS=(status == 'Available').astype(int),
+        MAINTENANCE_BEDS=status.isin(MAINTENANCE_STATUSES).astype(int),
+    ).groupby('DEPARTMENT_NAME').agg(
+        TOTAL_BEDS=('BED_ID', 'count'),
+        OCCUPIED_BEDS=('OCCUPIED_BEDS', 'sum'),
+        AVAILABLE_BEDS=('AVAILABLE_BEDS', 'sum'),
+        MAINTENANCE_BEDS=('MAINTENANCE_BEDS', 'sum'),
+    )
+    counts['UTILIZATION_RATE'] = (counts['OCCUPIED_BEDS'] * 100.0 / counts['TOTAL_BEDS']).round(2)
+    return counts[counts['TOTAL_BEDS'] > 0]
+
+
+def _newer(date, updated, than_date, than_updated) -> pd.Series:
+    """Whether (date, updated) sorts after (than_date, than_updated); missing values sort first"""
+    date, than_date = date.fillna(pd.Timestamp.min), than_date.fillna(pd.Timestamp.min)
+    updated, than_updated = updated.fillna(pd.Timestamp.min), than_updated.fillna(pd.Timestamp.min)
+    return (date > than_date) | ((date == than_date) & (updated > than_updated))
+
+
+class BedBoard:
+    """Current bed states, kept up to date from availability changes after a watermark"""
+
+    def __init__(self, snapshot, changes, refresh_interval: timedelta = REFRESH_INTERVAL, clock=time.monotonic):
+        self._snapshot = snapshot
+        self._changes = changes
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = None
+        self.counts = None
+        self.watermark = None
+        self.changed_departments = set()
+        self.last_delta_rows = 0
+        self._refreshed_at = None
+
+    def invalidate(self):
+        """Drop the in-memory state; the next refresh takes a full snapshot"""
+        with self._lock:
+            self.state = None
+
+    def load(self, snapshot: pd.DataFrame):
+        """Replace the state with a full snapshot (one row per active bed, plus WATERMARK)"""
+        state = snapshot.copy()
+        for column in ('STATUS_DATE', 'LAST_UPDATED', 'WATERMARK'):
+            state[column] = pd.to_datetime(state[column])
+        watermark = state['WATERMARK'].max()
+        self.state = state[STATE_COLUMNS].set_index('BED_ID')
+        self.counts = department_counts(self.state.reset_index())
+        self.watermark = None if pd.isna(watermark) else watermark
+        self.changed_departments = set()
+        self.last_delta_rows = 0
+
+    def apply(self, changes: pd.DataFrame) -> set:
+        """Apply availability rows (BED_ID, STATUS_DATE, STATUS, LAST_UPDATED, LOAD_TIMESTAMP)
+
+        Returns the departments whose counts changed.
+        """
+        self.last_delta_rows = len(changes)
+        if len(changes) == 0:
+            self.changed_departments = set()
+            return set()
+        changes = changes.assign(STATUS_DATE=pd.to_datetime(changes['STATUS_DATE']),
+                                 LAST_UPDATED=pd.to_datetime(changes['LAST_UPDATED']))
+        latest_seen = pd.to_datetime(changes['LOAD_TIMESTAMP']).max()
+        if not pd.isna(latest_seen) and (self.watermark is None or latest_seen > self.watermark):
+            self.watermark = latest_seen
+        changes = changes[changes['BED_ID'].isin(self.state.index)]
+        latest = changes.sort_values(['STATUS_DATE', 'LAST_UPDATED'], na_position='first').groupby('BED_ID').last()
+        current = self.state.loc[latest.index]
+        newer = _newer(latest['STATUS_DATE'], latest['LAST_UPDATED'], current['STATUS_DATE'], current['LAST_UPDATED'])
+        latest = latest[newer]
+        status_changed = latest['STATUS'].ne(self.state.loc[latest.index, 'CURRENT_STATUS'])
+        for column, source in (('STATUS_DATE', 'STATUS_DATE'), ('LAST_UPDATED', 'LAST_UPDATED'),
+                               ('CURRENT_STATUS', 'STATUS')):
+            self.state.loc[latest.index, column] = latest[source]
+        changed = set(self.state.loc[latest.index[status_changed], 'DEPARTMENT_NAME'])
+        if changed:
+            affected = self.state[self.state['DEPARTMENT_NAME'].isin(changed)].reset_index()
+            self.counts = pd.concat([self.counts.drop(index=list(changed), errors='ignore'),
+                                     department_counts(affected)])
+        self.changed_departments = changed
+        return changed
+
+    def refresh(self, force: bool = False) -> set:
+        """Snapshot on first use, otherwise apply changes since the watermark (at most once per interval)"""
+        with self._lock:
+            now = self._clock()
+            if self.state is None:
+                snapshot = self._snapshot()
+                if len(snapshot) == 0:
+                    return set()
+                self.load(snapshot)
+            elif force or now - self._refreshed_at >= self.refresh_interval.total_seconds():
+                self.apply(self._changes(self.watermark))
+            else:
+                return set()
+            self._refreshed_at = now
+            return self.changed_departments
+
+    def utilization(self) -> pd.DataFrame:
+        """Bed utilization per department, highest utilization first"""
+        if self.counts is None:
+            return pd.DataFrame()
+        return self.counts.reset_index().sort_values('UTILIZATION_RATE', ascending=False, ignore_index=True)[
+            UTILIZATION_COLUMNS]
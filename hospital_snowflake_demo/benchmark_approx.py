@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Approximate query mode benchmark
+
+Runs each loader that supports ``approximate=True`` exactly and approximately
+against the local DuckDB backend, once per scale factor (the raw tables are
+replicated that many times, see local_backend.replicate_tables), and reports:
+
+- exact and approximate query time and the speedup
+- the sample percentage used for the loader's fact table
+- the largest relative error over the loader's estimated columns
+- CI coverage: the share of estimates whose error is within their 95% interval
+
+The local data is far below the warehouse sampling threshold, so the threshold
+and target sample size are set on the command line.
+
+Usage:
+    python benchmark_approx.py                           # scale factors 1, 10, 50
+    python benchmark_approx.py --scale-factors 1 100 --target-rows 50000
+"""
+
+import argparse
+import inspect
+import json
+import os
+import time
+
+os.environ.setdefault("HOSPITAL_DEMO_AS_OF", "2024-12-15")
+
+import approx_query  # noqa: E402
+import loaders  # noqa: E402
+from app_session import get_session  # noqa: E402
+
+# Loader -> (spec, key columns identifying a result row)
+APPROX_LOADERS = {
+    'get_department_summary': (loaders.DEPARTMENT_SUMMARY_APPROX, ['DEPARTMENT_NAME', 'SPECIALIZATION_TYPE']),
+    'get_patient_demographics_summary': (loaders.PATIENT_DEMOGRAPHICS_APPROX, ['AGE_GROUP', 'GENDER', 'INSURANCE_PROVIDER']),
+    'get_allied_health_summary': (loaders.ALLIED_HEALTH_SUMMARY_APPROX, ['PROVIDER_CREDENTIALS', 'SERVICE_TYPE']),
+    'get_allied_health_detailed_analytics': (loaders.ALLIED_HEALTH_DETAILED_APPROX,
+                                             ['PROVIDER_CREDENTIALS', 'SERVICE_TYPE', 'SERVICE_NAME',
+                                              'SERVICE_LOCATION', 'PROVIDER_NAME']),
+    'get_allied_health_utilization_trends': (loaders.ALLIED_HEALTH_TRENDS_APPROX,
+                                             ['SERVICE_MONTH', 'PROVIDER_CREDENTIALS', 'SERVICE_TYPE']),
+}
+
+
+def timed(loader, runs: int, **kwargs):
+    """Best-of-``runs`` wall time in ms and the last result"""
+    best, df = None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        df = inspect.unwrap(loader)(**kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1), df
+
+
+def coverage(exact, approximate, keys, spec) -> float:
+    """Share of estimates within their 95% confidence interval"""
+    merged = exact.merge(approximate, on=keys, how='inner', suffixes=('', '_APPROX'))
+    covered, total = 0, 0
+    for column in dict.fromkeys(spec.count_columns + spec.distinct_columns):
+        error = (merged[f"{column}_APPROX"].astype(float) - merged[column].astype(float)).abs()
+        covered += int((error <= merged[f"{column}_CI"] + 1e-9).sum())
+        total += len(merged)
+    return round(covered / total, 3) if total else None
+
+
+def benchmark(scale_factor: int, runs: int) -> list:
+    os.environ["HOSPITAL_DEMO_SCALE_FACTOR"] = str(scale_factor)
+    get_session.clear()
+    loaders.get_freshness_probe.clear()
+    get_session()
+    probe = loaders.get_freshness_probe()
+    row_counts = dict(zip(probe['OBJECT_NAME'], probe['ROW_COUNT']))
+
+    results = []
+    for name, (spec, keys) in APPROX_LOADERS.items():
+        loader = getattr(loaders, name)
+        exact_ms, exact = timed(loader, runs)
+        approx_ms, approximate = timed(loader, runs, approximate=True)
+        columns = list(dict.fromkeys(spec.count_columns + spec.sum_columns + spec.distinct_columns))
+        errors = approx_query.relative_error(exact, approximate, keys, columns)
+        results.append({
+            "scale_factor": scale_factor,
+            "loader": name,
+            "sample_pct": approx_query.sample_percent(row_counts.get(spec.sample_table)) if spec.sample_table else None,
+            "exact_ms": exact_ms,
+            "approx_ms": approx_ms,
+            "speedup": round(exact_ms / approx_ms, 2) if approx_ms else None,
+            "max_rel_error": round(float(errors.max()), 4),
+            "ci_coverage": coverage(exact, approximate, keys, spec),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale-factors", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per query (best is kept)")
+    parser.add_argument("--min-rows", type=int, default=0, help="Sample tables with at least this many rows")
+    parser.add_argument("--target-rows", type=int, default=20000, help="Rows to read from a sampled table")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    approx_query.SAMPLE_MIN_ROWS = args.min_rows
+    approx_query.SAMPLE_TARGET_ROWS = args.target_rows
+
+    print("=" * 96)
+    print(f"Approximate query benchmark (sampling tables >= {args.min_rows:,} rows down to ~{args.target_rows:,})")
+    print("=" * 96)
+    print(f"{'Scale':>5}  {'Loader':<38}{'Sample %':>9}{'Exact ms':>10}{'Approx ms':>11}"
+          f"{'Speedup':>9}{'Max err':>9}{'CI cov':>8}")
+
+    results = []
+    for scale_factor in args.scale_factors:
+        for r in benchmark(scale_factor, args.runs):
+            results.append(r)
+            coverage_text = '-' if r['ci_coverage'] is None else r['ci_coverage']
+            print(f"{r['scale_factor']:>5}  {r['loader']:<38}{r['sample_pct'] or '-':>9}{r['exact_ms']:>10}"
+                  f"{r['approx_ms']:>11}{r['speedup']:>9}{r['max_rel_error']:>9.2%}{coverage_text:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "min_rows": args.min_rows, "target_rows": args.target_rows,
+                       "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Loader latency regression suite
+
+Runs every ``get_*`` loader returning a DataFrame against the local DuckDB
+backend, once per scale factor. That is every loader in loaders.py plus the
+Streamlit-in-Snowflake app's ``get_*`` functions (``sis.`` prefix). The raw
+tables are replicated that many times (see local_backend.replicate_tables).
+For each loader it reports:
+
+- latency: best of ``--runs`` calls, in ms
+- rows scanned by its queries (DuckDB profiling)
+- peak memory: the Python heap during the call (tracemalloc) and DuckDB's
+  peak buffer memory
+
+Each call bypasses the loader's own caches. The loaders it builds on (the
+freshness probe, the admission cube) are warmed by an untimed first call, as
+they would be in the app.
+
+Results are compared against a stored baseline. A loader regresses when a
+metric exceeds its baseline by more than the tolerance (TOLERANCES, or
+``--tolerance``) and by more than the metric's noise floor. The exit status
+is 1 if any loader regressed. Latency depends on the machine: record the
+baseline on the machine that runs the check, and again after an intended
+change.
+
+Usage:
+    python benchmark_loaders.py                          # scale factors 1 and 10, check the baseline
+    python benchmark_loaders.py --update-baseline        # record a new baseline
+    python benchmark_loaders.py --scale-factors 1 50 --loaders get_department_summary sis.get_basic_stats
+"""
+
+import argparse
+import ast
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+os.environ.setdefault("HOSPITAL_DEMO_AS_OF", "2024-12-15")
+os.environ.setdefault("HOSPITAL_DEMO_CACHE_DIR", tempfile.mkdtemp(prefix="loader-benchmark-"))
+# Measure every loader, including plans the guardrails would reject during clinical hours
+os.environ.setdefault("HOSPITAL_DEMO_PLAN_GUARD", "flag")
+
+import pandas as pd  # noqa: E402
+import streamlit as st  # noqa: E402
+
+import loaders  # noqa: E402
+import query_guard  # noqa: E402
+from app_session import get_session  # noqa: E402
+from local_backend import collect_query_stats  # noqa: E402
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SIS_APP = os.path.join(BASE_DIR, "hospital_analytics_app_sis.py")
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmark_loaders_baseline.json")
+METRICS = ['latency_ms', 'rows_scanned', 'python_peak_mb', 'db_peak_mb']
+# Allowed growth over the baseline, and the absolute change below which a metric is noise
+TOLERANCES = {'latency_ms': 0.5, 'rows_scanned': 0.1, 'python_peak_mb': 0.5, 'db_peak_mb': 0.5}
+NOISE_FLOORS = {'latency_ms': 25.0, 'rows_scanned': 1000, 'python_peak_mb': 2.0, 'db_peak_mb': 8.0}
+
+# Time the queries rather than the timeout guard's backoff between status checks
+query_guard.POLL_INTERVAL = (0.001, 0.001)
+
+
+def sis_loaders(session) -> dict:
+    """The SiS app's get_* functions, defined without running the app, querying ``session``
+
+    Module constants are kept (except the session itself) and the functions
+    are unwrapped from their caches.
+    """
+    with open(SIS_APP) as f:
+        tree = ast.parse(f.read())
+    keep = [node for node in tree.body
+            if isinstance(node, ast.FunctionDef)
+            or (isinstance(node, (ast.Import, ast.ImportFrom, ast.Assign)) and
+                not any(word in ast.unparse(node) for word in ('snowflake', 'get_active_session')))]
+    namespace = {'session': session}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), SIS_APP, 'exec'), namespace)
+    return {f"sis.{name}": inspect.unwrap(func) for name, func in namespace.items()
+            if name.startswith('get_') and callable(func)}
+
+
+def app_loaders() -> dict:
+    """loaders.py get_* functions, unwrapped from their caches"""
+    return {name: inspect.unwrap(func) for name, func in inspect.getmembers(loaders, callable)
+            if name.startswith('get_') and getattr(inspect.unwrap(func), '__module__', None) == 'loaders'}
+
+
+def arguments(func):
+    """Arguments for a loader's required parameters, or None when one of them can't be filled"""
+    # The SiS app's date range and the bed board watermark
+    as_of = date.fromisoformat(os.environ["HOSPITAL_DEMO_AS_OF"])
+    values = {'start_date': str(as_of - timedelta(days=30)), 'end_date': str(as_of), 'since': None}
+    required = [name for name, p in inspect.signature(func).parameters.items()
+                if p.default is inspect.Parameter.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)]
+    if any(name not in values for name in required):
+        return None
+    return {name: values[name] for name in required}
+
+
+def measure(func, runs: int):
+    """Metrics for one loader, or None when it does not return a DataFrame or can't be called unaided"""
+    kwargs = arguments(func)
+    if kwargs is None:
+        return None
+    result = func(**kwargs)
+    if not isinstance(result, pd.DataFrame):
+        return None
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(**kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        with collect_query_stats() as stats:
+            result = func(**kwargs)
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'latency_ms': round(best, 1),
+        'rows_scanned': stats['rows_scanned'],
+        'python_peak_mb': round(python_peak / 1024 ** 2, 2),
+        'db_peak_mb': round(stats['peak_buffer_bytes'] / 1024 ** 2, 2),
+        'queries': stats['queries'],
+        'rows': len(result),
+    }
+
+
+def benchmark(scale_factor: int, runs: int, selected=None) -> dict:
+    """{loader: metrics} at one scale factor"""
+    os.environ["HOSPITAL_DEMO_SCALE_FACTOR"] = str(scale_factor)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    candidates = {**app_loaders(), **sis_loaders(get_session())}
+    results = {}
+    for name, func in sorted(candidates.items()):
+        if selected and name not in selected:
+            continue
+        metrics = measure(func, runs)
+        if metrics is not None:
+            results[name] = metrics
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerances: dict = TOLERANCES, floors: dict = NOISE_FLOORS) -> list:
+    """(scale factor, loader, metric, baseline, current) for each metric beyond its tolerance"""
+    found = []
+    for scale, measured in results.items():
+        for loader, metrics in measured.items():
+            expected = baseline.get(scale, {}).get(loader)
+            if expected is None:
+                continue
+            for metric in METRICS:
+                before, after = expected.get(metric), metrics.get(metric)
+                if before is None or after is None:
+                    continue
+                if after > before * (1 + tolerances[metric]) and after - before > floors[metric]:
+                    found.append((scale, loader, metric, before, after))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale-factors", nargs="+", type=int, default=[1, 10])
+    parser.add_argument("--runs", type=int, default=3, help="Timed calls per loader (best is kept)")
+    parser.add_argument("--loaders", nargs="+", help="Only these loaders")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to check against or update")
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the baseline")
+    parser.add_argument("--tolerance", type=float, help="Allowed growth for every metric, e.g. 0.25 for 25%%")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    tolerances = {metric: args.tolerance for metric in METRICS} if args.tolerance is not None else TOLERANCES
+
+    print("=" * 100)
+    print(f"Loader benchmark (best of {args.runs} runs)")
+    print("=" * 100)
+    print(f"{'Scale':>5}  {'Loader':<46}{'ms':>9}{'Rows scanned':>14}{'Py MB':>8}{'DB MB':>8}{'Rows':>8}")
+
+    results = {}
+    for scale_factor in args.scale_factors:
+        measured = benchmark(scale_factor, args.runs, args.loaders)
+        results[str(scale_factor)] = measured
+        for name, m in measured.items():
+            print(f"{scale_factor:>5}  {name:<46}{m['latency_ms']:>9}{m['rows_scanned']:>14,}"
+                  f"{m['python_peak_mb']:>8}{m['db_peak_mb']:>8}{m['rows']:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "runs": args.runs, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")},
+                      f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)['results']
+        for scale, measured in results.items():
+            baseline.setdefault(scale, {}).update(measured)
+        with open(args.baseline, "w") as f:
+            json.dump({"results": baseline, "runs": args.runs, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")},
+                      f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    found = regressions(results, baseline, tolerances)
+    missing = sorted({name for scale, measured in results.items() for name in measured
+                      if name not in baseline.get(scale, {})})
+    if missing:
+        print(f"\nNot in the baseline: {', '.join(missing)}")
+    if not found:
+        print("\nNo regressions against the baseline")
+        return 0
+    print(f"\n{len(found)} regression(s) against the baseline:")
+    for scale, loader, metric, before, after in found:
+        print(f"  ⚠️ scale {scale} {loader}: {metric} {before} -> {after}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the hospital analytics dashboard
+
+Runs the app once per role in a fresh Python process (so module imports are
+cold, as after a redeploy) using Streamlit's AppTest harness against the local
+DuckDB backend, and reports:
+
+- time to first byte: script start until the first element is emitted
+- time to first chart: script start until the first plotly chart is emitted
+- total: full script run
+
+Usage:
+    python benchmark_startup.py                    # all roles, 3 runs each
+    python benchmark_startup.py --roles CEO Nurse --runs 5
+    python benchmark_startup.py --app /path/to/older/hospital_analytics_app.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_APP = os.path.join(BASE_DIR, "hospital_analytics_app.py")
+ROLES = ["CEO", "Clinical Administrator", "Physician", "Nurse", "Analyst",
+         "Capacity Planner", "Allied Health Coordinator"]
+ELEMENTS = ["markdown", "metric", "dataframe", "plotly_chart"]
+
+
+def run_worker(app_path: str, role: str):
+    """Run the app once in this process and print timings as JSON"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    marks = {}
+
+    def instrument(name):
+        original = getattr(st, name)
+
+        def wrapper(*args, **kwargs):
+            result = original(*args, **kwargs)
+            now = time.perf_counter()
+            marks.setdefault("first_byte", now)
+            if name == "plotly_chart":
+                marks.setdefault("first_chart", now)
+            return result
+        setattr(st, name, wrapper)
+
+    for name in ELEMENTS:
+        instrument(name)
+
+    at = AppTest.from_file(app_path, default_timeout=600)
+    at.query_params["role"] = role
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+
+    def elapsed_ms(mark):
+        return round((marks[mark] - start) * 1000, 1) if mark in marks else None
+
+    print(json.dumps({
+        "role": role,
+        "ttfb_ms": elapsed_ms("first_byte"),
+        "ttfc_ms": elapsed_ms("first_chart"),
+        "total_ms": round((end - start) * 1000, 1),
+        "exceptions": [e.value for e in at.exception],
+    }))
+
+
+def measure(app_path: str, role: str) -> dict:
+    """Run one cold start in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", role, "--app", app_path],
+        capture_output=True, text=True, cwd=os.path.dirname(app_path), check=True,
+        # The background cache warmer would compete with the run being timed
+        env={**os.environ, "HOSPITAL_DEMO_CACHE_WARMER": "0"}
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=DEFAULT_APP, help="Streamlit script to benchmark")
+    parser.add_argument("--roles", nargs="+", default=ROLES, help="Roles to benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per role")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+
+    if args.worker:
+        run_worker(app_path, args.worker)
+        return
+
+    print("=" * 72)
+    print(f"Cold-start benchmark: {os.path.basename(app_path)} ({args.runs} runs per role)")
+    print("=" * 72)
+    print(f"{'Role':<28}{'TTFB (ms)':>14}{'First chart (ms)':>18}{'Total (ms)':>12}")
+
+    results = []
+    for role in args.roles:
+        runs = [measure(app_path, role) for _ in range(args.runs)]
+        summary = {
+            "role": role,
+            "ttfb_ms": median(r["ttfb_ms"] for r in runs),
+            "ttfc_ms": median(r["ttfc_ms"] for r in runs),
+            "total_ms": median(r["total_ms"] for r in runs),
+            "exceptions": sorted({e for r in runs for e in r["exceptions"]}),
+        }
+        results.append(summary)
+        print(f"{role:<28}{summary['ttfb_ms'] or '-':>14}{summary['ttfc_ms'] or '-':>18}{summary['total_ms']:>12}")
+        for exception in summary["exceptions"]:
+            print(f"  ⚠️ {exception.splitlines()[0]}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"app": app_path, "runs": args.runs, "results": results,
+                       "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Cache warmer for peak clinical hours
+
+Shift changes (07:00 and 19:00) bring a burst of simultaneous dashboard
+opens. The warmer precomputes the datasets behind each role's default view
+off the request path, so those opens are cache hits. It warms:
+
+- shortly before each configured peak window (PEAK_WINDOWS, WARM_LEAD)
+- after a data load, checked at LOAD_CHECKS (after the nightly load) and
+  before each peak warm; only the loaders reading the changed tables are
+  warmed
+
+Loads are detected from catalog metadata alone (row counts and LAST_ALTERED,
+see freshness.build_metadata_query), without the freshness probe's scans.
+Between these times the warmer sleeps and runs no queries, so it never keeps
+the warehouse from suspending.
+
+The warming plan is derived from the role views themselves. Each view's
+calls to the loaders are read from its source:
+
+- ``period_days`` is bound to the default analysis period
+- ``st.session_state.get(key, default)`` resolves to its default
+- other widget-driven arguments take the loader's default
+
+Arguments are passed by name, in the order the view passes them, so a warm
+fills the same ``st.cache_data`` entry as the view's own call. Warms run on
+a small thread pool, and each warm's duration is logged.
+
+In the app the warmer is opt-in (HOSPITAL_DEMO_CACHE_WARMER=1). It then runs
+as a daemon thread, started once per process (``start_cache_warmer``), and
+fills the in-memory and disk caches. Run as a script, it warms the disk cache
+once, e.g. from cron after a load:
+
+    python cache_warmer.py --once
+"""
+
+import argparse
+import ast
+import importlib
+import inspect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERIOD_DAYS = 30  # "Last 30 Days", the dashboard's default period
+PEAK_WINDOWS = ('07:00', '19:00')
+WARM_LEAD = timedelta(minutes=10)
+LOAD_CHECKS = ('05:00',)  # after the nightly load
+WARM_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class WarmTask:
+    """One loader call to precompute, and the roles whose default view makes it"""
+    loader: str
+    kwargs: tuple = ()
+    roles: tuple = field(default=(), compare=False)
+
+    def describe(self) -> str:
+        return f"{self.loader}({', '.join(f'{k}={v!r}' for k, v in self.kwargs)})"
+
+
+def _resolve(node, bindings, default):
+    """Value a view passes for an argument in its default state"""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in bindings:
+        return bindings[node.id]
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'get'
+            and ast.unparse(node.func.value) == 'st.session_state' and len(node.args) == 2
+            and isinstance(node.args[1], ast.Constant)):
+        return node.args[1].value
+    if default is inspect.Parameter.empty:
+        raise ValueError(ast.unparse(node))
+    return default
+
+
+def view_loader_calls(module_name: str, bindings: dict = None, loader_module=None) -> list:
+    """Loader calls (name, ordered (arg, value) pairs) made by a view module, from its source"""
+    bindings = bindings if bindings is not None else {'period_days': DEFAULT_PERIOD_DAYS}
+    loader_module = loader_module or importlib.import_module('loaders')
+    tree = ast.parse(inspect.getsource(importlib.import_module(module_name)))
+    names = {
+        alias.asname or alias.name: alias.name
+        for node in ast.walk(tree) if isinstance(node, ast.ImportFrom) and node.module == 'loaders'
+        for alias in node.names if alias.name.startswith('get_')
+    }
+    calls = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in names):
+            continue
+        loader = names[node.func.id]
+        parameters = list(inspect.signature(getattr(loader_module, loader)).parameters.values())
+        try:
+            kwargs = [(p.name, _resolve(arg, bindings, p.default)) for p, arg in zip(parameters, node.args)]
+            by_name = {p.name: p for p in parameters}
+            kwargs += [(k.arg, _resolve(k.value, bindings, by_name[k.arg].default)) for k in node.keywords]
+        except ValueError:
+            logger.warning("Skipping %s in %s: an argument has no default", loader, module_name)
+            continue
+        calls.append((loader, tuple(kwargs)))
+    return calls
+
+
+def build_warm_plan(role_views: dict = None, bindings: dict = None) -> list:
+    """Deduplicated warm tasks for every role's default view"""
+    if role_views is None:
+        from views import ROLE_VIEWS as role_views
+    tasks = {}
+    for role, module_name in role_views.items():
+        for loader, kwargs in view_loader_calls(module_name, bindings):
+            key = (loader, kwargs)
+            roles = tasks[key].roles if key in tasks else ()
+            if role not in roles:
+                tasks[key] = WarmTask(loader, kwargs, roles + (role,))
+    return list(tasks.values())
+
+
+def next_warm_time(now: datetime, windows=PEAK_WINDOWS, lead: timedelta = WARM_LEAD) -> datetime:
+    """Next time to warm: ``lead`` before the next peak window"""
+    candidates = []
+    for window in windows:
+        hour, minute = (int(part) for part in window.split(':'))
+        for day in (0, 1):
+            start = (now + timedelta(days=day)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if start - lead > now:
+                candidates.append(start - lead)
+    return min(candidates)
+
+
+class CacheWarmer:
+    """Runs a warm plan on a bounded pool, before peaks and after data loads"""
+
+    def __init__(self, plan: list = None, loader_module=None, workers: int = WARM_WORKERS,
+                 windows=PEAK_WINDOWS, lead: timedelta = WARM_LEAD, load_checks=LOAD_CHECKS):
+        self.plan = plan
+        self._loaders = loader_module
+        self.workers = workers
+        self.windows = windows
+        self.lead = lead
+        self.load_checks = load_checks
+        self.history = []
+        self._seen_versions = None
+        self._stop = threading.Event()
+
+    @property
+    def loaders(self):
+        if self._loaders is None:
+            self._loaders = importlib.import_module('loaders')
+        return self._loaders
+
+    def _warm_one(self, task: WarmTask) -> dict:
+        start = time.perf_counter()
+        error = None
+        try:
+            loader = getattr(self.loaders, task.loader)
+            loader(**dict(task.kwargs))
+            if hasattr(loader, 'wait'):
+                # Stale-while-revalidate loaders refresh in the background
+                loader.wait(**dict(task.kwargs))
+        except Exception as e:
+            error = str(e)
+            logger.exception("Warming %s failed", task.describe())
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info("Warmed %s in %.1f ms", task.describe(), elapsed_ms)
+        return {'task': task.describe(), 'roles': task.roles, 'ms': elapsed_ms, 'error': error}
+
+    def warm(self, tasks: list = None, reason: str = 'manual') -> list:
+        """Run warm tasks (the whole plan by default) on the pool; returns per-task timings"""
+        tasks = self.plan if tasks is None else tasks
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='cache-warm') as pool:
+            results = list(pool.map(self._warm_one, tasks))
+        total_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info("Cache warm (%s): %d datasets in %.1f ms", reason, len(tasks), total_ms)
+        self.history.append({'at': datetime.now(), 'reason': reason, 'datasets': len(tasks),
+                             'total_ms': total_ms, 'results': results})
+        del self.history[:-20]
+        return results
+
+    def tasks_for_changed_tables(self) -> list:
+        """Tasks whose loaders read a table changed since the last check (none on the first check)"""
+        from freshness import changed_tables, loader_sources, table_versions
+
+        metadata = self.loaders.get_table_metadata()
+        if len(metadata) == 0:
+            return []
+        current = table_versions(metadata)
+        changed = changed_tables(self._seen_versions, current) if self._seen_versions is not None else set()
+        self._seen_versions = current
+        if not changed:
+            return []
+        # Re-probe, so the cached loaders reading the changed tables are cleared before the warm
+        self.loaders.get_freshness_probe.clear()
+        self.loaders.refresh_stale_loaders()
+        return [task for task in self.plan if loader_sources(getattr(self.loaders, task.loader)) & changed]
+
+    def run(self):
+        """Scheduler loop: warm before peak windows and after data loads until stopped"""
+        if self.plan is None:
+            self.plan = build_warm_plan()
+        next_peak = next_warm_time(datetime.now(), self.windows, self.lead)
+        next_check = next_warm_time(datetime.now(), self.load_checks, timedelta(0))
+        self.tasks_for_changed_tables()
+        while not self._stop.is_set():
+            try:
+                if datetime.now() >= next_peak:
+                    self.tasks_for_changed_tables()
+                    self.warm(reason='peak window')
+                    next_peak = next_warm_time(datetime.now(), self.windows, self.lead)
+                if datetime.now() >= next_check:
+                    changed = self.tasks_for_changed_tables()
+                    if changed:
+                        self.warm(changed, reason='data load')
+                    next_check = next_warm_time(datetime.now(), self.load_checks, timedelta(0))
+            except Exception:
+                logger.exception("Cache warmer tick failed")
+            wait = min(next_peak, next_check) - datetime.now()
+            self._stop.wait(max(wait, timedelta(0)).total_seconds())
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name='cache-warmer', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def peak_windows_from_env() -> tuple:
+    """Peak windows from HOSPITAL_DEMO_PEAK_WINDOWS (e.g. "07:00,19:00")"""
+    value = os.environ.get("HOSPITAL_DEMO_PEAK_WINDOWS")
+    return tuple(w.strip() for w in value.split(',') if w.strip()) if value else PEAK_WINDOWS
+
+
+def load_checks_from_env() -> tuple:
+    """Load-check times from HOSPITAL_DEMO_LOAD_CHECKS (e.g. "05:00,13:00")"""
+    value = os.environ.get("HOSPITAL_DEMO_LOAD_CHECKS")
+    return tuple(t.strip() for t in value.split(',') if t.strip()) if value else LOAD_CHECKS
+
+
+def start_cache_warmer() -> CacheWarmer:
+    """Start the background warmer (the plan is built on its own thread)"""
+    warmer = CacheWarmer(windows=peak_windows_from_env(), load_checks=load_checks_from_env())
+    warmer.start()
+    return warmer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Warm the whole plan once and exit")
+    parser.add_argument("--plan", action="store_true", help="Print the warm plan and exit")
+    parser.add_argument("--workers", type=int, default=WARM_WORKERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    plan = build_warm_plan()
+    if args.plan:
+        for task in plan:
+            print(f"{task.describe():<60} {', '.join(task.roles)}")
+        return
+    warmer = CacheWarmer(plan, workers=args.workers, windows=peak_windows_from_env())
+    if args.once:
+        warmer.warm(reason='command line')
+    else:
+        warmer.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Queueing-theory capacity scenarios
+
+Each department's beds are modelled as an M/M/c queue: admissions arrive at
+rate lambda per day, a bed is occupied for the average length of stay, and
+c is the number of beds. The offered load is a = lambda * LOS bed-days per
+day. For every department and every bed change in a range this computes, in
+one vectorized pass:
+
+- expected utilization (a / c)
+- Erlang-B blocking probability (no bed free, patient diverted)
+- Erlang-C probability an arriving patient has to wait for a bed
+- expected wait for a bed, in hours
+"""
+
+import numpy as np
+import pandas as pd
+
+SCENARIO_COLUMNS = ['DEPARTMENT_NAME', 'BED_CHANGE', 'BEDS', 'OFFERED_LOAD', 'UTILIZATION_PERCENTAGE',
+                    'BLOCKING_PROBABILITY', 'WAIT_PROBABILITY', 'EXPECTED_WAIT_HOURS']
+
+
+def erlang_b_table(offered_load: np.ndarray, max_servers: int) -> np.ndarray:
+    """Erlang-B blocking probability for 0..max_servers servers
+
+    Uses the stable recursion B(0) = 1, B(k) = a B(k-1) / (k + a B(k-1)),
+    vectorized over the offered loads. Returns an array of shape
+    (max_servers + 1, len(offered_load)).
+    """
+    offered_load = np.asarray(offered_load, dtype=float)
+    table = np.empty((max_servers + 1, offered_load.size))
+    table[0] = 1.0
+    for k in range(1, max_servers + 1):
+        carried = offered_load * table[k - 1]
+        table[k] = carried / (k + carried)
+    return table
+
+
+def erlang_c(servers: np.ndarray, offered_load: np.ndarray, blocking: np.ndarray) -> np.ndarray:
+    """Erlang-C probability of waiting from the Erlang-B probability
+
+    C = c B / (c - a (1 - B)) for a stable queue (a < c); an overloaded
+    queue (a >= c) always waits.
+    """
+    servers = np.asarray(servers, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wait = servers * blocking / (servers - offered_load * (1 - blocking))
+    return np.where(offered_load < servers, wait, 1.0)
+
+
+def scenario_grid(demand: pd.DataFrame, min_change: int = -10, max_change: int = 20) -> pd.DataFrame:
+    """Evaluate every department under every bed change in [min_change, max_change]
+
+    ``demand`` needs DEPARTMENT_NAME, CURRENT_BEDS, ARRIVALS_PER_DAY and
+    AVG_LOS_DAYS columns (see loaders.get_department_demand). Scenarios that
+    leave a department with no beds are dropped.
+    """
+    if len(demand) == 0:
+        return pd.DataFrame(columns=SCENARIO_COLUMNS)
+
+    changes = np.arange(min_change, max_change + 1)
+    current_beds = demand['CURRENT_BEDS'].to_numpy(dtype=int)
+    arrivals = demand['ARRIVALS_PER_DAY'].to_numpy(dtype=float)
+    los = demand['AVG_LOS_DAYS'].to_numpy(dtype=float)
+    offered_load = arrivals * los
+
+    # departments x changes
+    beds = current_beds[:, None] + changes[None, :]
+    valid = beds > 0
+    beds_clipped = np.where(valid, beds, 1)
+
+    table = erlang_b_table(offered_load, int(beds_clipped.max()))
+    dept_index = np.broadcast_to(np.arange(len(demand))[:, None], beds.shape)
+    load = np.broadcast_to(offered_load[:, None], beds.shape)
+    blocking = table[beds_clipped, dept_index]
+    wait_probability = erlang_c(beds_clipped, load, blocking)
+
+    # Wq = C / (c mu - lambda) with mu = 1 / LOS, in hours
+    service_rate = np.broadcast_to(np.divide(1.0, los, out=np.zeros_like(los), where=los > 0)[:, None], beds.shape)
+    spare_rate = beds_clipped * service_rate - arrivals[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_wait = np.where(spare_rate > 0, wait_probability / spare_rate * 24, np.inf)
+    # No offered load (no arrivals, or no length of stay): nobody waits
+    expected_wait = np.where(load > 0, expected_wait, 0.0)
+
+    grid = pd.DataFrame({
+        'DEPARTMENT_NAME': np.repeat(demand['DEPARTMENT_NAME'].to_numpy(), len(changes)),
+        'BED_CHANGE': np.tile(changes, len(demand)),
+        'BEDS': beds.ravel(),
+        'OFFERED_LOAD': load.ravel(),
+        'UTILIZATION_PERCENTAGE': (np.minimum(load / beds_clipped, 1.0) * 100).ravel(),
+        'BLOCKING_PROBABILITY': blocking.ravel(),
+        'WAIT_PROBABILITY': wait_probability.ravel(),
+        'EXPECTED_WAIT_HOURS': expected_wait.ravel(),
+    })
+    return grid[valid.ravel()].reset_index(drop=True)
@@ -0,0 +1,379 @@
+"""
+Sketch-based data-quality profiler for the RAW_DATA tables
+
+Each load batch (``source_file``) of every ``*_RAW`` table is profiled once,
+in a single streaming pass over its rows. Every column gets a row count, a
+null count, a HyperLogLog sketch for distinct counts, a KLL sketch for
+quantiles (numeric columns), min/max, and a count of values outside the
+expected range in VALUE_RANGES. The sketches are stored per batch in
+HOSPITAL_DEMO.ANALYTICS.DATA_PROFILES.
+
+All of these statistics merge, so a table's profile is the merge of its batch
+profiles. New loads only need their own batches profiled, and the dashboard
+reads the stored profiles instead of rescanning the tables.
+
+Usage:
+    python data_profiler.py          # profile any batches not yet profiled
+"""
+
+import base64
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+RAW_SCHEMA = "HOSPITAL_DEMO.RAW_DATA"
+PROFILE_TABLE = "HOSPITAL_DEMO.ANALYTICS.DATA_PROFILES"
+RAW_TABLES = [
+    'PATIENT_DEMOGRAPHICS_RAW', 'PATIENT_ADMISSIONS_RAW', 'HOSPITAL_DEPARTMENTS_RAW',
+    'MEDICAL_PROCEDURES_RAW', 'BED_INVENTORY_RAW', 'BED_BOOKINGS_RAW', 'BED_AVAILABILITY_RAW',
+    'PHARMACY_INVENTORY_RAW', 'MEDICATION_ORDERS_RAW', 'MEDICATION_DISPENSING_RAW',
+    'ALLIED_HEALTH_SERVICES_RAW',
+]
+METADATA_COLUMNS = {'LOAD_TIMESTAMP', 'SOURCE_FILE'}
+
+# (table, column) -> (min, max) of plausible values; None leaves a side open
+VALUE_RANGES = {
+    ('PATIENT_DEMOGRAPHICS_RAW', 'DATE_OF_BIRTH'): ('1900-01-01', None),
+    ('PATIENT_ADMISSIONS_RAW', 'TOTAL_CHARGES'): (0, 1_000_000),
+    ('PATIENT_ADMISSIONS_RAW', 'TEMPERATURE_F'): (-40, 130),
+    ('HOSPITAL_DEPARTMENTS_RAW', 'BED_CAPACITY'): (0, 1_000),
+    ('MEDICAL_PROCEDURES_RAW', 'PROCEDURE_DURATION_MINUTES'): (1, 24 * 60),
+    ('MEDICAL_PROCEDURES_RAW', 'PROCEDURE_COST'): (0, 1_000_000),
+    ('BED_INVENTORY_RAW', 'DAILY_RATE'): (0, 50_000),
+    ('BED_BOOKINGS_RAW', 'TOTAL_NIGHTS'): (0, 365),
+    ('BED_BOOKINGS_RAW', 'NIGHTLY_RATE'): (0, 50_000),
+    ('PHARMACY_INVENTORY_RAW', 'UNIT_COST'): (0, 100_000),
+    ('PHARMACY_INVENTORY_RAW', 'QUANTITY_ON_HAND'): (0, None),
+    ('MEDICATION_ORDERS_RAW', 'QUANTITY_ORDERED'): (1, 10_000),
+    ('MEDICATION_ORDERS_RAW', 'DURATION_DAYS'): (0, 365),
+    ('MEDICATION_DISPENSING_RAW', 'QUANTITY_DISPENSED'): (0, 10_000),
+    ('MEDICATION_DISPENSING_RAW', 'TOTAL_COST'): (0, 1_000_000),
+    ('ALLIED_HEALTH_SERVICES_RAW', 'DURATION_MINUTES'): (1, 24 * 60),
+    ('ALLIED_HEALTH_SERVICES_RAW', 'SERVICE_COST'): (0, 100_000),
+}
+
+SUMMARY_COLUMNS = ['TABLE_NAME', 'COLUMN_NAME', 'ROWS', 'NULL_PCT', 'DISTINCT_ESTIMATE',
+                   'P50', 'P95', 'MIN', 'MAX', 'RANGE_VIOLATIONS']
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch; merges by register-wise max"""
+
+    def __init__(self, precision: int = 12, registers: np.ndarray = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remaining = hashes << np.uint64(p)
+        # Bit length of the remaining 64 - p bits; the top 53 bits convert to
+        # float exactly, and an all-zero top is rare enough to cap
+        high = (remaining >> np.uint64(11)).astype(np.float64)
+        bit_length = np.where(high > 0, np.frexp(high)[1] + 11, 0)
+        rank = np.minimum(64 - bit_length + 1, 64 - p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = np.maximum(self.registers, other.registers)
+
+    def estimate(self) -> float:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def to_dict(self) -> dict:
+        return {'p': self.precision, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return cls(data['p'], registers)
+
+
+class KLLSketch:
+    """KLL quantile sketch; level h holds items of weight 2**h"""
+
+    def __init__(self, k: int = 200, compactors: list = None, n: int = 0):
+        self.k = k
+        self.compactors = compactors or [np.empty(0)]
+        self.n = n
+        self._rng = np.random.default_rng(0)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+                # Capacities shrink as levels are added, so start over
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        self.n += values.size
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return float('nan')
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2 ** level) for level, c in enumerate(self.compactors)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(values[order][min(position, len(values) - 1)])
+
+    def to_dict(self) -> dict:
+        return {'k': self.k, 'n': self.n, 'compactors': [c.tolist() for c in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        return cls(data['k'], [np.asarray(c, dtype=float) for c in data['compactors']], data['n'])
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """Stable 64-bit hashes, independent of the integer width the driver picked"""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        values = values.astype('float64')
+    else:
+        values = values.astype(str)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def _is_temporal(values: pd.Series) -> bool:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return True
+    first = values.iloc[0] if len(values) > 0 else None
+    return hasattr(first, 'isoformat') and hasattr(first, 'year')
+
+
+class ColumnProfile:
+    """Mergeable statistics for one column"""
+
+    def __init__(self, value_range=None):
+        self.rows = 0
+        self.nulls = 0
+        self.violations = 0
+        self.minimum = None
+        self.maximum = None
+        self.value_range = value_range
+        self.hll = HyperLogLog()
+        self.kll = None
+
+    def update(self, values: pd.Series):
+        self.rows += len(values)
+        present = values.dropna()
+        self.nulls += len(values) - len(present)
+        if len(present) == 0:
+            return
+        self.hll.update(_hash_values(present))
+
+        if pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present):
+            comparable = present.astype(float)
+            if self.kll is None:
+                self.kll = KLLSketch()
+            self.kll.update(comparable.to_numpy())
+            low, high = float(comparable.min()), float(comparable.max())
+        elif _is_temporal(present):
+            comparable = pd.to_datetime(present).dt.strftime('%Y-%m-%d')
+            low, high = comparable.min(), comparable.max()
+        else:
+            return
+
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        if self.value_range is not None:
+            lower, upper = self.value_range
+            outside = pd.Series(False, index=comparable.index)
+            if lower is not None:
+                outside |= comparable < lower
+            if upper is not None:
+                outside |= comparable > upper
+            self.violations += int(outside.sum())
+
+    def merge(self, other: "ColumnProfile"):
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.violations += other.violations
+        for bound in ('minimum', 'maximum'):
+            mine, theirs = getattr(self, bound), getattr(other, bound)
+            if mine is None or theirs is None:
+                setattr(self, bound, mine if theirs is None else theirs)
+            else:
+                setattr(self, bound, min(mine, theirs) if bound == 'minimum' else max(mine, theirs))
+        self.hll.merge(other.hll)
+        if other.kll is not None:
+            if self.kll is None:
+                self.kll = KLLSketch()
+            self.kll.merge(other.kll)
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.rows, 'nulls': self.nulls, 'violations': self.violations,
+            'min': self.minimum, 'max': self.maximum, 'range': self.value_range,
+            'hll': self.hll.to_dict(), 'kll': self.kll.to_dict() if self.kll is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnProfile":
+        profile = cls(tuple(data['range']) if data.get('range') else None)
+        profile.rows, profile.nulls, profile.violations = data['rows'], data['nulls'], data['violations']
+        profile.minimum, profile.maximum = data['min'], data['max']
+        profile.hll = HyperLogLog.from_dict(data['hll'])
+        profile.kll = KLLSketch.from_dict(data['kll']) if data.get('kll') else None
+        return profile
+
+
+class TableProfile:
+    """Mergeable profile of a table (or one load batch of it)"""
+
+    def __init__(self, table: str, columns: dict = None):
+        self.table = table.upper()
+        self.columns = columns or {}
+
+    def update(self, chunk: pd.DataFrame):
+        """Fold a chunk of rows into the profile"""
+        for name in chunk.columns:
+            column = str(name).upper()
+            if column in METADATA_COLUMNS:
+                continue
+            if column not in self.columns:
+                self.columns[column] = ColumnProfile(VALUE_RANGES.get((self.table, column)))
+            self.columns[column].update(chunk[name])
+
+    def merge(self, other: "TableProfile"):
+        for column, profile in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(profile)
+            else:
+                self.columns[column] = profile
+
+    @property
+    def rows(self) -> int:
+        return max((c.rows for c in self.columns.values()), default=0)
+
+    def to_json(self) -> str:
+        return json.dumps({'table': self.table, 'columns': {k: v.to_dict() for k, v in self.columns.items()}})
+
+    @classmethod
+    def from_json(cls, payload: str) -> "TableProfile":
+        data = json.loads(payload)
+        return cls(data['table'], {k: ColumnProfile.from_dict(v) for k, v in data['columns'].items()})
+
+    def summary(self) -> pd.DataFrame:
+        """One row of statistics per column"""
+        rows = []
+        for column, profile in self.columns.items():
+            rows.append({
+                'TABLE_NAME': self.table,
+                'COLUMN_NAME': column,
+                'ROWS': profile.rows,
+                'NULL_PCT': 100.0 * profile.nulls / profile.rows if profile.rows else 0.0,
+                'DISTINCT_ESTIMATE': int(round(profile.hll.estimate())),
+                'P50': profile.kll.quantile(0.5) if profile.kll is not None else None,
+                'P95': profile.kll.quantile(0.95) if profile.kll is not None else None,
+                'MIN': profile.minimum,
+                'MAX': profile.maximum,
+                'RANGE_VIOLATIONS': profile.violations,
+            })
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def merge_profiles(stored: pd.DataFrame) -> dict:
+    """Merge stored batch profiles (TABLE_NAME, PROFILE rows) into {table: TableProfile}"""
+    tables = {}
+    for table, payload in zip(stored['TABLE_NAME'], stored['PROFILE']):
+        profile = TableProfile.from_json(payload)
+        if table in tables:
+            tables[table].merge(profile)
+        else:
+            tables[table] = profile
+    return tables
+
+
+def _pandas_batches(frame):
+    # Snowpark DataFrames stream results in batches; anything else is one batch
+    if hasattr(frame, 'to_pandas_batches'):
+        return frame.to_pandas_batches()
+    return [frame.to_pandas()]
+
+
+def ensure_profile_table(session):
+    session.sql(f"""
+        CREATE TABLE IF NOT EXISTS {PROFILE_TABLE} (
+            table_name STRING,
+            load_batch STRING,
+            row_count INTEGER,
+            profile STRING,
+            profiled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+        )
+    """).collect()
+
+
+def profile_new_batches(session, tables=RAW_TABLES) -> int:
+    """Profile load batches that have no stored profile yet; returns batches profiled"""
+    ensure_profile_table(session)
+    done = session.sql(f"SELECT table_name, load_batch FROM {PROFILE_TABLE}").to_pandas()
+    done = set(zip(done['TABLE_NAME'], done['LOAD_BATCH']))
+
+    profiled = 0
+    for table in tables:
+        batches = session.sql(
+            f"SELECT DISTINCT COALESCE(source_file, '') AS load_batch FROM {RAW_SCHEMA}.{table}"
+        ).to_pandas()['LOAD_BATCH']
+        for batch in batches:
+            if (table, batch) in done:
+                continue
+            profile = TableProfile(table)
+            rows = session.sql(
+                f"SELECT * FROM {RAW_SCHEMA}.{table} WHERE COALESCE(source_file, '') = ?", params=[batch]
+            )
+            for chunk in _pandas_batches(rows):
+                profile.update(chunk)
+            session.sql(
+                f"INSERT INTO {PROFILE_TABLE} (table_name, load_batch, row_count, profile) SELECT ?, ?, ?, ?",
+                params=[table, batch, profile.rows, profile.to_json()]
+            ).collect()
+            profiled += 1
+    return profiled
+
+
+if __name__ == "__main__":
+    from app_session import get_session
+
+    count = profile_new_batches(get_session())
+    print(f"Profiled {count} new load batches into {PROFILE_TABLE}")
@@ -0,0 +1,248 @@
+"""
+Persistent on-disk tier for loader results
+
+``st.cache_data`` lives in process memory, so a redeploy or restart sends
+every user's first view back to the warehouse. Loaders decorated with
+``persistent`` also keep their results on disk as zstd-compressed Parquet,
+below the in-memory cache, so a restarted app is warm immediately.
+
+Each file carries its metadata in the Parquet footer:
+
+- loader name
+- SQL fingerprint: a hash of the loader's source, so an edited query never
+  reads an old result
+- parameters
+- created-at time
+- versions of the source tables (LAST_ALTERED and ROW_COUNT from the
+  freshness probe)
+
+A result is only served while the versions of its source tables match the
+current probe, it is younger than MAX_AGE, and (for queries relative to
+CURRENT_DATE) it was created on the same day.
+
+Several Streamlit worker processes can share the directory:
+
+- files are written to a temporary name and renamed into place, so readers
+  never see a partial file
+- writes and evictions hold an exclusive lock on ``.lock``
+- a hit touches the file's mtime, and eviction removes the least recently
+  used files until the directory is under its size cap
+
+Where the directory cannot be created or written (a read-only or ephemeral
+filesystem, such as Streamlit in Snowflake), loaders skip the disk tier and
+query as usual; this is logged once per process.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to rename-only safety
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "results")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+MAX_AGE = timedelta(days=1)
+METADATA_KEY = b'hospital_demo.cache'
+
+_unavailable_logged = False
+
+
+class DiskCache:
+    """Directory of Parquet result files with a size cap and LRU eviction"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key: str):
+        """Return (frame, metadata) for a key, or None on a miss"""
+        import pyarrow.parquet as pq
+
+        path = self.path(key)
+        try:
+            table = pq.read_table(path)
+            os.utime(path)
+        except OSError:
+            return None
+        except Exception:
+            logger.warning("Unreadable cache file %s; ignoring it", path)
+            return None
+        metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b'{}'))
+        return table.to_pandas(), metadata
+
+    def put(self, key: str, df: pd.DataFrame, metadata: dict):
+        """Store a result atomically, then evict down to the size cap"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            METADATA_KEY: json.dumps(metadata, default=str).encode(),
+        })
+        with self._locked():
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            os.close(fd)
+            try:
+                pq.write_table(table, temp_path, compression='zstd')
+                os.replace(temp_path, self.path(key))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            self._evict()
+
+    def _evict(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.parquet'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def entries(self) -> pd.DataFrame:
+        """Metadata of every cached result, most recently used first"""
+        import pyarrow.parquet as pq
+
+        rows = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.parquet'):
+                continue
+            try:
+                stat = entry.stat()
+                metadata = json.loads((pq.read_schema(entry.path).metadata or {}).get(METADATA_KEY, b'{}'))
+            except OSError:
+                continue
+            rows.append({**metadata, 'bytes': stat.st_size,
+                         'last_used': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)})
+        return pd.DataFrame(rows).sort_values('last_used', ascending=False) if rows else pd.DataFrame()
+
+    def clear(self):
+        with self._locked():
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.parquet'):
+                    os.remove(entry.path)
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache():
+    """Process-wide cache in HOSPITAL_DEMO_CACHE_DIR, capped at HOSPITAL_DEMO_CACHE_MAX_BYTES"""
+    return DiskCache(
+        os.environ.get("HOSPITAL_DEMO_CACHE_DIR", DEFAULT_CACHE_DIR),
+        int(os.environ.get("HOSPITAL_DEMO_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    )
+
+
+def _disk_unavailable(error: OSError):
+    """Log, once per process, that loaders are skipping the disk tier"""
+    global _unavailable_logged
+    if not _unavailable_logged:
+        _unavailable_logged = True
+        logger.warning("Disk cache unavailable (%s); loaders run without it", error)
+
+
+def sql_fingerprint(func) -> str:
+    """Hash of a loader's source, which embeds its SQL"""
+    return hashlib.sha256(inspect.getsource(func).encode()).hexdigest()[:16]
+
+
+def cache_key(name: str, fingerprint: str, params: dict, day: str = None) -> str:
+    payload = json.dumps([name, fingerprint, params, day], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def persistent(source_versions, cache=None):
+    """Decorator factory: keep a loader's results in the disk cache
+
+    ``source_versions(func)`` returns the current {table: version} map for the
+    tables a loader reads (an empty map when the probe is unavailable).
+    """
+    def decorator(func):
+        fingerprint = sql_fingerprint(func)
+        signature = inspect.signature(func)
+        dated = 'CURRENT_DATE' in inspect.getsource(func).upper()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                store = cache or default_cache()
+            except OSError as e:
+                _disk_unavailable(e)
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            day = date.today().isoformat() if dated else None
+            key = cache_key(func.__name__, fingerprint, params, day)
+            versions = source_versions(func)
+
+            try:
+                hit = store.get(key)
+            except OSError as e:
+                _disk_unavailable(e)
+                hit = None
+            if hit is not None:
+                df, metadata = hit
+                created = datetime.fromisoformat(metadata.get('created_at', '1970-01-01T00:00:00+00:00'))
+                stored_versions = {k: list(v) for k, v in metadata.get('source_versions', {}).items()}
+                current_versions = {k: list(v) for k, v in versions.items()}
+                if (datetime.now(timezone.utc) - created <= MAX_AGE
+                        and (not current_versions or stored_versions == current_versions)):
+                    return df
+
+            df = func(*args, **kwargs)
+            # Loaders return an empty frame on error; don't persist those
+            if isinstance(df, pd.DataFrame) and len(df) > 0:
+                try:
+                    store.put(key, df, {
+                        'loader': func.__name__,
+                        'sql_fingerprint': fingerprint,
+                        'params': params,
+                        'created_at': datetime.now(timezone.utc).isoformat(),
+                        'source_versions': versions,
+                        'rows': len(df),
+                    })
+                except OSError as e:
+                    _disk_unavailable(e)
+                except Exception:
+                    logger.exception("Could not persist %s result", func.__name__)
+            return df
+
+        return wrapper
+    return decorator
@@ -0,0 +1,207 @@
+"""
+Admission and census forecasting
+
+Daily admissions for each department are modelled with a linear seasonal
+regression: intercept, yearly trend, day-of-week effects, two annual Fourier
+harmonics and, optionally, weather covariates. Models are fitted from their
+sufficient statistics (X'X, X'y, y'y). A refit therefore only folds in the
+days that arrived since the last fit and never rescans history.
+
+Census is projected with the same exponential length-of-stay assumption as
+the capacity scenarios: each day a fraction exp(-1 / LOS) of yesterday's
+census remains and the day's admissions are added. The census is carried in
+the model state, so it is also updated incrementally.
+
+Departments are fitted in parallel when there are enough of them to be
+worth it: on threads by default, since the app's server process already runs
+background threads and must not be forked. Batch callers outside the app can
+ask for a process pool (``processes=True``); where worker processes are not
+available, fitting falls back to running in-process.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+BASE_FEATURES = ('intercept', 'trend', 'dow_1', 'dow_2', 'dow_3', 'dow_4', 'dow_5', 'dow_6',
+                 'annual_sin_1', 'annual_cos_1', 'annual_sin_2', 'annual_cos_2')
+WEATHER_COLUMNS = ('AVG_TEMPERATURE_C', 'PRECIPITATION_MM')
+RIDGE_PENALTY = 1e-3
+PARALLEL_MIN_DEPARTMENTS = 8
+FORECAST_COLUMNS = ['DEPARTMENT_NAME', 'FORECAST_DATE', 'ADMISSIONS_FORECAST', 'FORECAST_STD',
+                    'LOWER_BOUND', 'UPPER_BOUND', 'CENSUS_FORECAST']
+
+
+def design_matrix(dates, origin: pd.Timestamp, weather: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """Build the regression features for a run of dates"""
+    dates = pd.DatetimeIndex(dates)
+    days = np.asarray((dates - origin).days, dtype=float)
+    dow = dates.dayofweek.to_numpy()
+    angle = 2 * np.pi * dates.dayofyear.to_numpy() / 365.25
+    columns = [np.ones(len(dates)), days / 365.25]
+    columns += [(dow == d).astype(float) for d in range(1, 7)]
+    columns += [np.sin(angle), np.cos(angle), np.sin(2 * angle), np.cos(2 * angle)]
+    if weather is not None:
+        columns += [weather[column].to_numpy(dtype=float) for column in WEATHER_COLUMNS]
+    return np.column_stack(columns)
+
+
+def weather_for_dates(dates, weather: pd.DataFrame) -> pd.DataFrame:
+    """Weather covariates for the given dates, gaps filled with the overall mean"""
+    indexed = weather.set_index(pd.to_datetime(weather['WEATHER_DATE']))[list(WEATHER_COLUMNS)].astype(float)
+    aligned = indexed.reindex(pd.DatetimeIndex(dates))
+    return aligned.fillna(indexed.mean()).fillna(0.0)
+
+
+@dataclass
+class ModelState:
+    """Sufficient statistics and census for one department's model"""
+    department: str
+    features: tuple
+    origin: pd.Timestamp
+    last_date: Optional[pd.Timestamp] = None
+    n_days: int = 0
+    xtx: np.ndarray = field(default=None, repr=False)
+    xty: np.ndarray = field(default=None, repr=False)
+    yty: float = 0.0
+    census: float = 0.0
+
+    def __post_init__(self):
+        if self.xtx is None:
+            self.xtx = np.zeros((len(self.features), len(self.features)))
+            self.xty = np.zeros(len(self.features))
+
+    def coefficients(self) -> np.ndarray:
+        penalty = RIDGE_PENALTY * np.eye(len(self.features))
+        return np.linalg.solve(self.xtx + penalty, self.xty)
+
+    def residual_std(self) -> float:
+        beta = self.coefficients()
+        rss = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        dof = max(self.n_days - len(self.features), 1)
+        return float(np.sqrt(max(rss, 0.0) / dof))
+
+
+def fit_increment(state: ModelState, dates, admissions, avg_los: float,
+                  weather: Optional[pd.DataFrame] = None) -> ModelState:
+    """Fold new days of admissions into a model; returns the updated state"""
+    X = design_matrix(dates, state.origin, weather)
+    y = np.asarray(admissions, dtype=float)
+    census = state.census
+    survival = np.exp(-1.0 / avg_los) if avg_los > 0 else 0.0
+    for count in y:
+        census = census * survival + count
+    return replace(
+        state,
+        last_date=pd.Timestamp(dates[-1]),
+        n_days=state.n_days + len(y),
+        xtx=state.xtx + X.T @ X,
+        xty=state.xty + X.T @ y,
+        yty=state.yty + float(y @ y),
+        census=census,
+    )
+
+
+def _fit_job(job):
+    return fit_increment(*job)
+
+
+def forecast_department(state: ModelState, horizon: int, avg_los: float,
+                        weather: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Forecast daily admissions and census for the days after the last fitted day"""
+    dates = pd.date_range(state.last_date + pd.Timedelta(days=1), periods=horizon, freq='D')
+    future_weather = weather_for_dates(dates, weather) if weather is not None else None
+    admissions = np.clip(design_matrix(dates, state.origin, future_weather) @ state.coefficients(), 0, None)
+    std = state.residual_std()
+
+    survival = np.exp(-1.0 / avg_los) if avg_los > 0 else 0.0
+    census, census_path = state.census, []
+    for count in admissions:
+        census = census * survival + count
+        census_path.append(census)
+
+    return pd.DataFrame({
+        'DEPARTMENT_NAME': state.department,
+        'FORECAST_DATE': dates,
+        'ADMISSIONS_FORECAST': admissions,
+        'FORECAST_STD': std,
+        'LOWER_BOUND': np.clip(admissions - 1.96 * std, 0, None),
+        'UPPER_BOUND': admissions + 1.96 * std,
+        'CENSUS_FORECAST': census_path,
+    })
+
+
+class ForecastModelStore:
+    """Fitted per-department models, refitted incrementally as new days arrive"""
+
+    def __init__(self, use_weather: bool = False, processes: bool = False):
+        self.use_weather = use_weather
+        self.processes = processes
+        self.features = BASE_FEATURES + (WEATHER_COLUMNS if use_weather else ())
+        self.states = {}
+        self._lock = threading.Lock()
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Oldest last-fitted day across departments (None before the first fit)"""
+        dates = [s.last_date for s in self.states.values() if s.last_date is not None]
+        return min(dates) if dates else None
+
+    def update(self, history: pd.DataFrame, demand: pd.DataFrame, weather: pd.DataFrame = None,
+               workers: Optional[int] = None) -> int:
+        """Fit the days in ``history`` newer than each model; returns departments refitted
+
+        ``history`` has DEPARTMENT_NAME, ADMISSION_DATE and ADMISSIONS; departments
+        with no admissions on a day are counted as zero for that day.
+        """
+        if len(history) == 0:
+            return 0
+        history = history.assign(ADMISSION_DATE=pd.to_datetime(history['ADMISSION_DATE']))
+        all_dates = pd.date_range(history['ADMISSION_DATE'].min(), history['ADMISSION_DATE'].max(), freq='D')
+        counts = history.pivot_table(index='ADMISSION_DATE', columns='DEPARTMENT_NAME',
+                                     values='ADMISSIONS', aggfunc='sum').reindex(all_dates).fillna(0)
+        counts = counts.reindex(columns=sorted(set(counts.columns) | set(self.states)), fill_value=0)
+        avg_los = demand.set_index('DEPARTMENT_NAME')['AVG_LOS_DAYS'] if len(demand) > 0 else pd.Series(dtype=float)
+
+        with self._lock:
+            jobs = []
+            for department in counts.columns:
+                state = self.states.get(department) or ModelState(department, self.features, all_dates[0])
+                new_days = counts.index[counts.index > state.last_date] if state.last_date is not None else counts.index
+                if len(new_days) == 0:
+                    continue
+                day_weather = weather_for_dates(new_days, weather) if self.use_weather else None
+                jobs.append((state, new_days, counts.loc[new_days, department].to_numpy(),
+                             float(avg_los.get(department, 0.0)), day_weather))
+
+            for state in self._run(jobs, workers):
+                self.states[state.department] = state
+            return len(jobs)
+
+    def _run(self, jobs, workers):
+        if len(jobs) < PARALLEL_MIN_DEPARTMENTS or workers == 1:
+            return [_fit_job(job) for job in jobs]
+        if self.processes:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(_fit_job, jobs))
+            except (OSError, RuntimeError, NotImplementedError):
+                # No worker processes in this environment; fit in-process
+                return [_fit_job(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='forecast-fit') as pool:
+            return list(pool.map(_fit_job, jobs))
+
+    def forecast(self, horizon: int, demand: pd.DataFrame, weather: pd.DataFrame = None) -> pd.DataFrame:
+        """Forecast every fitted department"""
+        avg_los = demand.set_index('DEPARTMENT_NAME')['AVG_LOS_DAYS'] if len(demand) > 0 else pd.Series(dtype=float)
+        with self._lock:
+            frames = [
+                forecast_department(state, horizon, float(avg_los.get(name, 0.0)),
+                                    weather if self.use_weather else None)
+                for name, state in sorted(self.states.items())
+            ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FORECAST_COLUMNS)
@@ -0,0 +1,185 @@
+"""
+Data freshness from metadata probes
+
+One query reads, for every raw table, dynamic table and pipe, the catalog
+metadata (LAST_ALTERED, ROW_COUNT from INFORMATION_SCHEMA) and the latest
+event time in each raw table. The latest event is a MAX over a date column,
+which Snowflake answers from micro-partition metadata without a scan. From
+the probe:
+
+- the Data Freshness panel shows real staleness per data source
+- the loader cache clears a cached loader when a table it reads from has
+  changed since it was cached (see loaders.refresh_stale_loaders)
+
+Each loader declares the tables its queries read with ``reads``. Loaders
+answered from other loaders' results declare those loaders with
+``derived_from``. A loader declaring neither is never cleared by a load.
+"""
+
+import inspect
+from datetime import timedelta
+
+import pandas as pd
+
+# Data source -> objects feeding it: (schema, object, event-time column or None)
+FRESHNESS_SOURCES = {
+    'EHR System': [
+        ('RAW_DATA', 'PATIENT_ADMISSIONS_RAW', 'admission_date'),
+        ('RAW_DATA', 'PATIENT_DEMOGRAPHICS_RAW', None),
+        ('RAW_DATA', 'HOSPITAL_DEPARTMENTS_RAW', None),
+        ('RAW_DATA', 'MEDICAL_PROCEDURES_RAW', 'procedure_date'),
+        ('TRANSFORMED', 'DT_CLEAN_ADMISSIONS', None),
+        ('TRANSFORMED', 'DT_CLEAN_PROCEDURES', None),
+        ('RAW_DATA', 'HOSPITAL_DATA_PIPE', None),
+    ],
+    'Pharmacy System': [
+        ('RAW_DATA', 'MEDICATION_ORDERS_RAW', 'order_date'),
+        ('RAW_DATA', 'MEDICATION_DISPENSING_RAW', 'dispense_date'),
+        ('RAW_DATA', 'PHARMACY_INVENTORY_RAW', None),
+        ('TRANSFORMED', 'DT_CLEAN_MEDICATIONS', None),
+    ],
+    'Bed Management': [
+        ('RAW_DATA', 'BED_BOOKINGS_RAW', 'created_timestamp'),
+        ('RAW_DATA', 'BED_AVAILABILITY_RAW', 'last_updated'),
+        ('RAW_DATA', 'BED_INVENTORY_RAW', None),
+    ],
+    'Allied Health': [
+        ('RAW_DATA', 'ALLIED_HEALTH_SERVICES_RAW', 'service_date'),
+    ],
+    'Analytics Layer': [
+        ('ANALYTICS', 'DT_DEPARTMENT_ADMISSION_SUMMARY', None),
+        ('ANALYTICS', 'DT_HOSPITAL_KPIS', None),
+        ('ANALYTICS', 'DT_DEPARTMENT_RANKINGS', None),
+    ],
+}
+
+# How long a source may go without a load before it is flagged
+FRESHNESS_SLAS = {
+    'EHR System': timedelta(hours=1),
+    'Pharmacy System': timedelta(hours=1),
+    'Bed Management': timedelta(minutes=15),
+    'Allied Health': timedelta(hours=4),
+    'Analytics Layer': timedelta(minutes=15),
+}
+
+PROBE_COLUMNS = ['OBJECT_SCHEMA', 'OBJECT_NAME', 'OBJECT_TYPE', 'ROW_COUNT', 'LAST_ALTERED', 'LATEST_EVENT']
+METADATA_COLUMNS = PROBE_COLUMNS[:-1]
+
+
+def build_metadata_query(sources: dict = FRESHNESS_SOURCES) -> str:
+    """Catalog row counts and LAST_ALTERED of the monitored objects only: no table is read"""
+    objects = sorted({(schema, name) for entries in sources.values() for schema, name, _ in entries})
+    names = ", ".join(f"'{name}'" for _, name in objects)
+    return f"""
+        SELECT table_schema AS object_schema, table_name AS object_name,
+               CASE WHEN LEFT(table_name, 3) = 'DT_' THEN 'DYNAMIC TABLE' ELSE 'TABLE' END AS object_type,
+               row_count, last_altered
+        FROM HOSPITAL_DEMO.INFORMATION_SCHEMA.TABLES
+        WHERE table_name IN ({names})
+        UNION ALL
+        SELECT pipe_schema, pipe_name, 'PIPE', NULL, last_altered
+        FROM HOSPITAL_DEMO.INFORMATION_SCHEMA.PIPES
+        WHERE pipe_name IN ({names})"""
+
+
+def build_probe_query(sources: dict = FRESHNESS_SOURCES) -> str:
+    """Build the single metadata query behind the freshness probe"""
+    events = "\n        UNION ALL\n".join(
+        f"        SELECT '{name}' AS object_name, MAX({column})::TIMESTAMP AS latest_event "
+        f"FROM HOSPITAL_DEMO.{schema}.{name}"
+        for schema, name, column in sorted({e for entries in sources.values() for e in entries if e[2]})
+    )
+    return f"""
+    WITH objects AS ({build_metadata_query(sources)}
+    ),
+    events AS (
+{events}
+    )
+    SELECT o.object_schema, o.object_name, o.object_type, o.row_count, o.last_altered, e.latest_event
+    FROM objects o
+    LEFT JOIN events e ON o.object_name = e.object_name
+    """
+
+
+def _utc(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None)
+
+
+def source_freshness(probe: pd.DataFrame, now: pd.Timestamp = None,
+                     sources: dict = FRESHNESS_SOURCES, slas: dict = FRESHNESS_SLAS) -> pd.DataFrame:
+    """Summarise a probe into one row per data source with its staleness and status"""
+    now = now if now is not None else pd.Timestamp.now(tz='UTC').tz_localize(None)
+    probe = probe.assign(LAST_ALTERED=_utc(probe['LAST_ALTERED']), LATEST_EVENT=_utc(probe['LATEST_EVENT']))
+    by_name = probe.set_index('OBJECT_NAME')
+
+    rows = []
+    for source, entries in sources.items():
+        found = by_name.loc[by_name.index.intersection([name for _, name, _ in entries])]
+        last_load = found['LAST_ALTERED'].max() if len(found) > 0 else pd.NaT
+        staleness = now - last_load if pd.notna(last_load) else None
+        sla = slas.get(source, timedelta(hours=1))
+        if staleness is None:
+            status = '❔ Unknown'
+        elif staleness <= sla:
+            status = '✅ Current'
+        elif staleness <= sla * 24:
+            status = '⚠️ Delayed'
+        else:
+            status = '❌ Stale'
+        rows.append({
+            'Data Source': source,
+            'Last Updated': format_age(staleness),
+            'Latest Event': found['LATEST_EVENT'].max() if len(found) > 0 else pd.NaT,
+            'Rows': int(found['ROW_COUNT'].fillna(0).sum()) if len(found) > 0 else 0,
+            'SLA': format_age(sla, suffix=''),
+            'Status': status,
+        })
+    return pd.DataFrame(rows)
+
+
+def format_age(age: timedelta, suffix: str = ' ago') -> str:
+    """Human-readable age, e.g. '5 minutes ago'"""
+    if age is None or pd.isna(age):
+        return 'Never'
+    seconds = max(int(age.total_seconds()), 0)
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''}{suffix}"
+    return f"{seconds} seconds{suffix}"
+
+
+def table_versions(probe: pd.DataFrame) -> dict:
+    """Map object name -> (LAST_ALTERED, ROW_COUNT); a change means new data"""
+    return {
+        name: (str(altered), None if pd.isna(rows) else int(rows))
+        for name, altered, rows in zip(probe['OBJECT_NAME'], probe['LAST_ALTERED'], probe['ROW_COUNT'])
+    }
+
+
+def reads(*tables):
+    """Declare the tables a loader's queries read, by name (PATIENT_ADMISSIONS_RAW) or qualified name"""
+    def decorator(func):
+        func.reads = frozenset(table.split('.')[-1].upper() for table in tables)
+        return func
+    return decorator
+
+
+def derived_from(*loaders):
+    """Declare that a loader serves data fetched by other loaders, whose tables it then reads from"""
+    def decorator(func):
+        func.derived_from = loaders
+        return func
+    return decorator
+
+
+def loader_sources(loader) -> set:
+    """Tables a loader reads: those it declares with ``reads`` and those of the loaders it is derived_from"""
+    func = inspect.unwrap(loader)
+    return set(getattr(func, 'reads', ())).union(*(loader_sources(source)
+                                                   for source in getattr(func, 'derived_from', ())))
+
+
+def changed_tables(previous: dict, current: dict) -> set:
+    """Tables whose metadata version differs from the one previously seen"""
+    return {name for name, version in current.items() if name in previous and previous[name] != version}
@@ -1,16 +1,38 @@
 """
 Hospital Analytics Dashboard - Streamlit in Snowflake (SIS)
+
+Each loader is cached per parameters for its TTL, and the loaders a role's
+view needs are fetched concurrently (ROLE_LOADERS, FETCH_WORKERS), so a
+widget interaction only queries what is not already cached. Per-loader
+timings of the last fetch are shown in the sidebar.
 """
 
+import inspect
+import logging
+import threading
+import time
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from snowflake.snowpark.context import get_active_session
 
+logger = logging.getLogger(__name__)
+
 # Get Snowflake session
 session = get_active_session()
 
+# Cache lifetimes: hospital-wide counts change with each load, period figures
+# within the day, bed status during a shift
+STATS_TTL = timedelta(hours=1)
+PERIOD_TTL = timedelta(minutes=15)
+BED_TTL = timedelta(minutes=5)
+FETCH_WORKERS = 4
+
+# Queries run by the current thread: (seconds, first line of SQL)
+_query_log = threading.local()
+
 # Page configuration
 st.set_page_config(
     page_title="Hospital Analytics Dashboard",
@@ -48,35 +70,72 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def query_snowflake(sql: str) -> pd.DataFrame:
-    """Execute SQL query using Snowpark session"""
+    """Execute SQL query using Snowpark session
+
+    Errors propagate, so a failed query is not cached; fetch_role_data reports it.
+    """
+    start = time.perf_counter()
     try:
         return session.sql(sql).to_pandas()
-    except Exception as e:
-        st.error(f"Query failed: {str(e)}")
-        return pd.DataFrame()
+    finally:
+        if hasattr(_query_log, 'queries'):
+            _query_log.queries.append((time.perf_counter() - start, sql.strip().splitlines()[0]))
+
+# Basic stat -> (raw table, column counted distinct or None to count rows)
+BASIC_STATS = {
+    'total_patients': ('PATIENT_DEMOGRAPHICS_RAW', 'patient_id'),
+    'total_admissions': ('PATIENT_ADMISSIONS_RAW', None),
+    'total_procedures': ('MEDICAL_PROCEDURES_RAW', None),
+    'total_medications': ('MEDICATION_ORDERS_RAW', None),
+    'total_allied_health': ('ALLIED_HEALTH_SERVICES_RAW', None),
+}
 
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
 def get_basic_stats() -> dict:
-    """Get basic hospital statistics"""
-    sql = """
-    SELECT 
-        (SELECT COUNT(DISTINCT patient_id) FROM HOSPITAL_DEMO.RAW_DATA.PATIENT_DEMOGRAPHICS_RAW) as total_patients,
-        (SELECT COUNT(*) FROM HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW) as total_admissions,
-        (SELECT COUNT(*) FROM HOSPITAL_DEMO.RAW_DATA.MEDICAL_PROCEDURES_RAW) as total_procedures,
-        (SELECT COUNT(*) FROM HOSPITAL_DEMO.RAW_DATA.MEDICATION_ORDERS_RAW) as total_medications,
-        (SELECT COUNT(*) FROM HOSPITAL_DEMO.RAW_DATA.ALLIED_HEALTH_SERVICES_RAW) as total_allied_health
+    """Get basic hospital statistics
+
+    Row counts come from table metadata and distinct patients from the counters
+    the load keeps (RECORD_COUNTS, see sql/03_load_data.sql); a table is only
+    counted when neither has it.
     """
-    df = query_snowflake(sql)
-    if not df.empty:
-        return {
-            'total_patients': int(df.iloc[0]['TOTAL_PATIENTS'] or 0),
-            'total_admissions': int(df.iloc[0]['TOTAL_ADMISSIONS'] or 0),
-            'total_procedures': int(df.iloc[0]['TOTAL_PROCEDURES'] or 0),
-            'total_medications': int(df.iloc[0]['TOTAL_MEDICATIONS'] or 0),
-            'total_allied_health': int(df.iloc[0]['TOTAL_ALLIED_HEALTH'] or 0)
-        }
-    return {'total_patients': 0, 'total_admissions': 0, 'total_procedures': 0, 
-            'total_medications': 0, 'total_allied_health': 0}
+    names = ", ".join(f"'{table}'" for table, _ in BASIC_STATS.values())
+    try:
+        metadata = query_snowflake(f"""
+        SELECT table_name, row_count FROM HOSPITAL_DEMO.INFORMATION_SCHEMA.TABLES
+        WHERE table_schema = 'RAW_DATA' AND table_name IN ({names})
+        """)
+        rows = {name: count for name, count in zip(metadata['TABLE_NAME'], metadata['ROW_COUNT']) if pd.notna(count)}
+    except Exception:
+        rows = {}
+    try:
+        counters = query_snowflake(f"""
+        SELECT table_name, row_count, distinct_count FROM HOSPITAL_DEMO.RAW_DATA.RECORD_COUNTS
+        WHERE table_name IN ({names})
+        """)
+        kept = {name: (count, distinct) for name, count, distinct
+                in zip(counters['TABLE_NAME'], counters['ROW_COUNT'], counters['DISTINCT_COUNT'])}
+    except Exception:
+        kept = {}
+    
+    stats, missing = {}, {}
+    for stat, (table, column) in BASIC_STATS.items():
+        counted_rows, distinct = kept.get(table, (None, None))
+        if column is None and table in rows:
+            stats[stat] = int(rows[table])
+        elif column is None and pd.notna(counted_rows):
+            stats[stat] = int(counted_rows)
+        elif column is not None and pd.notna(distinct) and rows.get(table, counted_rows) == counted_rows:
+            # The counter's distinct count holds while the table has the rows it counted
+            stats[stat] = int(distinct)
+        else:
+            missing[stat] = f"SELECT '{stat}' AS stat, {f'COUNT(DISTINCT {column})' if column else 'COUNT(*)'} AS value " \
+                            f"FROM HOSPITAL_DEMO.RAW_DATA.{table}"
+    if missing:
+        df = query_snowflake("\nUNION ALL\n".join(missing.values()))
+        stats.update({stat: int(value or 0) for stat, value in zip(df['STAT'], df['VALUE'])})
+    return {stat: stats.get(stat, 0) for stat in BASIC_STATS}
 
+@st.cache_data(ttl=PERIOD_TTL, show_spinner=False)
 def get_financial_kpis(start_date: str, end_date: str) -> dict:
     """Get financial KPIs"""
     sql = f"""
@@ -105,6 +164,7 @@ def get_financial_kpis(start_date: str, end_date: str) -> dict:
     return {'total_revenue': 0, 'avg_charges': 0, 'avg_los': 0, 
             'admission_count': 0, 'emergency_count': 0, 'emergency_rate': 0}
 
+@st.cache_data(ttl=PERIOD_TTL, show_spinner=False)
 def get_department_summary(start_date: str, end_date: str) -> pd.DataFrame:
     """Get department performance summary"""
     sql = f"""
@@ -126,6 +186,7 @@ def get_department_summary(start_date: str, end_date: str) -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+@st.cache_data(ttl=PERIOD_TTL, show_spinner=False)
 def get_admission_trends(start_date: str, end_date: str) -> pd.DataFrame:
     """Get admission trends over time"""
     sql = f"""
@@ -142,6 +203,7 @@ def get_admission_trends(start_date: str, end_date: str) -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+@st.cache_data(ttl=BED_TTL, show_spinner=False)
 def get_bed_utilization() -> pd.DataFrame:
     """Get bed utilization by department"""
     sql = """
@@ -163,6 +225,7 @@ def get_bed_utilization() -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+@st.cache_data(ttl=PERIOD_TTL, show_spinner=False)
 def get_medication_summary() -> pd.DataFrame:
     """Get medication analysis"""
     sql = """
@@ -180,6 +243,7 @@ def get_medication_summary() -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
 def get_patient_demographics() -> pd.DataFrame:
     """Get patient demographics summary"""
     sql = """
@@ -198,6 +262,7 @@ def get_patient_demographics() -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
 def get_insurance_mix() -> pd.DataFrame:
     """Get insurance provider mix"""
     sql = """
@@ -211,6 +276,75 @@ def get_insurance_mix() -> pd.DataFrame:
     """
     return query_snowflake(sql)
 
+# Loaders each role's view reads; get_financial_kpis also feeds the footer
+ROLE_LOADERS = {
+    "CEO": (get_basic_stats, get_financial_kpis, get_department_summary, get_insurance_mix),
+    "Clinical Administrator": (get_basic_stats, get_financial_kpis, get_bed_utilization, get_department_summary),
+    "Physician": (get_financial_kpis, get_admission_trends, get_medication_summary),
+    "Nurse": (get_financial_kpis, get_bed_utilization),
+    "Analyst": (get_basic_stats, get_financial_kpis, get_patient_demographics, get_admission_trends),
+}
+EMPTY_RESULTS = {
+    'get_basic_stats': {'total_patients': 0, 'total_admissions': 0, 'total_procedures': 0,
+                        'total_medications': 0, 'total_allied_health': 0},
+    'get_financial_kpis': {'total_revenue': 0, 'avg_charges': 0, 'avg_los': 0,
+                           'admission_count': 0, 'emergency_count': 0, 'emergency_rate': 0},
+}
+
+def _timed_load(loader, kwargs: dict) -> tuple:
+    """Run one loader, returning (result, error, timing row)"""
+    _query_log.queries = []
+    start = time.perf_counter()
+    result, error = None, None
+    try:
+        result = loader(**kwargs)
+    except Exception as e:
+        error = e
+    queries = _query_log.queries
+    del _query_log.queries
+    return result, error, {
+        'Loader': loader.__name__,
+        'ms': round((time.perf_counter() - start) * 1000, 1),
+        'Source': 'query' if queries else 'cache',
+        'Query ms': round(sum(seconds for seconds, _ in queries) * 1000, 1),
+        'Outcome': 'ok' if error is None else type(error).__name__,
+    }
+
+def fetch_role_data(user_role: str, start_date: str, end_date: str) -> dict:
+    """Run every loader the role's view needs concurrently; a failed loader gets an empty result"""
+    loaders = ROLE_LOADERS[user_role]
+    dates = {'start_date': start_date, 'end_date': end_date}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='sis-fetch') as pool:
+        futures = {
+            loader.__name__: pool.submit(_timed_load, loader, {k: v for k, v in dates.items()
+                                                                if k in inspect.signature(loader).parameters})
+            for loader in loaders
+        }
+        outcomes = {name: future.result() for name, future in futures.items()}
+    total_ms = round((time.perf_counter() - start) * 1000, 1)
+    
+    data, timings = {}, []
+    for name, (result, error, timing) in outcomes.items():
+        if error is not None:
+            st.error(f"Query failed: {str(error)}")
+            result = dict(EMPTY_RESULTS[name]) if name in EMPTY_RESULTS else pd.DataFrame()
+        data[name] = result
+        timings.append(timing)
+    st.session_state['load_timings'] = {'total_ms': total_ms, 'loaders': timings}
+    logger.info("Loaded %d datasets for %s in %.1f ms (%d queried)", len(timings), user_role, total_ms,
+                sum(t['Source'] == 'query' for t in timings))
+    return data
+
+def render_load_timings():
+    """Sidebar panel with the last fetch's per-loader latency"""
+    timings = st.session_state.get('load_timings')
+    if not timings:
+        return
+    with st.sidebar.expander("⏱️ Load Timings"):
+        st.caption(f"{len(timings['loaders'])} datasets in {timings['total_ms']:,.0f} ms (fetched concurrently)")
+        st.dataframe(pd.DataFrame(timings['loaders']), use_container_width=True, hide_index=True)
+
 def create_metric_card(label: str, value: str, delta: str = None, icon: str = "📊"):
     """Create a styled metric card"""
     delta_html = f'<p style="color: #666; font-size: 0.9rem; margin: 0;">{delta}</p>' if delta else ""
@@ -266,13 +400,13 @@ def main():
     col1, col2, col3 = st.sidebar.columns(3)
     with col1:
         if st.button("7D"):
-            start_date = datetime.now() - timedelta(days=7)
+            start_date = (datetime.now() - timedelta(days=7)).date()
     with col2:
         if st.button("30D"):
-            start_date = datetime.now() - timedelta(days=30)
+            start_date = (datetime.now() - timedelta(days=30)).date()
     with col3:
         if st.button("90D"):
-            start_date = datetime.now() - timedelta(days=90)
+            start_date = (datetime.now() - timedelta(days=90)).date()
     
     # Refresh button
     st.sidebar.markdown("### 🔄 Data Controls")
@@ -280,9 +414,11 @@ def main():
         st.cache_data.clear()
         st.experimental_rerun()
     
-    # Get data
-    basic_stats = get_basic_stats()
-    financial_data = get_financial_kpis(str(start_date), str(end_date))
+    # Get data: every loader the role's view needs, concurrently and from cache where possible
+    data = fetch_role_data(user_role, str(start_date), str(end_date))
+    render_load_timings()
+    basic_stats = data.get('get_basic_stats')
+    financial_data = data['get_financial_kpis']
     
     # CEO Dashboard
     if user_role == "CEO":
@@ -304,7 +440,7 @@ def main():
         
         # Department Performance
         st.markdown('<h2 class="section-header">📊 Department Performance</h2>', unsafe_allow_html=True)
-        dept_data = get_department_summary(str(start_date), str(end_date))
+        dept_data = data['get_department_summary']
         
         if not dept_data.empty:
             col1, col2 = st.columns(2)
@@ -322,7 +458,7 @@ def main():
         
         # Insurance Mix
         st.markdown('<h2 class="section-header">💳 Insurance Mix</h2>', unsafe_allow_html=True)
-        insurance_data = get_insurance_mix()
+        insurance_data = data['get_insurance_mix']
         if not insurance_data.empty:
             col1, col2 = st.columns(2)
             with col1:
@@ -350,7 +486,7 @@ def main():
         
         # Bed Utilization
         st.markdown('<h2 class="section-header">🛏️ Bed Utilization</h2>', unsafe_allow_html=True)
-        bed_data = get_bed_utilization()
+        bed_data = data['get_bed_utilization']
         if not bed_data.empty:
             col1, col2 = st.columns(2)
             with col1:
@@ -364,7 +500,7 @@ def main():
         
         # Department Details
         st.markdown('<h2 class="section-header">📋 Department Details</h2>', unsafe_allow_html=True)
-        dept_data = get_department_summary(str(start_date), str(end_date))
+        dept_data = data['get_department_summary']
         if not dept_data.empty:
             st.dataframe(dept_data, use_container_width=True)
     
@@ -384,7 +520,7 @@ def main():
         
         # Admission Trends
         st.markdown('<h2 class="section-header">📈 Admission Trends</h2>', unsafe_allow_html=True)
-        trend_data = get_admission_trends(str(start_date), str(end_date))
+        trend_data = data['get_admission_trends']
         if not trend_data.empty:
             fig = px.line(trend_data, x='ADMISSION_DATE', 
                          y=['DAILY_ADMISSIONS', 'EMERGENCY_ADMISSIONS', 'ELECTIVE_ADMISSIONS'],
@@ -394,7 +530,7 @@ def main():
         
         # Medication Analysis
         st.markdown('<h2 class="section-header">💊 Medication Analysis</h2>', unsafe_allow_html=True)
-        med_data = get_medication_summary()
+        med_data = data['get_medication_summary']
         if not med_data.empty:
             col1, col2 = st.columns(2)
             with col1:
@@ -421,7 +557,7 @@ def main():
         
         # Bed Management
         st.markdown('<h2 class="section-header">🛏️ Bed Management</h2>', unsafe_allow_html=True)
-        bed_data = get_bed_utilization()
+        bed_data = data['get_bed_utilization']
         if not bed_data.empty:
             total_beds = int(bed_data['TOTAL_BEDS'].sum())
             occupied = int(bed_data['OCCUPIED_BEDS'].sum())
@@ -454,7 +590,7 @@ def main():
         
         # Demographics Analysis
         st.markdown('<h2 class="section-header">👥 Patient Demographics</h2>', unsafe_allow_html=True)
-        demo_data = get_patient_demographics()
+        demo_data = data['get_patient_demographics']
         if not demo_data.empty:
             col1, col2 = st.columns(2)
             with col1:
@@ -469,7 +605,7 @@ def main():
         
         # Trend Analysis
         st.markdown('<h2 class="section-header">📈 Trend Analysis</h2>', unsafe_allow_html=True)
-        trend_data = get_admission_trends(str(start_date), str(end_date))
+        trend_data = data['get_admission_trends']
         if not trend_data.empty:
             fig = px.area(trend_data, x='ADMISSION_DATE', y='DAILY_REVENUE',
                         title="Daily Revenue Trend", color_discrete_sequence=['#2E8B57'])
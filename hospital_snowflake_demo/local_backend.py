@@ -0,0 +1,345 @@
+"""
+Local DuckDB stand-in for the Snowflake session
+
+Lets the dashboard (and its benchmarks) run outside Streamlit-in-Snowflake.
+The RAW_DATA tables are created from the DDL in sql/03_load_data.sql and
+loaded from the generator's CSV output, and queries are lightly translated
+from Snowflake SQL to DuckDB. Only the small surface of the Snowpark session
+used by the app is provided: ``session.sql(query, params)`` with
+``to_pandas()``, ``to_pandas_batches()`` and ``collect()``.
+
+Requires the optional ``duckdb`` package (local development only).
+"""
+
+import contextvars
+import csv
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from record_counts import counter_refresh_sql
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(BASE_DIR, "data")
+LOAD_SCRIPT = os.path.join(BASE_DIR, "sql", "03_load_data.sql")
+GOVERNANCE_SCRIPT = os.path.join(BASE_DIR, "sql", "05_rbac_governance.sql")
+
+# Raw table -> candidate CSV files, preferring the large generated datasets
+RAW_TABLE_FILES = {
+    'PATIENT_DEMOGRAPHICS_RAW': ['patient_demographics_large.csv', 'patient_demographics.csv'],
+    'PATIENT_ADMISSIONS_RAW': ['patient_admissions_large.csv', 'patient_admissions.csv'],
+    'HOSPITAL_DEPARTMENTS_RAW': ['hospital_departments_complete.csv', 'hospital_departments.csv'],
+    'MEDICAL_PROCEDURES_RAW': ['medical_procedures_large.csv', 'medical_procedures.csv'],
+    'BED_INVENTORY_RAW': ['bed_inventory.csv'],
+    'BED_BOOKINGS_RAW': ['bed_bookings.csv'],
+    'BED_AVAILABILITY_RAW': ['bed_availability.csv'],
+    'PHARMACY_INVENTORY_RAW': ['pharmacy_inventory.csv'],
+    'MEDICATION_ORDERS_RAW': ['medication_orders.csv'],
+    'MEDICATION_DISPENSING_RAW': ['medication_dispensing.csv'],
+    'ALLIED_HEALTH_SERVICES_RAW': ['allied_health_services.csv'],
+}
+
+
+def raw_table_ddl(script_path: str = LOAD_SCRIPT) -> dict:
+    """Parse the RAW_DATA CREATE TABLE statements into {table: DuckDB column list}"""
+    with open(script_path, 'r') as f:
+        script = f.read()
+    ddl = {}
+    for table, body in re.findall(r"CREATE OR REPLACE TABLE (\w+) \((.*?)\n\);", script, re.S):
+        body = re.sub(r"\bSTRING\b", "VARCHAR", body)
+        body = body.replace("CURRENT_TIMESTAMP()", "CURRENT_TIMESTAMP")
+        ddl[table.upper()] = body.strip()
+    return ddl
+
+
+def translate_sql(query: str, as_of: str = None) -> str:
+    """Translate the Snowflake SQL used by the dashboard into DuckDB SQL"""
+    query = re.sub(r"\bDATEDIFF\(\s*(\w+)\s*,", r"DATE_DIFF('\1',", query, flags=re.I)
+    if as_of:
+        query = re.sub(r"\bCURRENT_DATE\b(\s*\(\))?", f"DATE '{as_of}'", query, flags=re.I)
+    else:
+        query = re.sub(r"\bCURRENT_DATE\s*\(\)", "CURRENT_DATE", query, flags=re.I)
+    query = re.sub(r"\bCURRENT_TIMESTAMP\s*\(\)", "CURRENT_TIMESTAMP", query, flags=re.I)
+    query = re.sub(r"\bSAMPLE\s+BERNOULLI\s*\(\s*([\d.]+)\s*\)", r"TABLESAMPLE bernoulli(\1%)", query, flags=re.I)
+    query = re.sub(r"\bAPPROX_PERCENTILE\(", "approx_quantile(", query, flags=re.I)
+    query = re.sub(r"\bREGEXP_LIKE\(", "regexp_full_match(", query, flags=re.I)
+    query = re.sub(r"\bHOSPITAL_DEMO\.INFORMATION_SCHEMA\.", "HOSPITAL_DEMO.LOCAL_METADATA.", query, flags=re.I)
+    return query
+
+
+_query_stats = contextvars.ContextVar('local_query_stats', default=None)
+
+
+@contextmanager
+def collect_query_stats():
+    """Profile the local queries run in this context: count, rows scanned and peak buffer memory"""
+    stats = {'queries': 0, 'rows_scanned': 0, 'peak_buffer_bytes': 0}
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _record_profile(stats: dict, profile: dict):
+    stats['queries'] += 1
+    stats['rows_scanned'] += int(profile.get('cumulative_rows_scanned', 0))
+    stats['peak_buffer_bytes'] = max(stats['peak_buffer_bytes'], int(profile.get('system_peak_buffer_memory', 0)))
+
+
+class LocalDataFrame:
+    """Lazy query result mirroring the part of the Snowpark DataFrame API the app uses"""
+
+    def __init__(self, session, query, params=None):
+        self._session = session
+        self._query = query
+        self._params = params
+
+    def to_pandas(self, block: bool = True, cursor=None):
+        if not block:
+            return LocalAsyncJob(self)
+        df = self._session.execute(self._query, self._params, cursor=cursor)
+        # Snowflake returns unquoted identifiers in upper case
+        df.columns = [str(c).upper() for c in df.columns]
+        return df
+
+    def to_pandas_batches(self):
+        # Results are materialised by DuckDB anyway; a single batch is enough
+        yield self.to_pandas()
+
+    def collect(self) -> list:
+        return list(self.to_pandas().itertuples(index=False))
+
+
+class LocalAsyncJob:
+    """Query running in the background, mirroring the part of Snowpark's AsyncJob the app uses"""
+
+    def __init__(self, frame: LocalDataFrame):
+        self._frame = frame
+        self._cursor = frame._session.cursor()
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+        # Run in the caller's context, so query stats collection (collect_query_stats) sees the query
+        threading.Thread(target=contextvars.copy_context().run, args=(self._run,), name="local-query",
+                         daemon=True).start()
+
+    def _run(self):
+        try:
+            self._result = self._frame.to_pandas(cursor=self._cursor)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def is_done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self):
+        """Interrupt the running statement"""
+        if not self.is_done():
+            self._cursor.interrupt()
+
+    def result(self) -> pd.DataFrame:
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class LocalSession:
+    """DuckDB-backed stand-in for a Snowpark session"""
+
+    # DuckDB's approx_count_distinct is a coarser HyperLogLog than Snowflake's
+    approx_distinct_rse = 0.11
+
+    def __init__(self, connection, as_of: str = None):
+        self.connection = connection
+        self.as_of = as_of
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_data_dir(cls, data_dir: str = None, as_of: str = None, scale_factor: int = None):
+        """Create an in-memory HOSPITAL_DEMO database loaded from generator CSVs
+
+        ``scale_factor`` > 1 replicates the loaded rows (see replicate_tables)
+        to benchmark against larger volumes than the generator produces.
+        """
+        try:
+            import duckdb
+        except ImportError as e:
+            raise RuntimeError(
+                "No active Snowflake session and the local backend needs duckdb "
+                "(pip install duckdb)"
+            ) from e
+
+        data_dir = data_dir or os.environ.get("HOSPITAL_DEMO_DATA_DIR", DEFAULT_DATA_DIR)
+        as_of = as_of or os.environ.get("HOSPITAL_DEMO_AS_OF")
+        scale_factor = scale_factor or int(os.environ.get("HOSPITAL_DEMO_SCALE_FACTOR", 1))
+
+        con = duckdb.connect()
+        con.execute("ATTACH ':memory:' AS HOSPITAL_DEMO")
+        for schema in ("RAW_DATA", "TRANSFORMED", "ANALYTICS"):
+            con.execute(f"CREATE SCHEMA HOSPITAL_DEMO.{schema}")
+        con.execute("USE HOSPITAL_DEMO.RAW_DATA")
+
+        loaded_files = {}
+        for table, columns in raw_table_ddl().items():
+            con.execute(f"CREATE TABLE {table} ({columns})")
+            for filename in RAW_TABLE_FILES.get(table, []):
+                path = os.path.join(data_dir, filename)
+                if os.path.exists(path):
+                    load_csv(con, table, path)
+                    loaded_files[table] = path
+                    break
+
+        if scale_factor > 1:
+            replicate_tables(con, scale_factor)
+        # Rebuild the record counters as the load script does (see record_counts)
+        for statement in counter_refresh_sql():
+            con.execute(statement)
+        create_metadata_views(con, loaded_files)
+        create_governance_tables(con)
+        return cls(con, as_of=as_of)
+
+    def connect(self) -> 'LocalSession':
+        """Another session on the same in-memory database, for a session pool"""
+        return LocalSession(self.cursor(), as_of=self.as_of)
+
+    def close(self):
+        self.connection.close()
+
+    def sql(self, query: str, params=None) -> LocalDataFrame:
+        return LocalDataFrame(self, query, params)
+
+    def explain_cost(self, query: str, params=None) -> dict:
+        """Estimated bytes scanned, joins and peak rows from DuckDB's plan, in the shape of warehouse_router.explain_cost"""
+        cursor = self.cursor()
+        try:
+            cursor.execute("USE HOSPITAL_DEMO.RAW_DATA")
+            plan = cursor.execute(f"EXPLAIN (FORMAT json) {translate_sql(query, self.as_of)}",
+                                  params or None).fetchall()[0][1]
+        finally:
+            cursor.close()
+        scanned, joins, rows = 0, 0, 0
+        nodes = json.loads(plan)
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('children', []))
+            info = node.get('extra_info', {})
+            rows = max(rows, int(info.get('Estimated Cardinality', 0) or 0))
+            if 'JOIN' in node.get('name', ''):
+                joins += 1
+            elif 'SCAN' in node.get('name', ''):
+                columns = info.get('Projections', [])
+                columns = [columns] if isinstance(columns, str) else columns
+                # No byte estimate in DuckDB plans: assume 8 bytes per projected value
+                scanned += int(info.get('Estimated Cardinality', 0) or 0) * max(len(columns), 1) * 8
+        return {'bytes': scanned, 'partitions': None, 'rows': rows, 'joins': joins}
+
+    def cursor(self):
+        # A cursor is an independent DuckDB connection to the same database,
+        # so concurrent Streamlit sessions don't share statement state
+        with self._lock:
+            return self.connection.cursor()
+
+    def execute(self, query: str, params=None, cursor=None) -> pd.DataFrame:
+        cursor = cursor or self.cursor()
+        stats = _query_stats.get()
+        try:
+            cursor.execute("USE HOSPITAL_DEMO.RAW_DATA")
+            if stats is not None:
+                cursor.execute("SET enable_profiling = 'no_output'")
+            df = cursor.execute(translate_sql(query, self.as_of), params or None).df()
+            if stats is not None:
+                _record_profile(stats, json.loads(cursor.get_profiling_information(format='json')))
+            return df
+        finally:
+            cursor.close()
+
+
+def load_csv(con, table: str, path: str):
+    """Append a CSV file to a raw table, matching columns by name"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+    table_columns = {
+        row[0].lower() for row in
+        con.execute(f"SELECT column_name FROM duckdb_columns() WHERE table_name = '{table}'").fetchall()
+    }
+    columns = [c for c in header if c.lower() in table_columns]
+    column_list = ", ".join(columns)
+    con.execute(
+        f"INSERT INTO {table} ({column_list}, source_file) "
+        f"SELECT {column_list}, ? FROM read_csv(?, header = true, all_varchar = true, nullstr = ['', 'NULL'])",
+        [os.path.basename(path), path]
+    )
+
+
+def replicate_tables(con, factor: int, keep=('HOSPITAL_DEPARTMENTS_RAW',)):
+    """Grow every raw table to ``factor`` times its rows
+
+    Each copy suffixes the ``*_id`` columns with its copy number, so copies join
+    to each other like the original rows do and distinct counts grow with the
+    table. Department ids are shared, as are the tables in ``keep``.
+    """
+    tables = [row[0] for row in con.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE database_name = 'HOSPITAL_DEMO' AND schema_name = 'RAW_DATA'"
+    ).fetchall()]
+    for table in tables:
+        if table.upper() in keep:
+            continue
+        id_columns = [
+            row[0] for row in con.execute(
+                f"SELECT column_name FROM duckdb_columns() WHERE table_name = '{table}'"
+            ).fetchall()
+            if row[0].lower().endswith('_id') and row[0].lower() != 'department_id'
+        ]
+        replace = ", ".join(f"t.{c} || '-' || r.copy AS {c}" for c in id_columns)
+        columns = f"t.* REPLACE ({replace})" if replace else "t.*"
+        con.execute(f"INSERT INTO {table} SELECT {columns} FROM {table} t, range(1, {int(factor)}) r(copy)")
+
+
+def create_governance_tables(con, script_path: str = GOVERNANCE_SCRIPT):
+    """ANALYTICS.AUDIT_LOG and DATA_QUALITY_RULES, with its sample rules, from sql/05_rbac_governance.sql"""
+    with open(script_path, 'r') as f:
+        script = f.read()
+    for table, sequence in (('AUDIT_LOG', 'AUDIT_ID_SEQ'), ('DATA_QUALITY_RULES', 'RULE_ID_SEQ')):
+        body = re.search(rf"CREATE OR REPLACE TABLE HOSPITAL_DEMO\.ANALYTICS\.{table} \((.*?)\n\);", script, re.S).group(1)
+        body = re.sub(r"\bSTRING\b", "VARCHAR", body).replace("CURRENT_TIMESTAMP()", "CURRENT_TIMESTAMP")
+        body = body.replace("AUTOINCREMENT PRIMARY KEY", f"DEFAULT nextval('HOSPITAL_DEMO.ANALYTICS.{sequence}')")
+        con.execute(f"CREATE SEQUENCE HOSPITAL_DEMO.ANALYTICS.{sequence}")
+        con.execute(f"CREATE TABLE HOSPITAL_DEMO.ANALYTICS.{table} ({body})")
+    for insert in re.findall(r"INSERT INTO HOSPITAL_DEMO\.ANALYTICS\.DATA_QUALITY_RULES\b.*?\);", script, re.S):
+        con.execute(insert)
+
+
+def create_metadata_views(con, loaded_files: dict = None):
+    """Stand-ins for the INFORMATION_SCHEMA views read by the freshness probe
+
+    A table's LAST_ALTERED is the modification time of the CSV it was loaded
+    from (of the DDL script for tables without one), so it only changes when
+    the data does.
+    """
+    def modified(path):
+        return datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    altered = ", ".join(f"('{table}', TIMESTAMP '{modified(path)}')" for table, path in (loaded_files or {}).items())
+    con.execute("CREATE SCHEMA HOSPITAL_DEMO.LOCAL_METADATA")
+    con.execute("CREATE TABLE HOSPITAL_DEMO.LOCAL_METADATA.FILE_TIMES (table_name VARCHAR, last_altered TIMESTAMP)")
+    if altered:
+        con.execute(f"INSERT INTO HOSPITAL_DEMO.LOCAL_METADATA.FILE_TIMES VALUES {altered}")
+    con.execute(f"""
+        CREATE VIEW HOSPITAL_DEMO.LOCAL_METADATA.TABLES AS
+        SELECT upper(t.schema_name) AS table_schema, upper(t.table_name) AS table_name,
+               t.estimated_size AS row_count,
+               COALESCE(f.last_altered, TIMESTAMP '{modified(LOAD_SCRIPT)}') AS last_altered
+        FROM duckdb_tables() t
+        LEFT JOIN HOSPITAL_DEMO.LOCAL_METADATA.FILE_TIMES f ON upper(t.table_name) = f.table_name
+        WHERE t.database_name = 'HOSPITAL_DEMO' AND t.schema_name <> 'LOCAL_METADATA'
+    """)
+    con.execute("CREATE TABLE HOSPITAL_DEMO.LOCAL_METADATA.PIPES (pipe_schema VARCHAR, pipe_name VARCHAR, last_altered TIMESTAMP)")
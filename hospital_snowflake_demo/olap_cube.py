@@ -0,0 +1,108 @@
+"""
+In-process OLAP cube
+
+A compact, column-wise store for slicing aggregated facts without a warehouse
+round trip. Dimensions are dictionary-encoded: a small sorted array of labels
+plus one narrow integer code per row. Measures are NumPy arrays.
+
+- Filters are evaluated once per label and then looked up by code, so they
+  cost one gather over the rows.
+- A group-by combines the dimension codes into a single integer key and sums
+  each measure with ``np.bincount``.
+
+On an extract of tens of thousands of rows, a slice takes a few milliseconds.
+Derived dimensions, such as week or month from a date or a weather band from
+a date, are built by mapping the source dimension's labels. The rows are not
+touched.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _encode(values):
+    """Dictionary-encode values as (codes, sorted labels); missing values get a label of their own"""
+    codes, labels = pd.factorize(values, sort=True, use_na_sentinel=False)
+    return codes.astype(np.min_scalar_type(max(len(labels) - 1, 0))), np.asarray(labels)
+
+
+class Cube:
+    """Dictionary-encoded dimensions and NumPy measures over the same rows"""
+
+    def __init__(self, codes: dict, labels: dict, measures: dict, integer_measures=()):
+        self.codes = codes
+        self.labels = labels
+        self.measures = measures
+        self.integer_measures = set(integer_measures)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions, measures) -> 'Cube':
+        codes, labels = {}, {}
+        for dim in dimensions:
+            codes[dim], labels[dim] = _encode(df[dim])
+        values = {m: df[m].to_numpy(dtype=float, na_value=0.0) for m in measures}
+        integer = [m for m in measures if pd.api.types.is_integer_dtype(df[m])]
+        return cls(codes, labels, values, integer)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.measures.values()))) if self.measures else 0
+
+    @property
+    def dimensions(self) -> list:
+        return list(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = list(self.codes.values()) + list(self.measures.values())
+        return sum(a.nbytes for a in arrays) + sum(l.nbytes for l in self.labels.values())
+
+    def derive(self, name: str, source: str, mapping) -> 'Cube':
+        """Cube with a new dimension computed from each label of ``source`` (the rows are not touched)"""
+        derived = mapping(self.labels[source])
+        codes, labels = _encode(np.asarray(derived))
+        return Cube({**self.codes, name: codes[self.codes[source]]}, {**self.labels, name: labels},
+                    self.measures, self.integer_measures)
+
+    def mask(self, where: dict = None):
+        """Row mask for {dimension: allowed labels or predicate over the label array}, or None for all rows"""
+        mask = None
+        for dim, condition in (where or {}).items():
+            labels = self.labels[dim]
+            if callable(condition):
+                allowed = np.asarray(condition(labels), dtype=bool)
+            else:
+                allowed = pd.Index(labels).isin(list(condition))
+            selected = allowed[self.codes[dim]]
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def aggregate(self, by=(), where: dict = None, measures=None, distinct=()) -> pd.DataFrame:
+        """Sum measures per combination of ``by`` labels over the filtered rows
+
+        ``distinct`` dimensions get a ``<DIM>_COUNT`` column: the number of
+        their (non-missing) labels present in each group.
+        """
+        by, measures = list(by), list(self.measures if measures is None else measures)
+        rows = self.mask(where)
+        rows = np.flatnonzero(rows) if rows is not None else np.arange(len(self))
+        sizes = [len(self.labels[d]) for d in by]
+        if by:
+            key = np.ravel_multi_index([self.codes[d][rows].astype(np.intp) for d in by], sizes)
+        else:
+            key = np.zeros(len(rows), dtype=np.intp)
+        groups, inverse = np.unique(key, return_inverse=True)
+        if not by and len(groups) == 0:
+            groups, inverse = np.zeros(1, dtype=np.intp), inverse
+        out = {}
+        for dim, codes in zip(by, np.unravel_index(groups, sizes) if by else ()):
+            out[dim] = self.labels[dim][codes]
+        for m in measures:
+            sums = np.bincount(inverse, weights=self.measures[m][rows], minlength=len(groups))
+            out[m] = sums.astype(np.int64) if m in self.integer_measures else sums
+        for dim in distinct:
+            size = len(self.labels[dim])
+            codes = self.codes[dim][rows].astype(np.intp)
+            present = ~pd.isna(self.labels[dim])[codes]
+            pairs = np.unique(inverse[present].astype(np.intp) * size + codes[present])
+            out[f'{dim}_COUNT'] = np.bincount(pairs // size, minlength=len(groups))
+        return pd.DataFrame(out)
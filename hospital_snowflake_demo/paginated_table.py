@@ -0,0 +1,206 @@
+"""
+Keyset-paginated tables for patient-level lists
+
+Patient-level lists (current admissions, bed assignments) run to tens of
+thousands of rows, so they are never fetched whole. Each page is a seek query
+on the sort keys (``WHERE (sort keys) > (last row of previous page)``) with the
+sort and filters applied in the warehouse. Only the visible page and one
+prefetched page are kept in session state.
+
+Sort keys may be NULL (e.g. an unknown expected checkout date). NULLs sort
+last in either direction, and the seek predicate treats them as following
+every value, so pages neither stall on nor skip NULL-keyed rows.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Definition of a paginated patient-level list"""
+    base_query: str
+    unique_key: str
+    sort_options: dict
+    filter_columns: dict
+    page_size: int = 50
+
+
+def _direction(direction: str) -> str:
+    direction = direction.upper()
+    if direction not in ("ASC", "DESC"):
+        raise ValueError(f"Unsupported sort direction: {direction}")
+    return direction
+
+
+def sort_keys(spec: TableSpec, sort_label: str) -> list:
+    """Resolve a sort option to (column, direction) pairs ending in the unique key"""
+    keys = [(column, _direction(direction)) for column, direction in spec.sort_options[sort_label]]
+    if keys[-1][0] != spec.unique_key:
+        keys.append((spec.unique_key, keys[-1][1]))
+    return keys
+
+
+def build_filter_clause(spec: TableSpec, filters: dict):
+    """Build a parameterised WHERE fragment from widget filter values
+
+    A list filters with IN, a (low, high) tuple with BETWEEN and anything else
+    with equality. Empty values are ignored. Only columns declared in the spec
+    can be filtered on.
+    """
+    clauses, params = [], []
+    for label, value in filters.items():
+        column = spec.filter_columns[label]
+        if value is None or value == "" or (isinstance(value, (list, tuple)) and len(value) == 0):
+            continue
+        if isinstance(value, list):
+            clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+            params.extend(value)
+        elif isinstance(value, tuple):
+            clauses.append(f"{column} BETWEEN ? AND ?")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+def build_seek_clause(keys: list, cursor: tuple):
+    """Build the keyset predicate that starts a page after ``cursor``
+
+    For keys (k1, k2, k3) this expands to
+    ``k1 > v1 OR (k1 = v1 AND k2 > v2) OR (k1 = v1 AND k2 = v2 AND k3 > v3)``
+    with ``<`` in place of ``>`` for descending keys, which the warehouse can
+    prune on without an OFFSET scan. With NULLs last, ``k > v`` also matches
+    NULL (``k > ? OR k IS NULL``); a NULL cursor value is matched with
+    ``k IS NULL`` and nothing comes after it on that key.
+    """
+    clauses, params = [], []
+    for i, (column, direction) in enumerate(keys):
+        if cursor[i] is None:
+            continue
+        op = ">" if direction == "ASC" else "<"
+        parts, part_params = [], []
+        for prev_column, value in zip([c for c, _ in keys[:i]], cursor[:i]):
+            if value is None:
+                parts.append(f"{prev_column} IS NULL")
+            else:
+                parts.append(f"{prev_column} = ?")
+                part_params.append(value)
+        parts.append(f"({column} {op} ? OR {column} IS NULL)")
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(part_params + [cursor[i]])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def build_page_query(spec: TableSpec, sort_label: str, filters: dict, cursor=None, limit=None):
+    """Build the SQL and bind parameters for one page of a paginated list"""
+    keys = sort_keys(spec, sort_label)
+    where, params = build_filter_clause(spec, filters)
+    conditions = [where] if where else []
+    if cursor is not None:
+        seek, seek_params = build_seek_clause(keys, cursor)
+        conditions.append(seek)
+        params.extend(seek_params)
+
+    query = f"SELECT * FROM ({spec.base_query}) page_source"
+    if conditions:
+        query += "\nWHERE " + " AND ".join(conditions)
+    query += "\nORDER BY " + ", ".join(f"{column} {direction} NULLS LAST" for column, direction in keys)
+    query += f"\nLIMIT {int(limit or spec.page_size + 1)}"
+    return query, params
+
+
+def _bind_value(value):
+    """Convert a pandas/numpy scalar from a result row into a bindable value (None for NULL)"""
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def cursor_from_row(keys: list, row: pd.Series) -> tuple:
+    """Extract the keyset cursor (sort key values) from the last row of a page"""
+    return tuple(_bind_value(row[column.upper()]) for column, _ in keys)
+
+
+def fetch_page(session, spec: TableSpec, sort_label: str, filters: dict, cursor=None):
+    """Fetch one page plus a look-ahead row; returns (rows, next_cursor)"""
+    query, params = build_page_query(spec, sort_label, filters, cursor)
+    df = session.sql(query, params=params).to_pandas()
+    if len(df) > spec.page_size:
+        df = df.head(spec.page_size)
+        return df, cursor_from_row(sort_keys(spec, sort_label), df.iloc[-1])
+    return df, None
+
+
+def _state_signature(sort_label: str, filters: dict) -> tuple:
+    return (sort_label, tuple(sorted((k, str(v)) for k, v in filters.items())))
+
+
+def render_paginated_table(session, spec: TableSpec, key: str, filter_options: dict = None):
+    """Render a paginated list with server-side sort and filter controls"""
+    filter_options = filter_options or {}
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        sort_label = st.selectbox("Sort by", list(spec.sort_options), key=f"{key}_sort")
+    filters = {}
+    with col2:
+        filter_cols = st.columns(max(len(spec.filter_columns), 1))
+        for filter_col, label in zip(filter_cols, spec.filter_columns):
+            with filter_col:
+                if label in filter_options:
+                    filters[label] = st.multiselect(label, filter_options[label], key=f"{key}_{label}")
+                else:
+                    filters[label] = st.text_input(label, key=f"{key}_{label}").strip()
+
+    state = st.session_state.setdefault(key, {})
+    signature = _state_signature(sort_label, filters)
+    if state.get("signature") != signature:
+        # Sort or filters changed: restart from the first page
+        state.clear()
+        state.update({"signature": signature, "cursors": [None], "pages": {}})
+
+    cursors, pages = state["cursors"], state["pages"]
+    current = cursors[-1]
+    try:
+        if current not in pages:
+            pages[current] = fetch_page(session, spec, sort_label, filters, current)
+        rows, next_cursor = pages[current]
+    except Exception as e:
+        st.error(f"Error loading page: {str(e)}")
+        return
+
+    page_number = len(cursors)
+    first_row = (page_number - 1) * spec.page_size + 1
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    nav1, nav2, nav3 = st.columns([1, 4, 1])
+    with nav1:
+        st.button("◀ Previous", key=f"{key}_prev", disabled=page_number == 1,
+                  on_click=cursors.pop)
+    with nav2:
+        if len(rows) > 0:
+            st.caption(f"Page {page_number} · rows {first_row:,}–{first_row + len(rows) - 1:,}")
+        else:
+            st.caption("No matching rows")
+    with nav3:
+        st.button("Next ▶", key=f"{key}_next", disabled=next_cursor is None,
+                  on_click=cursors.append, args=(next_cursor,))
+
+    # Prefetch the next page so "Next" renders without a round trip, and drop
+    # everything except the visible and prefetched pages
+    if next_cursor is not None and next_cursor not in pages:
+        try:
+            pages[next_cursor] = fetch_page(session, spec, sort_label, filters, next_cursor)
+        except Exception:
+            pass
+    for cursor in list(pages):
+        if cursor not in (current, next_cursor):
+            del pages[cursor]
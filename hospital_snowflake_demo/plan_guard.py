@@ -0,0 +1,159 @@
+"""
+Pre-execution guardrails on query plans
+
+A query such as get_department_summary joins departments, admissions,
+procedures, medication orders and allied health services before
+aggregating. Its intermediate result grows with the product of their
+per-admission fan-outs, so a year of growth can turn it into a query that
+occupies the warehouse for minutes. Timeouts (query_guard) only stop such a
+query after it has run. PlanGuard checks the plan before the query runs:
+
+- Snowflake: ``EXPLAIN USING JSON``, limited on micro-partitions to scan
+- local backend: DuckDB's plan, limited on its largest estimated row count
+
+A plan over its loader's limits (PLAN_LIMITS in loaders, else
+HOSPITAL_DEMO_MAX_PLAN_ROWS and HOSPITAL_DEMO_MAX_PLAN_PARTITIONS) is
+flagged. A flagged plan is logged and listed in ``recent()``, with the
+loader's pre-aggregated alternative as the suggested fix. Whether it is also
+rejected depends on HOSPITAL_DEMO_PLAN_GUARD:
+
+- ``clinical`` (default): rejected during CLINICAL_HOURS, flagged outside them
+- ``reject``: always rejected
+- ``flag``: never rejected
+- ``off``: plans are not checked
+
+A rejected plan raises PlanRejected without running. The guarded loader then
+serves its last good result, marked stale.
+
+Plans are cached per query shape (the SQL with its literals replaced, see
+warehouse_router.query_shape) for PLAN_TTL, so EXPLAIN runs about once an
+hour per query while tables grow, whatever values it is run with. Expired
+plans are swept out and at most MAX_PLANS are kept. The warehouse router
+reuses the same cached plans. If EXPLAIN fails, the query runs unchecked.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from warehouse_router import explain_cost, query_shape
+
+logger = logging.getLogger(__name__)
+
+MAX_PLAN_ROWS = int(os.environ.get("HOSPITAL_DEMO_MAX_PLAN_ROWS", 50_000_000))
+MAX_PLAN_PARTITIONS = int(os.environ.get("HOSPITAL_DEMO_MAX_PLAN_PARTITIONS", 10_000))
+GUARD_MODE = os.environ.get("HOSPITAL_DEMO_PLAN_GUARD", "clinical")
+CLINICAL_HOURS = ('07:00', '19:00')
+PLAN_TTL = timedelta(hours=1)
+MAX_PLANS = 500
+DEFAULT_ALTERNATIVE = "aggregate each table to the report's grain before joining"
+RECENT_PLANS = 50
+
+
+class PlanRejected(RuntimeError):
+    """A query plan exceeded its guardrails and was not run"""
+
+
+@dataclass(frozen=True)
+class PlanLimits:
+    """Largest estimated intermediate rows and micro-partitions to scan a query may plan for"""
+    rows: int = MAX_PLAN_ROWS
+    partitions: int = MAX_PLAN_PARTITIONS
+
+
+def violations(plan: dict, limits: PlanLimits) -> list:
+    """Descriptions of the limits a plan exceeds"""
+    found = []
+    if plan.get('rows') is not None and plan['rows'] > limits.rows:
+        found.append(f"~{plan['rows']:,} estimated rows (limit {limits.rows:,})")
+    if plan.get('partitions') is not None and plan['partitions'] > limits.partitions:
+        found.append(f"{plan['partitions']:,} partitions to scan (limit {limits.partitions:,})")
+    return found
+
+
+def _minutes(clock_time: str) -> int:
+    hour, minute = (int(part) for part in clock_time.split(':'))
+    return hour * 60 + minute
+
+
+class PlanGuard:
+    """Checks each query's plan against its loader's limits before it runs"""
+
+    def __init__(self, limits: dict = None, default: PlanLimits = PlanLimits(), alternatives: dict = None,
+                 mode: str = GUARD_MODE, clinical_hours=CLINICAL_HOURS, explain=explain_cost,
+                 ttl: timedelta = PLAN_TTL, clock=time.monotonic, now=datetime.now):
+        self.limits = limits or {}
+        self.default = default
+        self.alternatives = alternatives or {}
+        self.mode = mode
+        self.clinical_hours = clinical_hours
+        self.ttl = ttl
+        self._explain = explain
+        self._clock = clock
+        self._now = now
+        self._lock = threading.Lock()
+        self._plans = OrderedDict()  # oldest first
+        self._recent = deque(maxlen=RECENT_PLANS)
+
+    def explain(self, session, query: str, params=None) -> dict:
+        """The query's plan estimate, from EXPLAIN at most once per PLAN_TTL per query shape"""
+        key = query_shape(query)
+        with self._lock:
+            cached = self._plans.get(key)
+        if cached is not None and self._clock() - cached[1] < self.ttl.total_seconds():
+            return cached[0]
+        plan = self._explain(session, query, params)
+        with self._lock:
+            now = self._clock()
+            self._plans[key] = (plan, now)
+            self._plans.move_to_end(key)
+            while self._plans and (len(self._plans) > MAX_PLANS or
+                                   now - next(iter(self._plans.values()))[1] >= self.ttl.total_seconds()):
+                self._plans.popitem(last=False)
+        return plan
+
+    def rejecting(self) -> bool:
+        """Whether plans over their limits are rejected now, rather than only flagged"""
+        if self.mode == 'reject':
+            return True
+        if self.mode != 'clinical':
+            return False
+        start, end = (_minutes(t) for t in self.clinical_hours)
+        now = self._now()
+        return start <= now.hour * 60 + now.minute < end
+
+    def check(self, session, loader, query: str, params=None):
+        """Raise PlanRejected for a plan over its limits while rejecting; flag it otherwise"""
+        if self.mode == 'off':
+            return None
+        try:
+            plan = self.explain(session, query, params)
+        except Exception:
+            logger.debug("EXPLAIN failed; running %s unchecked", loader or 'query', exc_info=True)
+            return None
+        found = violations(plan, self.limits.get(loader, self.default))
+        if not found:
+            return plan
+        alternative = self.alternatives.get(loader, DEFAULT_ALTERNATIVE)
+        rejected = self.rejecting()
+        message = f"{loader or 'query'} plan exceeds guardrails: {'; '.join(found)}. Suggested: {alternative}"
+        with self._lock:
+            self._recent.append((datetime.now(), loader or '-', 'rejected' if rejected else 'flagged',
+                                 plan.get('rows'), plan.get('partitions'), '; '.join(found), alternative))
+        logger.warning("%s %s", 'Rejected' if rejected else 'Flagged', message)
+        if rejected:
+            raise PlanRejected(message)
+        return plan
+
+    def recent(self) -> pd.DataFrame:
+        """The most recent flagged and rejected plans, newest first"""
+        with self._lock:
+            rows = list(self._recent)[::-1]
+        return pd.DataFrame(rows, columns=['At', 'Loader', 'Action', 'Estimated rows', 'Partitions', 'Exceeds',
+                                           'Suggested'])
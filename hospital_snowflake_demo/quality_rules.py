@@ -0,0 +1,381 @@
+"""
+Data-quality rule engine for the rules in ANALYTICS.DATA_QUALITY_RULES
+
+Each active rule on a RAW_DATA table is one of:
+
+- NOT_NULL: the column has no nulls
+- RANGE: values lie within {"min": ..., "max": ...} (either may be left out)
+- REFERENTIAL: every value appears in {"table": ..., "column": ...}
+- REGEX: every value fully matches {"pattern": ...}
+- FRESHNESS: the latest date is at most {"max_age_days": ...} old
+
+The parameters are the rule's ``rule_params`` JSON. Rules that only carry a
+``rule_query`` (the TRANSFORMED-layer samples) are not compiled.
+
+A table's rules compile into one aggregate query: a single scan of the table,
+grouped by load batch (``source_file``), with one COUNT_IF per rule. Reference
+tables are joined as their distinct keys, so no row is counted twice. Values
+are passed as binds, so patterns and bounds need no escaping. The counts are
+written per batch and rule to HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RESULTS.
+A table is skipped while its catalog row count (INFORMATION_SCHEMA, no scan)
+equals the rows already checked by each of its rules: raw tables only grow
+by loads, so nothing new has arrived. Otherwise its query runs once and only
+the missing (rule, batch) results are written. Violation counts add up
+across batches, and a table's latest date is the latest of its batches, so
+the dashboard summarises the stored results instead of rescanning.
+
+The same rules run locally, vectorised with pandas (Arrow-backed when pyarrow
+is installed), over the generator's CSV output. This checks a dataset before
+it is loaded. Each CSV file is one batch, as it would be once loaded.
+
+Usage:
+    python quality_rules.py                    # evaluate any batches without results yet
+    python quality_rules.py --csv data         # evaluate the generator's CSVs in data/
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+RAW_SCHEMA = "HOSPITAL_DEMO.RAW_DATA"
+RULES_TABLE = "HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RULES"
+RESULTS_TABLE = "HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RESULTS"
+RULE_TYPES = ('NOT_NULL', 'RANGE', 'REFERENTIAL', 'REGEX', 'FRESHNESS')
+REQUIRED_PARAMS = {
+    'NOT_NULL': (),
+    'RANGE': (),
+    'REFERENTIAL': ('table', 'column'),
+    'REGEX': ('pattern',),
+    'FRESHNESS': ('max_age_days',),
+}
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+RESULT_COLUMNS = ['RULE_ID', 'TABLE_NAME', 'COLUMN_NAME', 'RULE_TYPE', 'RULE_DESCRIPTION', 'RULE_PARAMS',
+                  'LOAD_BATCH', 'ROWS_CHECKED', 'VIOLATIONS', 'LATEST_VALUE']
+SUMMARY_COLUMNS = ['RULE_ID', 'TABLE_NAME', 'COLUMN_NAME', 'RULE_TYPE', 'RULE_DESCRIPTION', 'BATCHES',
+                   'ROWS_CHECKED', 'VIOLATIONS', 'VIOLATION_PCT', 'LATEST_VALUE', 'AGE_DAYS', 'STATUS']
+
+
+@dataclass
+class Rule:
+    """One compiled data-quality rule on a raw table column"""
+    rule_id: int
+    table: str
+    column: str
+    rule_type: str
+    description: str = ''
+    params: dict = field(default_factory=dict)
+
+    @property
+    def alias(self) -> str:
+        return f"RULE_{self.rule_id}"
+
+
+def parse_rules(stored: pd.DataFrame) -> tuple:
+    """Rules from DATA_QUALITY_RULES rows, and (rule id, reason) for each active rule that can't be compiled"""
+    rules, skipped = [], []
+    for row in stored.to_dict('records'):
+        if pd.notna(row.get('IS_ACTIVE')) and not row['IS_ACTIVE']:
+            continue
+        rule_id, rule_type = int(row['RULE_ID']), str(row.get('RULE_TYPE') or '').upper()
+        table, column = str(row.get('TABLE_NAME') or '').upper(), str(row.get('COLUMN_NAME') or '')
+        raw_params = row.get('RULE_PARAMS')
+        if rule_type not in RULE_TYPES or not isinstance(raw_params, str):
+            skipped.append((rule_id, "no rule_params; only its rule_query describes it"))
+            continue
+        try:
+            params = json.loads(raw_params)
+        except ValueError:
+            skipped.append((rule_id, "rule_params is not valid JSON"))
+            continue
+        missing = [name for name in REQUIRED_PARAMS[rule_type] if name not in params]
+        identifiers = [table, column] + [params.get(name) for name in ('table', 'column') if rule_type == 'REFERENTIAL']
+        if missing:
+            skipped.append((rule_id, f"rule_params is missing {', '.join(missing)}"))
+        elif not all(IDENTIFIER.match(str(name)) for name in identifiers):
+            skipped.append((rule_id, "table and column names must be plain identifiers"))
+        else:
+            rules.append(Rule(rule_id, table, column, rule_type, row.get('RULE_DESCRIPTION') or '', params))
+    return rules, skipped
+
+
+def load_rules(session) -> tuple:
+    """Active rules from DATA_QUALITY_RULES, as parse_rules"""
+    return parse_rules(session.sql(f"SELECT * FROM {RULES_TABLE}").to_pandas())
+
+
+def _rule_select(rule: Rule) -> tuple:
+    """(select item, binds) computing one rule over the rows of a batch"""
+    column = f"t.{rule.column}"
+    if rule.rule_type == 'NOT_NULL':
+        return f"COUNT_IF({column} IS NULL)", []
+    if rule.rule_type == 'RANGE':
+        bounds = [(op, rule.params[key]) for op, key in (('<', 'min'), ('>', 'max')) if rule.params.get(key) is not None]
+        if not bounds:
+            return "0", []
+        outside = " OR ".join(f"{column} {op} ?" for op, _ in bounds)
+        return f"COUNT_IF({outside})", [value for _, value in bounds]
+    if rule.rule_type == 'REFERENTIAL':
+        return f"COUNT_IF({column} IS NOT NULL AND ref_{rule.rule_id}.ref_key IS NULL)", []
+    if rule.rule_type == 'REGEX':
+        return f"COUNT_IF({column} IS NOT NULL AND NOT REGEXP_LIKE({column}, ?))", [rule.params['pattern']]
+    # FRESHNESS: the batch's latest date; its age is judged when the batches are summarised
+    return f"CAST(CAST(MAX({column}) AS DATE) AS VARCHAR)", []
+
+
+def compile_table(table: str, rules: list, batches: list = None) -> tuple:
+    """(query, binds) evaluating all of a table's rules in one scan, one row per load batch"""
+    selects, binds = [], []
+    for rule in rules:
+        expression, values = _rule_select(rule)
+        selects.append(f"{expression} AS {rule.alias}")
+        binds.extend(values)
+    joins = [
+        f"LEFT JOIN (SELECT DISTINCT {rule.params['column']} AS ref_key FROM {RAW_SCHEMA}.{rule.params['table']}) "
+        f"ref_{rule.rule_id} ON t.{rule.column} = ref_{rule.rule_id}.ref_key"
+        for rule in rules if rule.rule_type == 'REFERENTIAL'
+    ]
+    query = ("SELECT COALESCE(t.source_file, '') AS load_batch, COUNT(*) AS rows_checked,\n       "
+             + ",\n       ".join(selects)
+             + f"\nFROM {RAW_SCHEMA}.{table} t"
+             + "".join(f"\n{join}" for join in joins))
+    if batches is not None:
+        query += f"\nWHERE COALESCE(t.source_file, '') IN ({', '.join('?' for _ in batches)})"
+        binds.extend(batches)
+    return query + "\nGROUP BY 1", binds
+
+
+def rules_by_table(rules: list) -> dict:
+    tables = {}
+    for rule in rules:
+        tables.setdefault(rule.table, []).append(rule)
+    return tables
+
+
+def compile_rules(rules: list, batches: dict = None) -> dict:
+    """{table: (query, binds)}: one scan per table for all of its rules, optionally only {table: batches}"""
+    return {table: compile_table(table, table_rules, None if batches is None else batches[table])
+            for table, table_rules in rules_by_table(rules).items()
+            if batches is None or batches.get(table)}
+
+
+def _result_row(rule: Rule, batch: str, rows: int, value) -> dict:
+    freshness = rule.rule_type == 'FRESHNESS'
+    return {
+        'RULE_ID': rule.rule_id, 'TABLE_NAME': rule.table, 'COLUMN_NAME': rule.column,
+        'RULE_TYPE': rule.rule_type, 'RULE_DESCRIPTION': rule.description,
+        'RULE_PARAMS': json.dumps(rule.params, sort_keys=True), 'LOAD_BATCH': batch, 'ROWS_CHECKED': int(rows),
+        'VIOLATIONS': None if freshness else int(value),
+        'LATEST_VALUE': (None if pd.isna(value) else str(value)) if freshness else None,
+    }
+
+
+def scan_results(rules: list, scan: pd.DataFrame) -> pd.DataFrame:
+    """Per (rule, batch) results from a compiled table query's rows"""
+    rows = [_result_row(rule, batch, checked, value)
+            for batch, checked, values in zip(scan['LOAD_BATCH'], scan['ROWS_CHECKED'],
+                                              scan[[rule.alias for rule in rules]].itertuples(index=False))
+            for rule, value in zip(rules, values)]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def evaluate_frame(rules: list, frame: pd.DataFrame, batch: str, references: dict) -> list:
+    """Result rows for one batch of a table's rows, vectorised over its columns
+
+    ``references`` maps (table, column) to the referenced key values.
+    """
+    columns = {str(name).lower(): name for name in frame.columns}
+    rows = []
+    for rule in rules:
+        values = frame[columns[rule.column.lower()]]
+        present = values.dropna()
+        if rule.rule_type == 'NOT_NULL':
+            value = len(values) - len(present)
+        elif rule.rule_type == 'RANGE':
+            bounds = [rule.params.get(key) for key in ('min', 'max')]
+            if any(isinstance(bound, str) for bound in bounds):
+                comparable = pd.to_datetime(present, errors='coerce', format='mixed')
+                bounds = [None if bound is None else pd.Timestamp(bound) for bound in bounds]
+            else:
+                comparable = pd.to_numeric(present, errors='coerce')
+            # A value that doesn't parse can't be in range
+            outside = comparable.isna()
+            if bounds[0] is not None:
+                outside |= comparable < bounds[0]
+            if bounds[1] is not None:
+                outside |= comparable > bounds[1]
+            value = int(outside.sum())
+        elif rule.rule_type == 'REFERENTIAL':
+            keys = references[(rule.params['table'].upper(), rule.params['column'].lower())]
+            value = int((~present.isin(keys)).sum())
+        elif rule.rule_type == 'REGEX':
+            value = int((~present.astype(str).str.fullmatch(rule.params['pattern'])).sum())
+        else:
+            latest = pd.to_datetime(present, errors='coerce', format='mixed').max()
+            value = None if pd.isna(latest) else latest.strftime('%Y-%m-%d')
+        rows.append(_result_row(rule, batch, len(values), value))
+    return rows
+
+
+def _read_csv(path: str, columns: list) -> pd.DataFrame:
+    """Selected CSV columns as strings, read with pyarrow when it is installed"""
+    engine = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = [name for name in header if name.lower() in {column.lower() for column in columns}]
+    return pd.read_csv(path, usecols=wanted, dtype=str, keep_default_na=False, na_values=['', 'NULL'], engine=engine)
+
+
+def evaluate_csv_dir(rules: list, data_dir: str) -> pd.DataFrame:
+    """Per (rule, batch) results for the generator's CSVs, each file being one batch of its raw table"""
+    from local_backend import RAW_TABLE_FILES
+
+    def csv_path(table):
+        for filename in RAW_TABLE_FILES.get(table, []):
+            path = os.path.join(data_dir, filename)
+            if os.path.exists(path):
+                return path
+        return None
+
+    references = {}
+    for rule in rules:
+        if rule.rule_type == 'REFERENTIAL':
+            key = (rule.params['table'].upper(), rule.params['column'].lower())
+            if key not in references:
+                path = csv_path(key[0])
+                keys = _read_csv(path, [key[1]]).iloc[:, 0] if path else pd.Series(dtype=str)
+                references[key] = pd.Index(keys.dropna().unique())
+
+    rows = []
+    for table, table_rules in rules_by_table(rules).items():
+        path = csv_path(table)
+        if path is not None:
+            frame = _read_csv(path, [rule.column for rule in table_rules])
+            rows.extend(evaluate_frame(table_rules, frame, os.path.basename(path), references))
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def summarize_results(results: pd.DataFrame, today: date = None) -> pd.DataFrame:
+    """One row per rule over all of its evaluated batches, with PASS/FAIL
+
+    ``today`` defaults to the results' CHECKED_ON column (the warehouse's
+    current date when they were read), then to the local date.
+    """
+    if len(results) == 0:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    if today is None:
+        today = results['CHECKED_ON'].iloc[0] if 'CHECKED_ON' in results else date.today()
+    today = pd.Timestamp(today)
+    results = results.assign(LATEST_VALUE=pd.to_datetime(results['LATEST_VALUE'], errors='coerce'),
+                             VIOLATIONS=pd.to_numeric(results['VIOLATIONS'], errors='coerce'))
+    summary = results.groupby(['RULE_ID', 'TABLE_NAME', 'COLUMN_NAME', 'RULE_TYPE', 'RULE_DESCRIPTION',
+                               'RULE_PARAMS'], dropna=False).agg(
+        BATCHES=('LOAD_BATCH', 'nunique'), ROWS_CHECKED=('ROWS_CHECKED', 'sum'),
+        VIOLATIONS=('VIOLATIONS', lambda v: v.sum(min_count=1)), LATEST_VALUE=('LATEST_VALUE', 'max'),
+    ).reset_index()
+    summary['VIOLATION_PCT'] = 100.0 * summary['VIOLATIONS'] / summary['ROWS_CHECKED'].clip(lower=1)
+    summary['AGE_DAYS'] = (today - summary['LATEST_VALUE']).dt.days
+    max_age = summary['RULE_PARAMS'].map(lambda params: json.loads(params).get('max_age_days'))
+    freshness = summary['RULE_TYPE'] == 'FRESHNESS'
+    failed = ((~freshness & (summary['VIOLATIONS'] > 0))
+              | (freshness & (summary['AGE_DAYS'].isna() | (summary['AGE_DAYS'] > pd.to_numeric(max_age)))))
+    summary['STATUS'] = failed.map({True: 'FAIL', False: 'PASS'})
+    summary['LATEST_VALUE'] = summary['LATEST_VALUE'].dt.strftime('%Y-%m-%d')
+    return summary.sort_values(['STATUS', 'TABLE_NAME', 'RULE_ID'])[SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def ensure_results_table(session):
+    session.sql(f"""
+        CREATE TABLE IF NOT EXISTS {RESULTS_TABLE} (
+            rule_id INTEGER,
+            table_name STRING,
+            column_name STRING,
+            rule_type STRING,
+            rule_description STRING,
+            rule_params STRING,
+            load_batch STRING,
+            rows_checked INTEGER,
+            violations INTEGER,
+            latest_value STRING,
+            evaluated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+        )
+    """).collect()
+
+
+def _insert_results(session, results: pd.DataFrame):
+    columns = [column.lower() for column in RESULT_COLUMNS]
+    row = f"({', '.join('?' for _ in columns)})"
+    params = [None if pd.isna(value) else value for record in results[RESULT_COLUMNS].itertuples(index=False)
+              for value in record]
+    session.sql(f"INSERT INTO {RESULTS_TABLE} ({', '.join(columns)}) VALUES " + ", ".join([row] * len(results)),
+                params=params).collect()
+
+
+def table_row_counts(session) -> dict:
+    """{table: row count} for the RAW_DATA tables from catalog metadata, or {} when it can't be read"""
+    try:
+        counts = session.sql("SELECT table_name, row_count FROM HOSPITAL_DEMO.INFORMATION_SCHEMA.TABLES "
+                             "WHERE table_schema = 'RAW_DATA'").to_pandas()
+    except Exception:
+        return {}
+    return {name.upper(): None if pd.isna(rows) else int(rows)
+            for name, rows in zip(counts['TABLE_NAME'], counts['ROW_COUNT'])}
+
+
+def evaluate_new_batches(session, rules: list = None) -> int:
+    """Evaluate the rules on load batches they have no result for yet; returns the results written"""
+    if rules is None:
+        rules, _ = load_rules(session)
+    ensure_results_table(session)
+    done = session.sql(f"SELECT rule_id, load_batch, rows_checked FROM {RESULTS_TABLE}").to_pandas()
+    checked = done.groupby(done['RULE_ID'].astype(int))['ROWS_CHECKED'].sum()
+    done = set(zip(done['RULE_ID'].astype(int), done['LOAD_BATCH']))
+    row_counts = table_row_counts(session)
+
+    written = 0
+    for table, table_rules in rules_by_table(rules).items():
+        rows = row_counts.get(table.upper())
+        if rows is not None and all(checked.get(rule.rule_id, 0) == rows for rule in table_rules):
+            continue
+        query, binds = compile_table(table, table_rules)
+        results = scan_results(table_rules, session.sql(query, params=binds).to_pandas())
+        results = results[[(rule_id, batch) not in done
+                           for rule_id, batch in zip(results['RULE_ID'], results['LOAD_BATCH'])]]
+        if len(results) > 0:
+            _insert_results(session, results)
+            written += len(results)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", metavar="DATA_DIR", help="Evaluate the generator's CSVs in this directory")
+    parser.add_argument("--as-of", type=date.fromisoformat, help="Date freshness is judged against (default: today)")
+    args = parser.parse_args()
+
+    from app_session import get_session
+
+    session = get_session()
+    rules, skipped = load_rules(session)
+    for rule_id, reason in skipped:
+        print(f"Rule {rule_id} not compiled: {reason}")
+    if not args.csv:
+        written = evaluate_new_batches(session, rules)
+        print(f"Wrote {written} rule results for new load batches into {RESULTS_TABLE}")
+        return 0
+
+    summary = summarize_results(evaluate_csv_dir(rules, args.csv), args.as_of or date.today())
+    print(summary.drop(columns=['RULE_DESCRIPTION']).to_string(index=False))
+    failed = int((summary['STATUS'] == 'FAIL').sum())
+    print(f"\n{failed} of {len(summary)} rules failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Per-query timeouts, cancellation and last-known-good fallback for loaders
+
+A runaway warehouse query used to hang the page: loaders run synchronously,
+and their ``try/except`` only catches errors. Now:
+
+- ``run_with_timeout`` submits each query asynchronously and polls it. Past
+  the calling loader's timeout it cancels the query (Snowpark
+  ``AsyncJob.cancel``, or a DuckDB interrupt locally) and raises
+  QueryTimeout. The loader's own error handling then returns its empty
+  error frame.
+- ``guarded`` (from ``query_guard``) wraps a cached loader. It sets that
+  loader's timeout for the queries run during the call. When one of them
+  times out (or is otherwise not run, see ``mark_stale``), it drops the
+  cached error frame so the next rerun tries again, and it serves the last
+  good result for the same arguments with a visible stale warning.
+
+Every timeout is logged with the loader, the limit and the start of the SQL,
+and the most recent ones are kept in ``recent_timeouts()`` so slow queries can
+be found. The default limit is HOSPITAL_DEMO_QUERY_TIMEOUT seconds (60).
+Last good results are kept in memory for the process, for the LAST_GOOD_ENTRIES
+most recently used argument sets of each loader (a loader called with a moving
+watermark would otherwise keep one per call).
+"""
+
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from freshness import format_age
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = timedelta(seconds=float(os.environ.get("HOSPITAL_DEMO_QUERY_TIMEOUT", 60)))
+POLL_INTERVAL = (0.01, 0.5)  # first and longest wait between status checks, in seconds
+RECENT_TIMEOUTS = 50
+LAST_GOOD_ENTRIES = 32
+
+_budget = contextvars.ContextVar('query_budget', default=None)
+_timeouts = deque(maxlen=RECENT_TIMEOUTS)
+
+
+class QueryTimeout(TimeoutError):
+    """A warehouse query was cancelled after running past its loader's timeout"""
+
+
+def current_loader():
+    """Name of the guarded loader whose queries are running, or None outside a loader"""
+    budget = _budget.get()
+    return budget['loader'] if budget else None
+
+
+def mark_stale(reason: str):
+    """Record that the current loader's query did not run (``reason``), so its last good result is served"""
+    budget = _budget.get()
+    if budget:
+        budget['stale_reason'] = reason
+
+
+def recent_timeouts() -> pd.DataFrame:
+    """The most recent query timeouts, newest first"""
+    return pd.DataFrame(list(_timeouts)[::-1], columns=['At', 'Loader', 'Timeout (s)', 'Query'])
+
+
+def run_with_timeout(frame, query: str = '') -> pd.DataFrame:
+    """Collect a session DataFrame, cancelling the query past the current loader's timeout"""
+    budget = _budget.get()
+    loader, timeout = (budget['loader'], budget['timeout']) if budget else (None, DEFAULT_TIMEOUT)
+    if budget:
+        budget['queries'] += 1
+    job = frame.to_pandas(block=False)
+    deadline = time.monotonic() + timeout.total_seconds()
+    wait = POLL_INTERVAL[0]
+    while not job.is_done():
+        if time.monotonic() >= deadline:
+            job.cancel()
+            snippet = ' '.join(query.split())[:200]
+            _timeouts.append((datetime.now(), loader or '-', timeout.total_seconds(), snippet))
+            logger.warning("Cancelled query for %s after %g s: %s", loader or 'unknown loader',
+                           timeout.total_seconds(), snippet)
+            mark_stale(f"the query timed out after {timeout.total_seconds():g} s and was cancelled")
+            raise QueryTimeout(f"query cancelled after {timeout.total_seconds():g} s")
+        time.sleep(min(wait, max(deadline - time.monotonic(), 0)))
+        wait = min(wait * 2, POLL_INTERVAL[1])
+    return job.result()
+
+
+def query_guard(timeouts: dict = None, default: timedelta = DEFAULT_TIMEOUT):
+    """Decorator factory applying per-loader timeouts ({loader name: timedelta}) with fallback"""
+    timeouts = timeouts or {}
+
+    def guarded(func):
+        name = func.__name__
+        last_good = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            budget = {'loader': name, 'timeout': timeouts.get(name, default), 'queries': 0, 'stale_reason': None}
+            token = _budget.set(budget)
+            try:
+                value = func(*args, **kwargs)
+            finally:
+                _budget.reset(token)
+            key = args + tuple(sorted(kwargs.items()))
+            if budget['stale_reason'] is None:
+                if isinstance(value, pd.DataFrame) and len(value) > 0:
+                    with lock:
+                        # A cache hit runs no query: keep the time the result was loaded
+                        fresh = budget['queries'] > 0 or key not in last_good
+                        last_good[key] = (value, time.monotonic() if fresh else last_good[key][1])
+                        last_good.move_to_end(key)
+                        while len(last_good) > LAST_GOOD_ENTRIES:
+                            last_good.popitem(last=False)
+                return value
+            if hasattr(func, 'clear'):
+                # Drop the cached error frame so the next rerun queries again
+                func.clear(*args, **kwargs)
+            with lock:
+                fallback = last_good.get(key)
+            if fallback is None:
+                return value
+            stale, loaded_at = fallback
+            age = timedelta(seconds=time.monotonic() - loaded_at)
+            st.warning(f"⏱️ Stale data: {budget['stale_reason']}; showing the last good result from {format_age(age)}")
+            stale = stale.copy()
+            stale.attrs['stale'] = True
+            return stale
+
+        for attr in ('clear', 'wait', 'status', 'ttl', 'max_stale'):
+            if hasattr(func, attr):
+                setattr(wrapper, attr, getattr(func, attr))
+        return wrapper
+    return guarded
@@ -0,0 +1,84 @@
+"""
+Record counts from table metadata and load counters
+
+The header KPIs and the footer's record total are counts over the raw
+tables. A COUNT(*) or COUNT(DISTINCT) over them grows with the tables, so
+each table's count is answered, in order, from:
+
+- metadata: INFORMATION_SCHEMA.TABLES.ROW_COUNT, which Snowflake keeps
+  current on every load; the freshness probe already reads it
+- counters: RECORD_COUNTS, rebuilt by the load once its COPYs have run
+  (sql/03_load_data.sql); it also keeps the distinct counts (patients) that
+  metadata does not have, and answers when the role can't see
+  INFORMATION_SCHEMA
+- an exact count, only for the tables neither answers
+
+A table's distinct count is only taken from its counter while the table's
+metadata row count is still the one that was counted.
+"""
+
+import pandas as pd
+
+from freshness import FRESHNESS_SOURCES
+
+COUNTERS_TABLE = "HOSPITAL_DEMO.RAW_DATA.RECORD_COUNTS"
+COUNTER_COLUMNS = ['TABLE_NAME', 'ROW_COUNT', 'DISTINCT_COUNT', 'REFRESHED_AT']
+COUNTERS_QUERY = f"SELECT table_name, row_count, distinct_count, refreshed_at FROM {COUNTERS_TABLE}"
+
+# Raw tables whose rows make up the footer's record total
+RAW_TABLES = sorted({name for entries in FRESHNESS_SOURCES.values()
+                     for schema, name, _ in entries if schema == 'RAW_DATA' and name.endswith('_RAW')})
+
+# Header KPI -> (raw table, column counted distinct, or None to count rows)
+BASIC_STATS = {
+    'Patients': ('PATIENT_DEMOGRAPHICS_RAW', 'patient_id'),
+    'Admissions': ('PATIENT_ADMISSIONS_RAW', None),
+    'Procedures': ('MEDICAL_PROCEDURES_RAW', None),
+    'Medications': ('MEDICATION_ORDERS_RAW', None),
+    'Allied Health': ('ALLIED_HEALTH_SERVICES_RAW', None),
+}
+DISTINCT_COLUMNS = {table: column for table, column in BASIC_STATS.values() if column}
+
+
+def _count_select(table: str, column: str = None) -> str:
+    distinct = f"COUNT(DISTINCT {column})" if column else "NULL"
+    return (f"SELECT '{table}' AS table_name, COUNT(*) AS row_count, {distinct} AS distinct_count "
+            f"FROM HOSPITAL_DEMO.RAW_DATA.{table}")
+
+
+def counter_refresh_sql(tables: list = RAW_TABLES, distinct_columns: dict = DISTINCT_COLUMNS) -> list:
+    """Statements that rebuild the counters from exact counts, run once a load has committed"""
+    counts = "\nUNION ALL\n".join(_count_select(table, distinct_columns.get(table)) for table in tables)
+    return [
+        f"DELETE FROM {COUNTERS_TABLE}",
+        f"INSERT INTO {COUNTERS_TABLE} (table_name, row_count, distinct_count, refreshed_at)\n"
+        f"SELECT c.*, CURRENT_TIMESTAMP FROM (\n{counts}\n) c",
+    ]
+
+
+def exact_count_sql(tables: dict) -> str:
+    """One query counting each {table: distinct column or None} exactly, as TABLE_NAME, RECORD_COUNT"""
+    return "\nUNION ALL\n".join(
+        f"SELECT '{table}' AS table_name, {f'COUNT(DISTINCT {column})' if column else 'COUNT(*)'} AS record_count "
+        f"FROM HOSPITAL_DEMO.RAW_DATA.{table}"
+        for table, column in sorted(tables.items())
+    )
+
+
+def resolve_counts(tables: dict, probe: pd.DataFrame, counters: pd.DataFrame) -> dict:
+    """{table: (count, source)} for the {table: distinct column or None} that metadata or the counters answer"""
+    metadata = {name: int(rows) for name, rows in zip(probe['OBJECT_NAME'], probe['ROW_COUNT']) if pd.notna(rows)}
+    kept = {name: (rows, distinct) for name, rows, distinct
+            in zip(counters['TABLE_NAME'], counters['ROW_COUNT'], counters['DISTINCT_COUNT'])}
+
+    counts = {}
+    for table, column in tables.items():
+        rows = metadata.get(table)
+        counted_rows, distinct = kept.get(table, (None, None))
+        if column is None and rows is not None:
+            counts[table] = (rows, 'metadata')
+        elif column is None and pd.notna(counted_rows):
+            counts[table] = (int(counted_rows), 'counter')
+        elif column is not None and pd.notna(distinct) and (rows is None or rows == counted_rows):
+            counts[table] = (int(distinct), 'counter')
+    return counts
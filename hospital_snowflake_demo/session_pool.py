@@ -0,0 +1,336 @@
+"""
+Bounded session pool for self-hosted deployments
+
+Inside Streamlit-in-Snowflake every query goes through the one active
+session. A self-hosted deployment serves many users from worker threads.
+With a single session they would serialize on it, and with a session per
+user each would pay connection setup. SessionPool holds up to ``max_size``
+sessions (Snowpark sessions, or local DuckDB connections to the same
+in-memory database) shared by every Streamlit session in the process.
+
+- The pool is a drop-in for a session: ``pool.sql(query).to_pandas()``
+  checks a session out for the duration of the query, including
+  asynchronous queries (``to_pandas(block=False)``), which return it when
+  their result is collected or they are cancelled.
+- A session idle for longer than ``health_check_after`` is checked with
+  ``SELECT 1`` before it is handed out. A session failing the check is
+  discarded and replaced.
+- A daemon thread pings idle sessions every ``keepalive_interval`` so the
+  warehouse does not expire them between shift changes.
+- ``pool.bound(role, warehouse)`` is a session-like view whose queries run
+  on sessions bound to ``role`` (``USE ROLE``) and ``warehouse``
+  (``USE WAREHOUSE``). Sessions already bound to them are preferred, so
+  binding is paid once per session rather than per query. A session's own
+  role is recorded when it is created, and a role-bound session handed out
+  for the default role is bound back to it (or replaced when it is unknown),
+  so cached, shared results never run under a dashboard role.
+
+When every session is in use, callers wait up to ``acquire_timeout`` and
+then get PoolExhausted.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 8
+ACQUIRE_TIMEOUT = timedelta(seconds=30)
+HEALTH_CHECK_AFTER = timedelta(minutes=5)
+KEEPALIVE_INTERVAL = timedelta(minutes=15)
+
+
+class PoolExhausted(TimeoutError):
+    """No pooled session became free within the acquire timeout"""
+
+
+def check_health(session):
+    session.sql("SELECT 1").collect()
+
+
+def current_role(session):
+    return session.get_current_role() if hasattr(session, 'get_current_role') else None
+
+
+def bind_role(session, role):
+    if hasattr(session, 'use_role'):
+        session.use_role(role)
+
+
+def bind_warehouse(session, warehouse):
+    if hasattr(session, 'use_warehouse'):
+        session.use_warehouse(warehouse)
+
+
+@dataclass
+class PooledSession:
+    """A pooled session, the role and warehouse it is bound to and when it was last used
+
+    ``role`` is None while the session runs under ``default_role``, its role when created.
+    """
+    session: Any
+    role: Optional[str] = None
+    default_role: Optional[str] = None
+    warehouse: Optional[str] = None
+    last_used: float = 0.0
+
+
+class SessionPool:
+    """Bounded pool of sessions shared across Streamlit sessions"""
+
+    def __init__(self, factory, max_size: int = POOL_SIZE, acquire_timeout: timedelta = ACQUIRE_TIMEOUT,
+                 health_check_after: timedelta = HEALTH_CHECK_AFTER, keepalive_interval: timedelta = KEEPALIVE_INTERVAL,
+                 health_check=check_health, bind=bind_role, bind_warehouse=bind_warehouse,
+                 default_role=current_role, clock=time.monotonic):
+        self._factory = factory
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_after = health_check_after
+        self.keepalive_interval = keepalive_interval
+        self._health_check = health_check
+        self._bind = bind
+        self._bind_warehouse = bind_warehouse
+        self._default_role = default_role
+        self._clock = clock
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self.stats = {'created': 0, 'discarded': 0, 'rebound': 0, 'waits': 0}
+        # One session up front: fails fast on bad configuration and serves attribute lookups
+        self._idle.append(self._create(None))
+        self._size = 1
+
+    def _create(self, role) -> PooledSession:
+        session = self._factory()
+        pooled = PooledSession(session, default_role=self._default_role(session), last_used=self._clock())
+        self.stats['created'] += 1
+        if role is not None:
+            self._bind(pooled.session, role)
+            pooled.role = role
+        return pooled
+
+    def _healthy(self, pooled: PooledSession) -> bool:
+        try:
+            self._health_check(pooled.session)
+            return True
+        except Exception:
+            logger.warning("Discarding a pooled session that failed its health check", exc_info=True)
+            return False
+
+    def _discard(self, pooled: PooledSession):
+        with self._cond:
+            self._size -= 1
+            self.stats['discarded'] += 1
+            self._cond.notify()
+        close = getattr(pooled.session, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def acquire(self, role: str = None, warehouse: str = None) -> PooledSession:
+        """Check out a session bound to ``role`` (or the default role) and ``warehouse``, waiting while the pool is full
+
+        ``warehouse=None`` takes a session on whichever warehouse it is using.
+        """
+        deadline = self._clock() + self.acquire_timeout.total_seconds()
+        while True:
+            pooled = None
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        raise PoolExhausted(f"all {self.max_size} pooled sessions are busy")
+                    self.stats['waits'] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # Prefer a session already bound to the role and warehouse, then the most recently used
+                    same_role = [p for p in self._idle if p.role == role]
+                    matching = [p for p in same_role if warehouse in (None, p.warehouse)]
+                    pooled = (matching or same_role or self._idle)[-1]
+                    self._idle.remove(pooled)
+                else:
+                    self._size += 1
+            if pooled is None:
+                try:
+                    pooled = self._create(role)
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif self._clock() - pooled.last_used > self.health_check_after.total_seconds() and not self._healthy(pooled):
+                self._discard(pooled)
+                continue
+            if pooled.role != role:
+                target = role if role is not None else pooled.default_role
+                if target is None:
+                    # Bound to a role, and the session's own role is unknown: replace it
+                    self._discard(pooled)
+                    continue
+                try:
+                    self._bind(pooled.session, target)
+                except Exception:
+                    self._discard(pooled)
+                    raise
+                pooled.role = role
+                self.stats['rebound'] += 1
+            if warehouse is not None and pooled.warehouse != warehouse:
+                try:
+                    self._bind_warehouse(pooled.session, warehouse)
+                except Exception:
+                    self._discard(pooled)
+                    raise
+                pooled.warehouse = warehouse
+            return pooled
+
+    def release(self, pooled: PooledSession):
+        with self._cond:
+            pooled.last_used = self._clock()
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def session(self, role: str = None, warehouse: str = None):
+        """Context manager checking out a session for ``role`` and ``warehouse``"""
+        pooled = self.acquire(role, warehouse)
+        try:
+            yield pooled.session
+        finally:
+            self.release(pooled)
+
+    def keepalive(self):
+        """Ping sessions idle for a keep-alive interval; discard those that fail"""
+        with self._cond:
+            due = [p for p in self._idle if self._clock() - p.last_used >= self.keepalive_interval.total_seconds()]
+            for pooled in due:
+                self._idle.remove(pooled)
+        for pooled in due:
+            if self._healthy(pooled):
+                self.release(pooled)
+            else:
+                self._discard(pooled)
+
+    def start_keepalive(self) -> threading.Thread:
+        thread = threading.Thread(target=_keepalive_loop, args=(weakref.ref(self), self.keepalive_interval),
+                                  name="session-keepalive", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> dict:
+        with self._cond:
+            return {'size': self._size, 'idle': len(self._idle), 'in_use': self._size - len(self._idle),
+                    'max_size': self.max_size, **self.stats}
+
+    def sql(self, query: str, params=None) -> 'PooledFrame':
+        return PooledFrame(self, None, None, query, params)
+
+    def bound(self, role: str = None, warehouse: str = None) -> 'BoundSession':
+        return BoundSession(self, role, warehouse)
+
+    def __getattr__(self, name):
+        # Backend attributes (e.g. approx_distinct_rse) are the same on every pooled session
+        if name.startswith('_'):
+            raise AttributeError(name)
+        with self._cond:
+            sessions = [p.session for p in self._idle]
+        if not sessions:
+            with self.session() as session:
+                return getattr(session, name)
+        return getattr(sessions[0], name)
+
+
+def _keepalive_loop(pool_ref, interval: timedelta):
+    # Holds only a weak reference, so a replaced pool is collected and the loop ends
+    while True:
+        time.sleep(interval.total_seconds())
+        pool = pool_ref()
+        if pool is None:
+            return
+        try:
+            pool.keepalive()
+        except Exception:
+            logger.exception("Session keep-alive failed")
+        del pool
+
+
+class BoundSession:
+    """Session-like view of the pool whose queries run under one role and/or on one warehouse"""
+
+    def __init__(self, pool: SessionPool, role: str = None, warehouse: str = None):
+        self._pool = pool
+        self.role = role
+        self.warehouse = warehouse
+
+    def sql(self, query: str, params=None) -> 'PooledFrame':
+        return PooledFrame(self._pool, self.role, self.warehouse, query, params)
+
+
+class PooledFrame:
+    """Query to run on a pooled session, mirroring the part of the Snowpark DataFrame API the app uses"""
+
+    def __init__(self, pool: SessionPool, role, warehouse, query: str, params=None):
+        self._pool = pool
+        self._role = role
+        self._warehouse = warehouse
+        self._query = query
+        self._params = params
+
+    def to_pandas(self, block: bool = True):
+        if not block:
+            pooled = self._pool.acquire(self._role, self._warehouse)
+            try:
+                job = pooled.session.sql(self._query, params=self._params).to_pandas(block=False)
+            except Exception:
+                self._pool.release(pooled)
+                raise
+            return PooledJob(job, lambda: self._pool.release(pooled))
+        with self._pool.session(self._role, self._warehouse) as session:
+            return session.sql(self._query, params=self._params).to_pandas()
+
+    def to_pandas_batches(self):
+        with self._pool.session(self._role, self._warehouse) as session:
+            yield from session.sql(self._query, params=self._params).to_pandas_batches()
+
+    def collect(self) -> list:
+        with self._pool.session(self._role, self._warehouse) as session:
+            return session.sql(self._query, params=self._params).collect()
+
+
+class PooledJob:
+    """Asynchronous query holding its pooled session until collected or cancelled"""
+
+    def __init__(self, job, release):
+        self._job = job
+        self._release = release
+        self._released = False
+        self._lock = threading.Lock()
+
+    def _return_session(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._release()
+
+    def is_done(self) -> bool:
+        return self._job.is_done()
+
+    def cancel(self):
+        try:
+            self._job.cancel()
+        finally:
+            self._return_session()
+
+    def result(self):
+        try:
+            return self._job.result()
+        finally:
+            self._return_session()
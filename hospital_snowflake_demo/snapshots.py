@@ -0,0 +1,240 @@
+"""
+Pre-rendered dashboard snapshots
+
+The CEO view is the same for every executive on a given day, yet each visit
+ran its loaders and rebuilt its figures. Read-mostly views (SNAPSHOT_VIEWS)
+are split in two:
+
+- ``build(**filters)`` runs the loaders and returns the page's content as a
+  Dashboard: KPI values, tables and plotly figures
+- ``show(dashboard)`` only draws it
+
+After each nightly load, ``python snapshots.py`` builds each of these views
+with its default filters and writes it to HOSPITAL_DEMO_SNAPSHOT_DIR as one
+JSON file per role:
+
+- KPI values as JSON, tables as pandas table JSON (which keeps dtypes) and
+  figures as plotly JSON
+- metadata: the filters, created-at time, a hash of the view's source and
+  the versions of the tables its loaders read (from the freshness probe)
+
+``snapshot_or_build`` serves a view from its snapshot when the user's
+filters are the ones it was rendered with, the view's source is unchanged,
+its source tables have not changed since and it was rendered today. Otherwise
+(a changed filter, a load since the snapshot, no snapshot) the view is built
+from live queries as before.
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from io import StringIO
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_DIR = os.path.join(BASE_DIR, ".cache", "snapshots")
+SNAPSHOT_VIEWS = {
+    "CEO": "views.ceo",
+    "Allied Health Coordinator": "views.allied_health",
+}
+
+
+@dataclass
+class Dashboard:
+    """A view's content by name, and the row count of each loader it was built from"""
+    kpis: dict = field(default_factory=dict)
+    tables: dict = field(default_factory=dict)
+    figures: dict = field(default_factory=dict)
+    row_counts: dict = field(default_factory=dict)
+    rendered_at: datetime = None  # set when served from a snapshot
+
+    def complete(self) -> bool:
+        """Whether every loader returned rows (loaders return an empty frame on error)"""
+        return all(count > 0 for count in self.row_counts.values())
+
+
+def snapshot_dir() -> str:
+    return os.environ.get("HOSPITAL_DEMO_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+
+
+def snapshot_path(role: str, directory: str = None) -> str:
+    name = ''.join(c if c.isalnum() else '_' for c in role.lower())
+    return os.path.join(directory or snapshot_dir(), f"{name}.json")
+
+
+def view_fingerprint(module) -> str:
+    """Hash of a view's source, so an edited view never serves an old snapshot"""
+    return hashlib.sha256(inspect.getsource(module).encode()).hexdigest()[:16]
+
+
+def default_filters(build) -> dict:
+    return {name: p.default for name, p in inspect.signature(build).parameters.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _view_tables(module_name: str) -> frozenset:
+    import loaders
+    from cache_warmer import view_loader_calls
+    from freshness import loader_sources
+
+    return frozenset().union(*(loader_sources(getattr(loaders, name)) for name, _ in view_loader_calls(module_name)))
+
+
+def source_versions(module_name: str) -> dict:
+    """Current metadata versions of the tables a view's loaders read"""
+    from freshness import table_versions
+    from loaders import get_freshness_probe
+
+    probe = get_freshness_probe()
+    if len(probe) == 0:
+        return {}
+    tables = _view_tables(module_name)
+    return {name: list(version) for name, version in table_versions(probe).items() if name in tables}
+
+
+def _json_value(value):
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def write_snapshot(role: str, module_name: str = None, directory: str = None):
+    """Build a view with its default filters and store it; returns the path, or None if a loader failed"""
+    module = importlib.import_module(module_name or SNAPSHOT_VIEWS[role])
+    # Versions before the build: a load during it leaves the snapshot stale rather than mislabelled
+    versions = source_versions(module.__name__)
+    dashboard = module.build()
+    if not dashboard.complete():
+        empty = [name for name, count in dashboard.row_counts.items() if count == 0]
+        logger.warning("Not writing the %s snapshot: no rows from %s", role, ', '.join(empty))
+        return None
+    payload = {
+        'metadata': {
+            'role': role,
+            'filters': default_filters(module.build),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'view_fingerprint': view_fingerprint(module),
+            'source_versions': versions,
+            'row_counts': dashboard.row_counts,
+        },
+        'kpis': dashboard.kpis,
+        'tables': {name: df.to_json(orient='table') for name, df in dashboard.tables.items()},
+        'figures': {name: fig.to_json() for name, fig in dashboard.figures.items()},
+    }
+    directory = directory or snapshot_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = snapshot_path(role, directory)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(payload, f, default=_json_value)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+
+@functools.lru_cache(maxsize=16)
+def _read(path: str, mtime: float):
+    """Parsed (metadata, Dashboard) of a snapshot file, once per version of the file"""
+    import plotly.io as pio
+
+    with open(path) as f:
+        payload = json.load(f)
+    metadata = payload['metadata']
+    dashboard = Dashboard(
+        kpis=payload['kpis'],
+        tables={name: pd.read_json(StringIO(table), orient='table') for name, table in payload['tables'].items()},
+        figures={name: pio.from_json(figure) for name, figure in payload['figures'].items()},
+        row_counts=metadata['row_counts'],
+        rendered_at=datetime.fromisoformat(metadata['created_at']),
+    )
+    return metadata, dashboard
+
+
+def stale_reason(metadata: dict, module, filters: dict, versions: dict):
+    """Why a snapshot can't be served for these filters, or None if it can"""
+    if metadata['filters'] != json.loads(json.dumps(filters, default=_json_value)):
+        return "filters differ from the snapshot's"
+    if metadata['view_fingerprint'] != view_fingerprint(module):
+        return "the view changed"
+    if datetime.fromisoformat(metadata['created_at']).astimezone().date() != date.today():
+        return "rendered on an earlier day"
+    if versions and metadata['source_versions'] != versions:
+        return "its source tables changed"
+    return None
+
+
+def load_snapshot(role: str, build, filters: dict = None, directory: str = None):
+    """The view's snapshot if it is current for these filters, else None"""
+    path = snapshot_path(role, directory)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    try:
+        metadata, dashboard = _read(path, mtime)
+    except Exception:
+        logger.warning("Unreadable snapshot %s; ignoring it", path, exc_info=True)
+        return None
+    module = inspect.getmodule(build)
+    filters = {**default_filters(build), **(filters or {})}
+    reason = stale_reason(metadata, module, filters, source_versions(module.__name__))
+    if reason is not None:
+        logger.info("Building %s live: %s", role, reason)
+        return None
+    return dashboard
+
+
+def snapshot_or_build(role: str, build, **filters) -> Dashboard:
+    """The view's content from its snapshot when current, else from live queries"""
+    dashboard = load_snapshot(role, build, filters)
+    if dashboard is None:
+        return build(**filters)
+    # Served without calling its loaders, so record the access here
+    from audit_log import record_access
+    tables = _view_tables(inspect.getmodule(build).__name__)
+    record_access(f"snapshot:{role}", filters, sum(dashboard.row_counts.values()), tables)
+    return dashboard
+
+
+def render_snapshot_badge(dashboard: Dashboard):
+    """Caption for a view served from its pre-rendered snapshot"""
+    import streamlit as st
+    from freshness import format_age
+
+    if dashboard.rendered_at is not None:
+        st.caption(f"📸 Pre-rendered {format_age(datetime.now(timezone.utc) - dashboard.rendered_at)} "
+                   f"after the nightly load")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", nargs="+", choices=list(SNAPSHOT_VIEWS), default=list(SNAPSHOT_VIEWS))
+    parser.add_argument("--dir", help="Snapshot directory (default HOSPITAL_DEMO_SNAPSHOT_DIR or .cache/snapshots)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    failed = 0
+    for role in args.roles:
+        path = write_snapshot(role, directory=args.dir)
+        if path is None:
+            failed += 1
+        else:
+            logger.info("Wrote the %s snapshot to %s", role, path)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -223,7 +223,11 @@ CREATE OR REPLACE TABLE HOSPITAL_DEMO.ANALYTICS.AUDIT_LOG (
     table_accessed STRING,
     access_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP(),
     session_id STRING,
-    client_ip STRING
+    client_ip STRING,
+    -- Written in batches by the dashboard (audit_log.py)
+    dataset STRING,
+    filters STRING,
+    rows_returned INTEGER
 );
 
 -- Create stored procedure for audit logging
@@ -256,6 +260,8 @@ CREATE OR REPLACE TABLE HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RULES (
     rule_type STRING,
     rule_description STRING,
     rule_query STRING,
+    -- JSON parameters of the rule types compiled by quality_rules.py
+    rule_params STRING,
     is_active BOOLEAN DEFAULT TRUE,
     created_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
 );
@@ -270,6 +276,30 @@ INSERT INTO HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RULES
 ('FACT_ADMISSIONS', 'length_of_stay_days', 'RANGE', 'Length of stay must be reasonable', 
  'SELECT COUNT(*) FROM FACT_ADMISSIONS WHERE length_of_stay_days < 0 OR length_of_stay_days > 365');
 
+-- Raw-layer rules, evaluated per load batch by quality_rules.py into DATA_QUALITY_RESULTS
+INSERT INTO HOSPITAL_DEMO.ANALYTICS.DATA_QUALITY_RULES
+(table_name, column_name, rule_type, rule_description, rule_params) VALUES
+('PATIENT_DEMOGRAPHICS_RAW', 'patient_id', 'NOT_NULL', 'Every patient has an ID', '{}'),
+('PATIENT_DEMOGRAPHICS_RAW', 'patient_id', 'REGEX', 'Patient IDs look like PAT000001', '{"pattern": "PAT[0-9]{6}"}'),
+('PATIENT_DEMOGRAPHICS_RAW', 'date_of_birth', 'RANGE', 'Dates of birth are plausible', '{"min": "1900-01-01"}'),
+('PATIENT_ADMISSIONS_RAW', 'patient_id', 'REFERENTIAL', 'Admitted patients are registered',
+ '{"table": "PATIENT_DEMOGRAPHICS_RAW", "column": "patient_id"}'),
+('PATIENT_ADMISSIONS_RAW', 'department_id', 'REFERENTIAL', 'Admissions are to a known department',
+ '{"table": "HOSPITAL_DEPARTMENTS_RAW", "column": "department_id"}'),
+('PATIENT_ADMISSIONS_RAW', 'total_charges', 'RANGE', 'Total charges are between 0 and 1,000,000',
+ '{"min": 0, "max": 1000000}'),
+('PATIENT_ADMISSIONS_RAW', 'admission_date', 'FRESHNESS', 'Admissions were loaded in the last week',
+ '{"max_age_days": 7}'),
+('MEDICAL_PROCEDURES_RAW', 'admission_id', 'REFERENTIAL', 'Procedures belong to an admission',
+ '{"table": "PATIENT_ADMISSIONS_RAW", "column": "admission_id"}'),
+('MEDICATION_ORDERS_RAW', 'admission_id', 'NOT_NULL', 'Medication orders belong to an admission', '{}'),
+('MEDICATION_ORDERS_RAW', 'quantity_ordered', 'RANGE', 'Ordered quantities are between 1 and 10,000',
+ '{"min": 1, "max": 10000}'),
+('ALLIED_HEALTH_SERVICES_RAW', 'service_cost', 'RANGE', 'Service costs are between 0 and 100,000',
+ '{"min": 0, "max": 100000}'),
+('BED_INVENTORY_RAW', 'department_id', 'REFERENTIAL', 'Beds belong to a known department',
+ '{"table": "HOSPITAL_DEPARTMENTS_RAW", "column": "department_id"}');
+
 -- 9. Demonstrate Access Control Testing
 -- Test different role permissions
 USE ROLE PHYSICIAN;
@@ -3,6 +3,14 @@
 2. In Snowsight goto Projects > Streamlit
 3. Create new Streamlit app in Hospital_Snowflake_Demo database
 4. Copy the code from hospital_analytics_app.py into the Streamlit app
+   and add the supporting modules it imports (loaders.py, app_session.py,
+   paginated_table.py, alerts.py, capacity_scenarios.py, forecasting.py,
+   data_profiler.py, freshness.py, approx_query.py,
+   swr_cache.py, disk_cache.py, cache_warmer.py,
+   aggregate_cache.py, olap_cube.py, bed_board.py, query_guard.py,
+   session_pool.py, warehouse_router.py, plan_guard.py, snapshots.py,
+   record_counts.py, audit_log.py, quality_rules.py) and the views/ folder alongside it (the role views are
+   imported on demand)
 5. Add Pandas and Plotly libraries to the packages
 6. Run the Streamlit app
  */
\ No newline at end of file
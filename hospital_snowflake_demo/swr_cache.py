@@ -0,0 +1,142 @@
+"""
+Stale-while-revalidate caching for slow dashboard datasets
+
+A loader wrapped with ``stale_while_revalidate`` keeps its results for the
+process, shared by all sessions like ``st.cache_data``. Once a result is
+older than its TTL, it is still served straight away (flagged as
+refreshing) while a background thread re-runs the loader; reruns after the
+refresh finishes get the new version. A result older than TTL plus the
+dataset's maximum staleness is not served: the caller blocks on the
+reload, as with a plain cache miss.
+
+A refresh that fails (an exception, or a loader's empty error frame where
+there was data before) keeps the previous result, so the dashboard does not
+go blank because of a transient warehouse error.
+"""
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Optional
+
+import pandas as pd
+import streamlit as st
+
+from freshness import format_age
+
+logger = logging.getLogger(__name__)
+
+REFRESH_WORKERS = 2
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="swr-refresh")
+
+
+@dataclass
+class CacheEntry:
+    """A cached result and its pending background refresh"""
+    value: Any
+    loaded_at: float
+    refresh: Any = None
+    expired: bool = False
+
+    @property
+    def refreshing(self) -> bool:
+        return self.refresh is not None and not self.refresh.done()
+
+
+def _copy(value):
+    # Views add columns to the frames they get; keep the shared copy pristine
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+def _failed(value, previous) -> bool:
+    return isinstance(value, pd.DataFrame) and value.empty and not (
+        isinstance(previous, pd.DataFrame) and previous.empty
+    )
+
+
+def stale_while_revalidate(ttl: timedelta, max_stale: timedelta, clock=time.monotonic):
+    """Cache a loader, serving expired results while they are refreshed in the background"""
+    def decorator(func):
+        entries = {}
+        lock = threading.Lock()
+
+        def key_for(args, kwargs):
+            return args + tuple(sorted(kwargs.items()))
+
+        def reload(key, args, kwargs, previous=None):
+            try:
+                value = func(*args, **kwargs)
+            except Exception:
+                if previous is None:
+                    raise
+                logger.exception("Background refresh of %s failed; keeping the previous result", func.__name__)
+                return
+            if previous is not None and _failed(value, previous.value):
+                logger.warning("Background refresh of %s returned no data; keeping the previous result",
+                               func.__name__)
+                return
+            with lock:
+                entries[key] = CacheEntry(value, clock())
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = key_for(args, kwargs)
+            with lock:
+                entry = entries.get(key)
+                age = clock() - entry.loaded_at if entry else None
+                if entry and not entry.expired and age <= ttl.total_seconds():
+                    return _copy(entry.value)
+                if entry and age <= (ttl + max_stale).total_seconds():
+                    if not entry.refreshing:
+                        # The refresh runs under the caller's context (e.g. its query timeout)
+                        entry.refresh = _refresh_pool.submit(contextvars.copy_context().run,
+                                                             reload, key, args, kwargs, entry)
+                    return _copy(entry.value)
+            return _copy(reload(key, args, kwargs))
+
+        def status(*args, **kwargs) -> Optional[dict]:
+            """Age of the cached result and whether it is being refreshed (None if not cached)"""
+            with lock:
+                entry = entries.get(key_for(args, kwargs))
+                if entry is None:
+                    return None
+                return {'age': timedelta(seconds=clock() - entry.loaded_at), 'refreshing': entry.refreshing}
+
+        def wait(*args, **kwargs):
+            """Block until a pending background refresh has finished"""
+            with lock:
+                entry = entries.get(key_for(args, kwargs))
+            if entry is not None and entry.refresh is not None:
+                entry.refresh.result()
+
+        def clear(*args, **kwargs):
+            """Expire every cached result so the next call revalidates it, or drop the one for these arguments"""
+            with lock:
+                if args or kwargs:
+                    entries.pop(key_for(args, kwargs), None)
+                    return
+                for entry in entries.values():
+                    entry.expired = True
+
+        wrapper.status = status
+        wrapper.wait = wait
+        wrapper.clear = clear
+        wrapper.ttl = ttl
+        wrapper.max_stale = max_stale
+        return wrapper
+    return decorator
+
+
+def render_refresh_badge(*loaders):
+    """Show a badge when any of the given loaders is serving a result that is being refreshed"""
+    refreshing = [s for s in (loader.status() for loader in loaders) if s and s['refreshing']]
+    if refreshing:
+        oldest = max(s['age'] for s in refreshing)
+        st.caption(f"🔄 Refreshing in the background · showing data loaded {format_age(oldest)} "
+                   f"(rerun to pick up the new version)")
@@ -0,0 +1,73 @@
+"""Tests for the aggregate-aware admission trend cache"""
+
+import numpy as np
+import pandas as pd
+
+from aggregate_cache import AggregateCache, rollup
+
+
+def facts(days=60):
+    dates = pd.date_range(end='2024-12-15', periods=days, freq='D')
+    rows = [
+        {'ADMISSION_DATE': day, 'DEPARTMENT_NAME': dept, 'ADMISSIONS': 2 + i % 3, 'EMERGENCY_ADMISSIONS': i % 2,
+         'TOTAL_CHARGES': 1000.0 * (i + 1), 'CHARGED_ADMISSIONS': 2 + i % 3, 'LOS_DAYS': 3 * (i % 4),
+         'LOS_ADMISSIONS': 2 + i % 3, 'AS_OF': pd.Timestamp('2024-12-15')}
+        for i, day in enumerate(dates) for dept in ('Cardiology', 'Emergency', 'Oncology')[:1 + i % 3]
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_rollup_matches_direct_aggregation():
+    df = facts()
+    monthly = rollup(df, 'month')
+    direct = df.groupby(df['ADMISSION_DATE'].dt.to_period('M').dt.start_time)
+    assert monthly['ADMISSIONS'].tolist() == direct['ADMISSIONS'].sum().sort_index(ascending=False).tolist()
+    expected = (direct['TOTAL_CHARGES'].sum() / direct['CHARGED_ADMISSIONS'].sum()).sort_index(ascending=False)
+    assert monthly['AVG_CHARGES'].tolist() == expected.tolist()
+
+    weekly = rollup(df, 'week', by_department=True)
+    assert weekly['ADMISSIONS'].sum() == df['ADMISSIONS'].sum()
+    assert (weekly['DEPARTMENTS_ACTIVE'] == 1).all()
+    assert rollup(df)['DEPARTMENTS_ACTIVE'].max() == 3
+
+
+def test_shorter_windows_and_subsets_are_answered_locally():
+    fetches = []
+    cache = AggregateCache(lambda days: fetches.append(days) or facts(days), min_days=60,
+                           today=lambda: '2024-12-15')
+    cache.rollup(30)
+    cache.rollup(7)
+    cache.rollup(60, 'month')
+    subset = cache.rollup(14, departments=['Cardiology'])
+    assert fetches == [60]
+    assert cache.stats() == {'requests': 4, 'local_hits': 3, 'warehouse_queries': 1, 'local_rate': 0.75}
+    assert len(cache.rollup(7)) == 8  # CURRENT_DATE - 7 inclusive, as in SQL
+    assert subset['ADMISSIONS'].sum() == facts().query(
+        "DEPARTMENT_NAME == 'Cardiology' and ADMISSION_DATE >= '2024-12-01'")['ADMISSIONS'].sum()
+
+
+def test_wider_windows_new_days_and_invalidation_refetch():
+    fetches, today = [], ['2024-12-15']
+    cache = AggregateCache(lambda days: fetches.append(days) or facts(days), min_days=30,
+                           today=lambda: today[0])
+    cache.rollup(7)
+    cache.rollup(90)
+    cache.rollup(30)
+    today[0] = '2024-12-16'
+    cache.rollup(30)
+    cache.invalidate()
+    cache.rollup(30)
+    assert fetches == [30, 90, 30, 30]
+
+
+def test_slices_by_admission_type_and_weather():
+    df = facts(14).assign(ADMISSION_TYPE=lambda f: np.where(f['EMERGENCY_ADMISSIONS'] > 0, 'Emergency', 'Elective'))
+    weather = pd.DataFrame({'WEATHER_DATE': pd.date_range(end='2024-12-15', periods=14, freq='D'),
+                            'AVG_TEMPERATURE_C': [8.0] * 7 + [20.0] * 7, 'PRECIPITATION_MM': [0.0] * 13 + [5.0]})
+    cache = AggregateCache(lambda days: df, min_days=14, today=lambda: '2024-12-15', weather=lambda: weather)
+    assert cache.labels('WEATHER') == ['Cold', 'Mild', 'Wet']
+
+    cold = cache.rollup(14, grain=None, where={'WEATHER': ['Cold'], 'ADMISSION_TYPE': ['Emergency']})
+    expected = df[(df['ADMISSION_DATE'] < '2024-12-09') & (df['ADMISSION_TYPE'] == 'Emergency')]
+    assert cold['ADMISSIONS'].tolist() == [expected['ADMISSIONS'].sum()]
+    assert cache.stats()['warehouse_queries'] == 1
@@ -0,0 +1,43 @@
+"""Tests for the vectorized alert engine"""
+
+import pandas as pd
+
+from alerts import CAPACITY_ALERT_RULES, PROVIDER_ALERT_RULES, evaluate_rules, recommendation_priority
+
+
+def capacity_frame():
+    return pd.DataFrame({
+        'DEPARTMENT_NAME': ['ICU', 'Cardiology', 'Surgery', 'Oncology', 'Pediatrics'],
+        'UTILIZATION_PERCENTAGE': [95.0, 85.5, 70.0, 50.0, 20.0],
+        'RECOMMENDED_BED_CHANGE': [4, 2, 0, 0, -1],
+    })
+
+
+def test_capacity_rules_match_recommendation_thresholds():
+    alerts = evaluate_rules(capacity_frame(), CAPACITY_ALERT_RULES).set_index('RULE')
+    assert alerts.loc['capacity_increase', 'COUNT'] == 1
+    assert alerts.loc['capacity_increase', 'ITEMS'] == ["- **ICU**: Add 4 beds (Current: 95.0% utilization)"]
+    assert alerts.loc['capacity_watch', 'COUNT'] == 1
+    assert alerts.loc['capacity_underutilized', 'ITEMS'][0].startswith("- **Pediatrics**")
+
+
+def test_recommendation_priority():
+    assert recommendation_priority(capacity_frame()).tolist() == [
+        '🔴 High Priority', '🟡 Medium Priority', '🟢 Optimal', '🟠 Review Required', '🟢 Optimal']
+
+
+def test_rules_limit_items_and_skip_untriggered():
+    providers = pd.DataFrame({
+        'PROVIDER_NAME': [f"Provider {i}" for i in range(5)],
+        'PROVIDER_CREDENTIALS': ['PT'] * 5,
+        'PROVIDER_SUCCESS_RATE': [50.0, 60.0, 65.0, 69.9, 90.0],
+        'SERVICES_PER_DAY': [1, 2, 3, 4, 5],
+    })
+    alerts = evaluate_rules(providers, PROVIDER_ALERT_RULES)
+    assert alerts['RULE'].tolist() == ['provider_low_success']
+    assert alerts['COUNT'].iloc[0] == 4
+    assert len(alerts['ITEMS'].iloc[0]) == 3
+
+
+def test_empty_frame_has_no_alerts():
+    assert evaluate_rules(pd.DataFrame(), CAPACITY_ALERT_RULES).empty
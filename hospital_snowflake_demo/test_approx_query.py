@@ -0,0 +1,60 @@
+"""Tests for approximate query mode"""
+
+import pandas as pd
+import pytest
+
+from approx_query import ApproxSpec, approximate_sql, relative_error, sample_percent, scale_estimates
+from local_backend import translate_sql
+
+QUERY = """
+SELECT d.department_name, COUNT(DISTINCT a.admission_id) as admissions, MEDIAN(a.total_charges) as median_charges
+FROM HOSPITAL_DEMO.RAW_DATA.HOSPITAL_DEPARTMENTS_RAW d
+LEFT JOIN HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW a ON d.department_id = a.department_id
+GROUP BY d.department_name
+"""
+
+
+def test_approximate_sql_rewrites_aggregates_and_samples_table():
+    query = approximate_sql(QUERY, 'PATIENT_ADMISSIONS_RAW', 5)
+    assert "APPROX_COUNT_DISTINCT(a.admission_id)" in query
+    assert "APPROX_PERCENTILE(a.total_charges, 0.5)" in query
+    assert "PATIENT_ADMISSIONS_RAW a SAMPLE BERNOULLI (5) ON" in query
+    assert "HOSPITAL_DEPARTMENTS_RAW d\n" in query
+
+
+def test_approximate_sql_samples_unaliased_table():
+    query = approximate_sql("SELECT COUNT(*) FROM HOSPITAL_DEMO.RAW_DATA.ALLIED_HEALTH_SERVICES_RAW\nGROUP BY 1",
+                            'ALLIED_HEALTH_SERVICES_RAW', 12.5)
+    assert "ALLIED_HEALTH_SERVICES_RAW SAMPLE BERNOULLI (12.5)\nGROUP BY" in query
+
+
+def test_local_translation_of_sampling():
+    query = translate_sql(approximate_sql(QUERY, 'PATIENT_ADMISSIONS_RAW', 5))
+    assert "TABLESAMPLE bernoulli(5%)" in query
+    assert "approx_quantile(a.total_charges, 0.5)" in query
+
+
+def test_sample_percent_only_for_large_tables():
+    assert sample_percent(10_000) is None
+    assert sample_percent(None) is None
+    assert sample_percent(10_000_000) == 5.0
+
+
+def test_scale_estimates_scales_counts_and_adds_intervals():
+    spec = ApproxSpec(sample_table='T', count_columns=('SERVICES',), sum_columns=('REVENUE',),
+                      distinct_columns=('PATIENTS',))
+    df = pd.DataFrame({'SERVICES': [100], 'REVENUE': [2000.0], 'PATIENTS': [50], 'AVG_COST': [20.0]})
+    scaled = scale_estimates(df, spec, sample_pct=10).iloc[0]
+    assert scaled['SERVICES'] == 1000
+    assert scaled['REVENUE'] == 20000
+    assert scaled['PATIENTS'] == 50
+    assert scaled['AVG_COST'] == 20
+    assert scaled['SERVICES_CI'] == pytest.approx(1.96 * (100 * 0.9) ** 0.5 / 0.1)
+    assert scaled['PATIENTS_CI'] == pytest.approx(1.96 * 0.0162 * 50)
+    assert 'REVENUE_CI' not in scaled
+
+
+def test_relative_error_is_worst_row():
+    exact = pd.DataFrame({'K': ['a', 'b'], 'N': [100, 200]})
+    approximate = pd.DataFrame({'K': ['a', 'b'], 'N': [101, 180]})
+    assert relative_error(exact, approximate, ['K'], ['N'])['N'] == pytest.approx(0.1)
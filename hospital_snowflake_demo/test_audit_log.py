@@ -0,0 +1,95 @@
+"""Tests for the batched audit log writer"""
+
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+import audit_log
+from audit_log import AuditWriter, audited, insert_sql
+from freshness import reads
+
+
+def event(n):
+    return {'dataset': f'get_{n}', 'rows_returned': n}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_full_batch_is_written_without_waiting_for_the_interval():
+    batches = []
+    writer = AuditWriter(batches.append, batch_size=3, flush_interval=timedelta(hours=1))
+    writer.start()
+    for n in range(4):
+        writer.submit(event(n))
+    assert wait_for(lambda: writer.written == 3)
+    assert [e['dataset'] for e in batches[0]] == ['get_0', 'get_1', 'get_2']
+    assert writer.pending == 1
+    writer.close()
+    assert writer.written == 4 and len(batches) == 2
+
+
+def test_failed_flush_keeps_events_within_the_bound():
+    def unavailable(batch):
+        raise ConnectionError("warehouse unavailable")
+
+    writer = AuditWriter(unavailable, batch_size=2, max_buffered=5)
+    for n in range(8):
+        writer.submit(event(n))
+    assert writer.flush() == 0
+    assert writer.pending == 5 and writer.dropped == 3
+    assert writer.recent()['Error'].iloc[0] == 'ConnectionError'
+
+
+def test_unwritten_events_are_spilled_at_close_and_requeued(tmp_path):
+    spill = str(tmp_path / 'audit_spill.jsonl')
+
+    def unavailable(batch):
+        raise ConnectionError("warehouse unavailable")
+
+    writer = AuditWriter(unavailable, spill_path=spill)
+    writer.start()
+    writer.submit(event(1))
+    writer.submit(event(2))
+    writer.close()
+    assert writer.pending == 0
+
+    batches = []
+    restarted = AuditWriter(batches.append, spill_path=spill)
+    restarted.start()
+    restarted.close()
+    assert [e['dataset'] for batch in batches for e in batch] == ['get_1', 'get_2']
+
+
+def test_audited_loader_records_page_calls(monkeypatch):
+    writer = AuditWriter(None)
+    monkeypatch.setattr(audit_log, 'get_audit_writer', lambda: writer)
+
+    @reads('HOSPITAL_DEPARTMENTS_RAW')
+    def get_departments(department_id=None, limit=10):
+        return pd.DataFrame({'ID': range(3)})
+
+    loader = audited(get_departments)
+    monkeypatch.setattr(audit_log, '_page_session_id', lambda: None)
+    assert len(loader(7)) == 3
+    assert writer.pending == 0  # off a page: not recorded
+
+    monkeypatch.setattr(audit_log, '_page_session_id', lambda: 'session-1')
+    loader(7, limit=5)
+    recorded = writer._buffer[0]
+    assert recorded['dataset'] == 'get_departments'
+    assert recorded['filters'] == '{"department_id": 7, "limit": 5}'
+    assert recorded['rows_returned'] == 3
+    assert recorded['table_accessed'] == 'HOSPITAL_DEPARTMENTS_RAW'
+    assert recorded['session_id'] == 'session-1'
+
+
+def test_insert_binds_every_column_per_event():
+    sql = insert_sql(2)
+    assert sql.count('?') == 2 * len(audit_log.AUDIT_COLUMNS)
+    assert sql.startswith(f"INSERT INTO {audit_log.AUDIT_TABLE} (access_timestamp, ")
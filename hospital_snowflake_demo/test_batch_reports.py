@@ -0,0 +1,60 @@
+"""Tests for headless batch report generation"""
+
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+
+from batch_reports import BASE_LOADERS, build_department, generate
+
+
+def fake_loaders(calls):
+    departments = ['Cardiology', 'Oncology']
+    frames = {
+        'get_department_performance_summary': pd.DataFrame({
+            'DEPARTMENT_NAME': departments, 'ADMISSIONS': [120, 80], 'ADMISSION_REVENUE': [1e6, 5e5],
+            'PROCEDURE_REVENUE': [2e5, None], 'MEDICATION_REVENUE': [1e5, 1e5], 'ALLIED_REVENUE': [5e4, 2e4],
+            'TOTAL_DEPARTMENT_REVENUE': [1.35e6, 6.2e5], 'AVG_LENGTH_OF_STAY': [3.2, 5.1],
+            'EMERGENCY_RATE': [40.0, 10.0]}),
+        'get_daily_department_admissions': pd.DataFrame({
+            'DEPARTMENT_NAME': ['Cardiology'] * 14,
+            'ADMISSION_DATE': pd.date_range('2024-12-01', periods=14), 'ADMISSIONS': [1] * 7 + [2] * 7}),
+        'get_admission_forecasts': pd.DataFrame(columns=['DEPARTMENT_NAME', 'FORECAST_DATE', 'ADMISSIONS_FORECAST']),
+        'get_bed_capacity_analysis': pd.DataFrame({'DEPARTMENT_NAME': ['Cardiology'], 'AVG_UTILIZATION_RATE': [82.5]}),
+        'get_bed_turnover_analysis': pd.DataFrame(columns=['DEPARTMENT_NAME', 'BED_TYPE', 'ANNUAL_TURNOVER_RATE',
+                                                           'TURNOVER_CATEGORY']),
+        'get_capacity_recommendations': pd.DataFrame({'DEPARTMENT_NAME': ['Oncology'],
+                                                      'RECOMMENDED_BED_CHANGE': [2]}),
+        'get_allied_health_department_integration': pd.DataFrame({
+            'DEPARTMENT_NAME': departments, 'SERVICE_TYPE': ['PT', 'OT'], 'SERVICES_PROVIDED': [30, 12]}),
+    }
+
+    def loader(name):
+        def load():
+            calls.append(name)
+            return frames[name]
+        return load
+    return SimpleNamespace(**{name: loader(name) for name in frames})
+
+
+def test_department_dashboard_is_sliced_from_base_data():
+    base = {name: load() for name, load in vars(fake_loaders([])).items()}
+    dashboard = build_department('Cardiology', base)
+    assert dashboard.kpis['admissions_last_7_days'] == 14
+    assert dashboard.kpis['admissions_prior_7_days'] == 7
+    assert dashboard.kpis['bed_utilization'] == 82.5
+    assert dashboard.kpis['recommended_bed_change'] is None
+    assert set(dashboard.figures) == {'admissions', 'revenue_mix', 'allied_services'}
+    assert dashboard.tables['allied_health_department_integration']['SERVICE_TYPE'].tolist() == ['PT']
+
+
+def test_generate_loads_base_data_once_for_every_report(tmp_path):
+    calls = []
+    results = generate(str(tmp_path), roles=[], workers=2, loader_module=fake_loaders(calls))
+    assert sorted(calls) == sorted(BASE_LOADERS)
+    assert sorted(name for _, name, _, _ in results) == ['Cardiology', 'Oncology']
+    report = tmp_path / 'departments' / 'oncology'
+    assert 'Oncology Weekly Report' in (report / 'report.html').read_text()
+    assert pd.read_csv(report / 'appendix' / 'capacity_recommendations.csv')['RECOMMENDED_BED_CHANGE'].tolist() == [2]
+    assert 'departments/cardiology/report.html' in (tmp_path / 'index.html').read_text()
+    assert os.path.exists(report / 'appendix' / 'daily_department_admissions.csv')
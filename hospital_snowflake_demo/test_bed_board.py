@@ -0,0 +1,108 @@
+"""Tests for the delta-refreshed live bed board"""
+
+import inspect
+
+import pandas as pd
+import pytest
+
+from bed_board import BedBoard, department_counts
+
+
+def snapshot():
+    return pd.DataFrame({
+        'BED_ID': ['B1', 'B2', 'B3', 'B4'],
+        'DEPARTMENT_NAME': ['Cardiology', 'Cardiology', 'Oncology', 'Oncology'],
+        'BED_TYPE': ['ICU', 'Standard', 'Standard', 'Private'],
+        'STATUS_DATE': pd.to_datetime(['2024-12-14', '2024-12-14', '2024-12-14', None]),
+        'LAST_UPDATED': pd.to_datetime(['2024-12-14 08:00', '2024-12-14 09:00', '2024-12-14 10:00', None]),
+        'CURRENT_STATUS': ['Occupied', 'Available', 'Cleaning', None],
+        'WATERMARK': pd.Timestamp('2024-12-14 10:00'),
+    })
+
+
+def changes(*rows):
+    return pd.DataFrame(rows, columns=['BED_ID', 'STATUS_DATE', 'STATUS', 'LAST_UPDATED', 'LOAD_TIMESTAMP']).assign(
+        STATUS_DATE=lambda df: pd.to_datetime(df['STATUS_DATE']),
+        LAST_UPDATED=lambda df: pd.to_datetime(df['LAST_UPDATED']),
+        LOAD_TIMESTAMP=lambda df: pd.to_datetime(df['LOAD_TIMESTAMP']))
+
+
+def test_snapshot_counts_match_bed_utilization_columns():
+    board = BedBoard(snapshot, lambda since: changes())
+    board.refresh()
+    util = board.utilization().set_index('DEPARTMENT_NAME')
+    assert util.loc['Cardiology', ['TOTAL_BEDS', 'OCCUPIED_BEDS', 'AVAILABLE_BEDS']].tolist() == [2, 1, 1]
+    assert util.loc['Oncology', ['TOTAL_BEDS', 'MAINTENANCE_BEDS', 'UTILIZATION_RATE']].tolist() == [2, 1, 0.0]
+    assert board.watermark == pd.Timestamp('2024-12-14 10:00')
+
+
+def test_deltas_update_only_changed_departments():
+    requested = []
+    delta = changes(
+        ('B3', '2024-12-14', 'Cleaning', '2024-12-14 10:00', '2024-12-14 10:00'),  # re-read at the watermark: no change
+        ('B1', '2024-12-15', 'Available', '2024-12-15 07:00', '2024-12-15 07:05'),
+        ('B1', '2024-12-13', 'Occupied', '2024-12-15 07:30', '2024-12-15 07:35'),  # older status date loses
+        ('B4', '2024-12-15', 'Occupied', '2024-12-15 07:10', '2024-12-15 07:15'),
+        ('B9', '2024-12-15', 'Occupied', '2024-12-15 07:20', '2024-12-15 07:25'),  # inactive bed
+    )
+    board = BedBoard(snapshot, lambda since: requested.append(since) or delta)
+    board.refresh()
+    assert board.refresh(force=True) == {'Cardiology', 'Oncology'}
+    assert requested == [pd.Timestamp('2024-12-14 10:00')]
+    assert board.watermark == pd.Timestamp('2024-12-15 07:35')
+    assert board.state.loc['B1', 'CURRENT_STATUS'] == 'Available'
+    expected = department_counts(board.state.reset_index()).reset_index()
+    pd.testing.assert_frame_equal(board.utilization().sort_values('DEPARTMENT_NAME', ignore_index=True),
+                                  expected.sort_values('DEPARTMENT_NAME', ignore_index=True), check_like=True)
+
+    assert board.refresh(force=True) == set()
+
+
+def test_refresh_is_throttled_and_invalidate_resnapshots():
+    now, snapshots, deltas = [0.0], [], []
+    board = BedBoard(lambda: snapshots.append(1) or snapshot(), lambda since: deltas.append(since) or changes(),
+                     clock=lambda: now[0])
+    board.refresh()
+    now[0] = 10.0
+    board.refresh()
+    now[0] = 31.0
+    board.refresh()
+    assert (len(snapshots), len(deltas)) == (1, 1)
+    board.invalidate()
+    board.refresh()
+    assert len(snapshots) == 2
+
+
+def test_watermark_follows_load_time_not_source_timestamps():
+    # A later load whose rows were last updated before the current watermark
+    late = changes(('B2', '2024-12-15', 'Occupied', '2024-12-14 06:00', '2024-12-15 12:00'))
+    board = BedBoard(snapshot, lambda since: late if since < pd.Timestamp('2024-12-15 12:00') else changes())
+    board.refresh()
+    assert board.refresh(force=True) == {'Cardiology'}
+    assert board.state.loc['B2', 'CURRENT_STATUS'] == 'Occupied'
+    assert board.watermark == pd.Timestamp('2024-12-15 12:00')
+
+
+def test_refresh_without_a_new_load_fetches_no_rows(monkeypatch):
+    pytest.importorskip("duckdb")
+    import loaders
+    from local_backend import LocalSession
+
+    session = LocalSession.from_data_dir(as_of='2024-12-15')
+    monkeypatch.setattr(loaders, 'get_session', lambda: session)
+    insert = ("INSERT INTO HOSPITAL_DEMO.RAW_DATA.BED_AVAILABILITY_RAW "
+              "(availability_id, bed_id, date, status, last_updated, load_timestamp) ")
+    # One load: a row for every bed, all stamped with the load's time
+    session.sql(insert + "SELECT 'A' || bed_id, bed_id, DATE '2024-12-15', 'Available', TIMESTAMP '2024-12-15 06:00', "
+                "TIMESTAMP '2024-12-15 07:00' FROM HOSPITAL_DEMO.RAW_DATA.BED_INVENTORY_RAW").collect()
+
+    board = BedBoard(inspect.unwrap(loaders.get_bed_states), inspect.unwrap(loaders.get_bed_changes))
+    board.refresh()
+    assert len(board.state) > 100
+    board.refresh(force=True)
+    assert board.last_delta_rows == 0
+
+    session.sql(insert + "VALUES ('A1', 'BED00001', DATE '2024-12-16', 'Occupied', TIMESTAMP '2024-12-16 08:00', "
+                "TIMESTAMP '2024-12-16 09:00')").collect()
+    board.refresh(force=True)
+    assert board.last_delta_rows == 1 and board.state.loc['BED00001', 'CURRENT_STATUS'] == 'Occupied'
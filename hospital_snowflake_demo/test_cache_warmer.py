@@ -0,0 +1,80 @@
+"""Tests for the peak-hour cache warmer"""
+
+import threading
+import time
+import types
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from cache_warmer import CacheWarmer, WarmTask, build_warm_plan, next_warm_time
+from freshness import reads
+
+
+def test_next_warm_time_leads_peak_windows():
+    lead = timedelta(minutes=10)
+    assert next_warm_time(datetime(2024, 12, 15, 6, 0), lead=lead) == datetime(2024, 12, 15, 6, 50)
+    assert next_warm_time(datetime(2024, 12, 15, 6, 55), lead=lead) == datetime(2024, 12, 15, 18, 50)
+    assert next_warm_time(datetime(2024, 12, 15, 20, 0), lead=lead) == datetime(2024, 12, 16, 6, 50)
+
+
+def test_plan_is_derived_from_role_views():
+    plan = {task.describe(): task.roles for task in build_warm_plan()}
+    assert plan['get_admission_trends(days=30)'] == ('Physician',)
+    assert plan['get_department_summary(approximate=False)'] == ('Clinical Administrator',)
+    assert plan['get_admission_forecasts(horizon=14, use_weather=False)'] == ('Capacity Planner',)
+    assert set(plan['get_medication_analysis()']) == {'Physician', 'Nurse', 'Analyst'}
+
+
+def test_warm_runs_with_bounded_concurrency():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_loader(**kwargs):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    module = types.SimpleNamespace(get_a=slow_loader)
+    tasks = [WarmTask('get_a', (('days', n),)) for n in range(8)]
+    results = CacheWarmer(tasks, loader_module=module, workers=2).warm(reason='test')
+    assert peak[0] == 2
+    assert [r['task'] for r in results] == [f"get_a(days={n})" for n in range(8)]
+    assert all(r['ms'] >= 20 and r['error'] is None for r in results)
+
+
+def test_data_loads_are_detected_from_catalog_metadata():
+    def metadata(rows):
+        return pd.DataFrame({'OBJECT_NAME': ['PATIENT_ADMISSIONS_RAW', 'BED_INVENTORY_RAW'],
+                             'LAST_ALTERED': ['2024-12-15 06:00'] * 2, 'ROW_COUNT': [100, rows]})
+
+    @reads('BED_INVENTORY_RAW')
+    def get_beds():
+        return pd.DataFrame()
+
+    snapshots, probes_cleared = [metadata(10), metadata(10), metadata(12)], []
+    get_freshness_probe = lambda: pd.DataFrame()
+    get_freshness_probe.clear = lambda: probes_cleared.append(True)
+    module = types.SimpleNamespace(get_table_metadata=lambda: snapshots.pop(0), get_freshness_probe=get_freshness_probe,
+                                   get_beds=get_beds, refresh_stale_loaders=lambda: None)
+    warmer = CacheWarmer([WarmTask('get_beds')], loader_module=module)
+    assert warmer.tasks_for_changed_tables() == []
+    assert warmer.tasks_for_changed_tables() == []
+    assert probes_cleared == []
+    assert warmer.tasks_for_changed_tables() == [WarmTask('get_beds')]
+    assert probes_cleared == [True]
+
+
+def test_warmer_sleeps_between_scheduled_checks():
+    checks = []
+    module = types.SimpleNamespace(get_table_metadata=lambda: checks.append(True) or pd.DataFrame())
+    later = (datetime.now() + timedelta(hours=3)).strftime('%H:%M')
+    warmer = CacheWarmer([], loader_module=module, windows=(later,), load_checks=(later,))
+    thread = warmer.start()
+    time.sleep(0.2)
+    warmer.stop()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+    assert checks == [True]
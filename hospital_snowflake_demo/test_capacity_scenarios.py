@@ -0,0 +1,47 @@
+"""Tests for the queueing-theory capacity scenarios"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from capacity_scenarios import erlang_b_table, erlang_c, scenario_grid
+
+
+def test_erlang_b_known_value():
+    table = erlang_b_table(np.array([2.0]), 2)
+    assert table[2, 0] == pytest.approx(0.4)
+
+
+def test_erlang_c_known_value():
+    blocking = erlang_b_table(np.array([2.0]), 3)[3]
+    assert erlang_c(np.array([3]), np.array([2.0]), blocking)[0] == pytest.approx(4 / 9)
+
+
+def test_scenario_grid_covers_departments_and_changes():
+    demand = pd.DataFrame({
+        'DEPARTMENT_NAME': ['ICU', 'Cardiology'],
+        'CURRENT_BEDS': [3, 10],
+        'ARRIVALS_PER_DAY': [1.0, 2.0],
+        'AVG_LOS_DAYS': [2.0, 4.0],
+    })
+    grid = scenario_grid(demand, -5, 5)
+    icu = grid[grid['DEPARTMENT_NAME'] == 'ICU'].set_index('BED_CHANGE')
+    # Changes that leave no beds are dropped
+    assert icu.index.min() == -2
+    assert len(grid[grid['DEPARTMENT_NAME'] == 'Cardiology']) == 11
+    assert icu.loc[0, 'WAIT_PROBABILITY'] == pytest.approx(4 / 9)
+    assert icu.loc[0, 'EXPECTED_WAIT_HOURS'] == pytest.approx(4 / 9 / (3 * 0.5 - 1.0) * 24)
+    # Overloaded: two beds for two bed-days of demand per day
+    assert icu.loc[-1, 'WAIT_PROBABILITY'] == 1.0
+    assert np.isinf(icu.loc[-1, 'EXPECTED_WAIT_HOURS'])
+    # More beds never increases the chance of waiting
+    assert icu['WAIT_PROBABILITY'].is_monotonic_decreasing
+
+
+def test_department_without_demand_never_waits():
+    demand = pd.DataFrame({'DEPARTMENT_NAME': ['Dormant'], 'CURRENT_BEDS': [4],
+                           'ARRIVALS_PER_DAY': [0.0], 'AVG_LOS_DAYS': [0.0]})
+    grid = scenario_grid(demand, -2, 2)
+    assert len(grid) == 5
+    assert (grid['EXPECTED_WAIT_HOURS'] == 0).all()
+    assert (grid['WAIT_PROBABILITY'] == 0).all()
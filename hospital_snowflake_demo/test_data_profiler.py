@@ -0,0 +1,59 @@
+"""Tests for the sketch-based data-quality profiler"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_profiler import HyperLogLog, KLLSketch, TableProfile, merge_profiles
+
+
+def test_hyperloglog_estimates_and_merges():
+    rng = np.random.default_rng(1)
+    values = pd.Series(rng.integers(0, 50_000, 200_000))
+    first, second = TableProfile('T'), TableProfile('T')
+    first.update(pd.DataFrame({'ID': values[:100_000]}))
+    second.update(pd.DataFrame({'ID': values[100_000:]}))
+    first.merge(second)
+    estimate = first.columns['ID'].hll.estimate()
+    assert estimate == pytest.approx(values.nunique(), rel=0.05)
+
+
+def test_hyperloglog_small_cardinality():
+    sketch = HyperLogLog()
+    sketch.update(pd.util.hash_pandas_object(pd.Series(['a', 'b', 'c']), index=False).to_numpy())
+    assert round(sketch.estimate()) == 3
+
+
+def test_kll_quantiles_within_rank_error():
+    rng = np.random.default_rng(2)
+    values = rng.normal(100, 15, 100_000)
+    sketch = KLLSketch()
+    for chunk in np.array_split(values, 20):
+        part = KLLSketch()
+        part.update(chunk)
+        sketch.merge(part)
+    assert sketch.n == len(values)
+    for q in (0.5, 0.95):
+        rank = np.mean(values <= sketch.quantile(q))
+        assert rank == pytest.approx(q, abs=0.02)
+
+
+def test_profile_round_trip_nulls_and_violations():
+    batch = pd.DataFrame({
+        'TOTAL_CHARGES': [100.0, None, -5.0, 2_000_000.0],
+        'ADMISSION_DATE': pd.to_datetime(['2024-01-01', '2024-02-01', None, '2024-03-01']),
+        'SOURCE_FILE': ['a.csv'] * 4,
+    })
+    profile = TableProfile('PATIENT_ADMISSIONS_RAW')
+    profile.update(batch)
+    stored = pd.DataFrame({'TABLE_NAME': ['PATIENT_ADMISSIONS_RAW'] * 2,
+                           'PROFILE': [profile.to_json(), profile.to_json()]})
+    summary = merge_profiles(stored)['PATIENT_ADMISSIONS_RAW'].summary().set_index('COLUMN_NAME')
+
+    assert 'SOURCE_FILE' not in summary.index
+    charges = summary.loc['TOTAL_CHARGES']
+    assert charges['ROWS'] == 8
+    assert charges['NULL_PCT'] == pytest.approx(25.0)
+    assert charges['RANGE_VIOLATIONS'] == 4
+    assert (charges['MIN'], charges['MAX']) == (-5.0, 2_000_000.0)
+    assert summary.loc['ADMISSION_DATE', 'MAX'] == '2024-03-01'
@@ -0,0 +1,86 @@
+"""Tests for the persistent on-disk result cache"""
+
+import os
+import time
+
+import pandas as pd
+
+from disk_cache import DiskCache, persistent
+
+
+def frame(n=3):
+    return pd.DataFrame({'DEPARTMENT_NAME': [f'D{i}' for i in range(n)], 'ADMISSIONS': range(n),
+                         'MONTH': pd.date_range('2024-01-01', periods=n, freq='MS')})
+
+
+def test_round_trip_keeps_frame_and_metadata(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put('k', frame(), {'loader': 'get_x', 'source_versions': {'T': ['2024-12-15', 3]}})
+    df, metadata = cache.get('k')
+    pd.testing.assert_frame_equal(df, frame())
+    assert metadata['loader'] == 'get_x'
+    assert cache.get('missing') is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for key in ('a', 'b', 'c'):
+        cache.put(key, frame(200), {})
+        time.sleep(0.01)
+    cache.get('a')
+    cache.max_bytes = os.path.getsize(cache.path('a')) * 2 + 10
+    cache.put('d', frame(200), {})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('d') is not None
+
+
+def test_persistent_serves_from_disk_until_sources_change(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    versions = {'PATIENT_ADMISSIONS_RAW': ('2024-12-15 00:00:00', 100)}
+    calls = []
+
+    @persistent(lambda loader: versions, cache=cache)
+    def get_admissions(days=30):
+        calls.append(days)
+        return frame()
+
+    get_admissions()
+    get_admissions(days=30)
+    assert calls == [30]
+    get_admissions(days=7)
+    assert calls == [30, 7]
+
+    versions['PATIENT_ADMISSIONS_RAW'] = ('2024-12-16 00:00:00', 120)
+    get_admissions()
+    assert calls == [30, 7, 30]
+
+
+def test_persistent_skips_error_frames(tmp_path):
+    cache = DiskCache(str(tmp_path))
+
+    @persistent(lambda loader: {}, cache=cache)
+    def get_nothing():
+        return pd.DataFrame()
+
+    get_nothing()
+    assert cache.entries().empty
+
+
+def test_unwritable_cache_directory_skips_the_disk_tier(tmp_path, monkeypatch):
+    import disk_cache
+
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    monkeypatch.setenv('HOSPITAL_DEMO_CACHE_DIR', str(blocker / 'results'))
+    disk_cache.default_cache.cache_clear()
+    calls = []
+
+    @persistent(lambda loader: {})
+    def get_admissions(days=30):
+        calls.append(days)
+        return frame()
+
+    assert len(get_admissions()) == 3 and len(get_admissions()) == 3
+    assert calls == [30, 30]
+    disk_cache.default_cache.cache_clear()
@@ -0,0 +1,92 @@
+"""Tests for the admission and census forecasting engine"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting import ForecastModelStore
+
+
+def synthetic_history(days=364, start='2024-01-01'):
+    dates = pd.date_range(start, periods=days, freq='D')
+    # Busier Mondays, quieter weekends
+    weekly = np.array([8, 5, 5, 5, 5, 2, 2])[dates.dayofweek]
+    return pd.concat([
+        pd.DataFrame({'DEPARTMENT_NAME': name, 'ADMISSION_DATE': dates, 'ADMISSIONS': weekly * scale})
+        for name, scale in [('Cardiology', 1), ('Oncology', 2)]
+    ], ignore_index=True)
+
+
+DEMAND = pd.DataFrame({'DEPARTMENT_NAME': ['Cardiology', 'Oncology'], 'AVG_LOS_DAYS': [3.0, 5.0]})
+
+
+def test_forecast_recovers_day_of_week_pattern():
+    store = ForecastModelStore()
+    assert store.update(synthetic_history(), DEMAND, workers=1) == 2
+    forecast = store.forecast(7, DEMAND)
+    cardiology = forecast[forecast['DEPARTMENT_NAME'] == 'Cardiology'].set_index('FORECAST_DATE')
+    by_dow = cardiology['ADMISSIONS_FORECAST'].groupby(cardiology.index.dayofweek).mean()
+    assert by_dow[0] == pytest.approx(8, abs=0.2)
+    assert by_dow[6] == pytest.approx(2, abs=0.2)
+    # Steady state census is admissions / (1 - exp(-1 / LOS)) per day on average
+    assert cardiology['CENSUS_FORECAST'].mean() == pytest.approx(32 / 7 / (1 - np.exp(-1 / 3)), rel=0.15)
+
+
+def test_incremental_update_matches_full_fit():
+    history = synthetic_history()
+    full = ForecastModelStore()
+    full.update(history, DEMAND, workers=1)
+
+    incremental = ForecastModelStore()
+    cutoff = pd.Timestamp('2024-10-01')
+    incremental.update(history[history['ADMISSION_DATE'] < cutoff], DEMAND, workers=1)
+    # Overlapping days are skipped, only the new ones are folded in
+    assert incremental.update(history, DEMAND, workers=1) == 2
+    assert incremental.update(history, DEMAND, workers=1) == 0
+
+    pd.testing.assert_frame_equal(full.forecast(14, DEMAND), incremental.forecast(14, DEMAND))
+
+
+def test_forecasts_without_weather_data_ignore_the_weather_option(monkeypatch):
+    import inspect
+
+    import loaders
+
+    stores = {}
+    monkeypatch.setattr(loaders, 'get_daily_weather', lambda: pd.DataFrame())
+    monkeypatch.setattr(loaders, 'get_department_demand', lambda: DEMAND)
+    monkeypatch.setattr(loaders, 'get_daily_department_admissions', lambda since=None: synthetic_history())
+    monkeypatch.setattr(loaders, 'get_forecast_model_store',
+                        lambda use_weather=False: stores.setdefault(use_weather, ForecastModelStore(use_weather)))
+    forecast = inspect.unwrap(loaders.get_admission_forecasts)(7, use_weather=True)
+    assert list(stores) == [False]
+    assert len(forecast) == 14 and forecast['ADMISSIONS_FORECAST'].notna().all()
+
+
+def test_days_without_any_admissions_count_as_zero():
+    history = synthetic_history(days=28)
+    quiet = pd.Timestamp('2024-01-10')
+    store = ForecastModelStore()
+    store.update(history[history['ADMISSION_DATE'] != quiet], DEMAND, workers=1)
+    full = ForecastModelStore()
+    full.update(history.assign(ADMISSIONS=history['ADMISSIONS'].where(history['ADMISSION_DATE'] != quiet, 0)),
+                DEMAND, workers=1)
+    for name, state in store.states.items():
+        assert state.n_days == 28
+        np.testing.assert_allclose(state.xty, full.states[name].xty)
+
+
+def test_many_departments_are_fitted_on_threads_unless_processes_are_asked_for(monkeypatch):
+    import forecasting
+
+    def no_processes(*args, **kwargs):
+        raise AssertionError("the app process must not be forked")
+
+    monkeypatch.setattr(forecasting, 'ProcessPoolExecutor', no_processes)
+    history = pd.concat([synthetic_history().assign(DEPARTMENT_NAME=lambda df, n=n: df['DEPARTMENT_NAME'] + str(n))
+                         for n in range(4)], ignore_index=True)
+    demand = pd.DataFrame({'DEPARTMENT_NAME': sorted(history['DEPARTMENT_NAME'].unique()), 'AVG_LOS_DAYS': 3.0})
+    threaded, serial = ForecastModelStore(), ForecastModelStore()
+    assert threaded.update(history, demand) == 8
+    serial.update(history, demand, workers=1)
+    pd.testing.assert_frame_equal(threaded.forecast(7, demand), serial.forecast(7, demand))
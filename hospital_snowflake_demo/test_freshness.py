@@ -0,0 +1,80 @@
+"""Tests for the metadata-based freshness monitor"""
+
+import pandas as pd
+import pytest
+
+from freshness import (
+    build_metadata_query, build_probe_query, changed_tables, derived_from, format_age, loader_sources, reads,
+    source_freshness, table_versions,
+)
+
+NOW = pd.Timestamp('2024-12-15 12:00:00')
+
+
+def probe_frame():
+    return pd.DataFrame({
+        'OBJECT_SCHEMA': ['RAW_DATA', 'RAW_DATA', 'RAW_DATA'],
+        'OBJECT_NAME': ['PATIENT_ADMISSIONS_RAW', 'BED_BOOKINGS_RAW', 'ALLIED_HEALTH_SERVICES_RAW'],
+        'OBJECT_TYPE': ['TABLE'] * 3,
+        'ROW_COUNT': [100, 20, 5],
+        'LAST_ALTERED': pd.to_datetime(['2024-12-15 11:55', '2024-12-15 10:00', '2024-12-01 12:00']),
+        'LATEST_EVENT': pd.to_datetime(['2024-12-15', None, '2024-11-30']),
+    })
+
+
+def test_source_freshness_statuses():
+    freshness = source_freshness(probe_frame(), now=NOW).set_index('Data Source')
+    assert freshness.loc['EHR System', 'Status'] == '✅ Current'
+    assert freshness.loc['EHR System', 'Last Updated'] == '5 minutes ago'
+    assert freshness.loc['Bed Management', 'Status'] == '⚠️ Delayed'
+    assert freshness.loc['Allied Health', 'Status'] == '❌ Stale'
+    assert freshness.loc['Pharmacy System', 'Status'] == '❔ Unknown'
+
+
+def test_format_age():
+    assert format_age(pd.Timedelta(days=2, hours=3)) == '2 days ago'
+    assert format_age(pd.Timedelta(hours=1), suffix='') == '1 hour'
+    assert format_age(None) == 'Never'
+
+
+def test_changed_tables_only_reports_seen_tables():
+    before = table_versions(probe_frame())
+    after_probe = probe_frame()
+    after_probe.loc[0, 'ROW_COUNT'] = 150
+    after = table_versions(after_probe)
+    assert changed_tables(before, after) == {'PATIENT_ADMISSIONS_RAW'}
+    assert changed_tables({}, after) == set()
+
+
+def test_loaders_read_their_declared_tables_and_those_of_their_sources():
+    @reads('HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW', 'hospital_departments_raw')
+    def get_extract():
+        return "SELECT * FROM HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW"
+
+    @derived_from(get_extract)
+    @reads('BED_INVENTORY_RAW')
+    def get_rollup():
+        return get_extract()
+
+    def get_undeclared():
+        return "SELECT * FROM HOSPITAL_DEMO.RAW_DATA.BED_BOOKINGS_RAW"
+
+    assert loader_sources(get_extract) == {'PATIENT_ADMISSIONS_RAW', 'HOSPITAL_DEPARTMENTS_RAW'}
+    assert loader_sources(get_rollup) == {'PATIENT_ADMISSIONS_RAW', 'HOSPITAL_DEPARTMENTS_RAW', 'BED_INVENTORY_RAW'}
+    # Table names in the source are not read
+    assert loader_sources(get_undeclared) == set()
+
+
+def test_probe_query_runs_on_local_backend():
+    pytest.importorskip("duckdb")
+    from local_backend import LocalSession
+
+    session = LocalSession.from_data_dir()
+    probe = session.sql(build_probe_query()).to_pandas()
+    admissions = probe.set_index('OBJECT_NAME').loc['PATIENT_ADMISSIONS_RAW']
+    assert admissions['ROW_COUNT'] > 0
+    assert pd.notna(admissions['LATEST_EVENT'])
+    # The metadata-only query sees the same table versions without the event-time scans
+    metadata = session.sql(build_metadata_query()).to_pandas()
+    assert 'FROM HOSPITAL_DEMO.RAW_DATA' not in build_metadata_query()
+    assert table_versions(metadata) == table_versions(probe)
@@ -0,0 +1,51 @@
+"""Tests for the local DuckDB backend and lazy role views"""
+
+import importlib
+
+import pytest
+
+from local_backend import raw_table_ddl, translate_sql
+from views import ROLE_VIEWS
+
+
+def test_translate_datediff_and_current_date():
+    query = "SELECT DATEDIFF(day, admission_date, CURRENT_DATE()) FROM t"
+    assert translate_sql(query) == "SELECT DATE_DIFF('day', admission_date, CURRENT_DATE) FROM t"
+    assert "DATE '2024-12-15'" in translate_sql(query, as_of="2024-12-15")
+
+
+def test_raw_table_ddl_covers_raw_tables():
+    ddl = raw_table_ddl()
+    assert "PATIENT_ADMISSIONS_RAW" in ddl
+    assert "STRING" not in ddl["PATIENT_ADMISSIONS_RAW"]
+
+
+def test_role_views_define_render():
+    for module_name in ROLE_VIEWS.values():
+        assert callable(importlib.import_module(module_name).render)
+
+
+def test_local_session_queries_raw_data():
+    pytest.importorskip("duckdb")
+    from local_backend import LocalSession
+
+    session = LocalSession.from_data_dir()
+    df = session.sql("SELECT COUNT(*) AS n FROM HOSPITAL_DEMO.RAW_DATA.HOSPITAL_DEPARTMENTS_RAW WHERE 1 = ?",
+                     params=[1]).to_pandas()
+    assert list(df.columns) == ["N"]
+    assert df["N"].iloc[0] > 0
+
+
+def test_collect_query_stats_profiles_sync_and_async_queries():
+    pytest.importorskip("duckdb")
+    from local_backend import LocalSession, collect_query_stats
+
+    session = LocalSession.from_data_dir()
+    query = "SELECT COUNT(*) AS n FROM HOSPITAL_DEMO.RAW_DATA.HOSPITAL_DEPARTMENTS_RAW"
+    rows = session.sql(query).to_pandas()["N"].iloc[0]
+    with collect_query_stats() as stats:
+        session.sql(query).to_pandas()
+        session.sql(query).to_pandas(block=False).result()
+    assert stats["queries"] == 2
+    assert stats["rows_scanned"] == 2 * rows
+    assert stats["peak_buffer_bytes"] >= 0
@@ -0,0 +1,49 @@
+"""Tests for the in-process OLAP cube"""
+
+import numpy as np
+import pandas as pd
+
+from olap_cube import Cube
+
+
+def frame(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'DAY': pd.Timestamp('2024-12-01') + pd.to_timedelta(rng.integers(0, 14, n), unit='D'),
+        'DEPARTMENT_NAME': rng.choice(['Cardiology', 'Oncology', 'Surgery', None], n),
+        'ADMISSION_TYPE': rng.choice(['Elective', 'Emergency', 'Urgent'], n),
+        'ADMISSIONS': rng.integers(1, 5, n),
+        'TOTAL_CHARGES': rng.uniform(100, 1000, n),
+    })
+
+
+def test_aggregate_matches_pandas_groupby():
+    df = frame()
+    cube = Cube.from_frame(df, ['DAY', 'DEPARTMENT_NAME', 'ADMISSION_TYPE'], ['ADMISSIONS', 'TOTAL_CHARGES'])
+    assert cube.codes['DEPARTMENT_NAME'].dtype == np.uint8
+
+    out = cube.aggregate(['DEPARTMENT_NAME', 'ADMISSION_TYPE'], where={'DAY': lambda days: days >= np.datetime64('2024-12-08')})
+    subset = df[df['DAY'] >= '2024-12-08']
+    expected = subset.groupby(['DEPARTMENT_NAME', 'ADMISSION_TYPE'], dropna=False)[['ADMISSIONS', 'TOTAL_CHARGES']].sum()
+    expected = expected.reset_index().sort_values(['DEPARTMENT_NAME', 'ADMISSION_TYPE'], ignore_index=True)
+    out = out.sort_values(['DEPARTMENT_NAME', 'ADMISSION_TYPE'], ignore_index=True)
+    assert out['ADMISSIONS'].dtype == np.int64
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_filters_derived_dimensions_and_distinct_counts():
+    df = frame()
+    cube = Cube.from_frame(df, ['DAY', 'DEPARTMENT_NAME', 'ADMISSION_TYPE'], ['ADMISSIONS'])
+    weekly = cube.derive('WEEK', 'DAY', lambda days: pd.DatetimeIndex(days).to_period('W-SUN').start_time)
+    assert len(weekly.labels['WEEK']) == 3 and len(weekly) == len(cube)
+
+    where = {'DEPARTMENT_NAME': ['Cardiology', 'Surgery'], 'ADMISSION_TYPE': ['Emergency']}
+    out = weekly.aggregate(['WEEK'], where, distinct=['DEPARTMENT_NAME', 'DAY'])
+    subset = df[df['DEPARTMENT_NAME'].isin(['Cardiology', 'Surgery']) & (df['ADMISSION_TYPE'] == 'Emergency')]
+    expected = subset.groupby(subset['DAY'].dt.to_period('W-SUN').dt.start_time)
+    assert out['ADMISSIONS'].tolist() == expected['ADMISSIONS'].sum().tolist()
+    assert out['DEPARTMENT_NAME_COUNT'].tolist() == expected['DEPARTMENT_NAME'].nunique().tolist()
+    assert out['DAY_COUNT'].tolist() == expected['DAY'].nunique().tolist()
+
+    total = cube.aggregate(where={'ADMISSION_TYPE': ['Unknown']})
+    assert total['ADMISSIONS'].tolist() == [0]
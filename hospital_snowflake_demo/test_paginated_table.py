@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyset pagination query builder
+"""
+
+import pytest
+
+from paginated_table import TableSpec, build_page_query, build_seek_clause, fetch_page, sort_keys
+
+SPEC = TableSpec(
+    base_query="SELECT * FROM HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW",
+    unique_key='admission_id',
+    sort_options={
+        'Newest': [('admission_date', 'DESC')],
+        'Department': [('department_id', 'ASC'), ('admission_date', 'DESC')],
+    },
+    filter_columns={'Department': 'department_id', 'Type': 'admission_type'},
+    page_size=25,
+)
+
+
+def test_sort_keys_end_with_unique_key():
+    assert sort_keys(SPEC, 'Newest') == [('admission_date', 'DESC'), ('admission_id', 'DESC')]
+
+
+def test_seek_clause_expands_per_key():
+    keys = sort_keys(SPEC, 'Department')
+    clause, params = build_seek_clause(keys, ('CARD', '2024-01-15', 'ADM000010'))
+    assert clause == (
+        "(((department_id > ? OR department_id IS NULL)) OR "
+        "(department_id = ? AND (admission_date < ? OR admission_date IS NULL)) OR "
+        "(department_id = ? AND admission_date = ? AND (admission_id < ? OR admission_id IS NULL)))"
+    )
+    assert params == ['CARD', 'CARD', '2024-01-15', 'CARD', '2024-01-15', 'ADM000010']
+
+
+def test_first_page_has_no_seek_and_fetches_look_ahead_row():
+    query, params = build_page_query(SPEC, 'Newest', {'Department': [], 'Type': ''})
+    assert 'WHERE' not in query
+    assert query.endswith("ORDER BY admission_date DESC NULLS LAST, admission_id DESC NULLS LAST\nLIMIT 26")
+    assert params == []
+
+
+def test_filters_are_bound_before_seek():
+    query, params = build_page_query(
+        SPEC, 'Newest', {'Department': ['CARD', 'EMER'], 'Type': 'Emergency'},
+        cursor=('2024-01-15', 'ADM000010')
+    )
+    assert "department_id IN (?, ?) AND admission_type = ? AND (((admission_date < ? OR" in query
+    assert params == ['CARD', 'EMER', 'Emergency', '2024-01-15', '2024-01-15', 'ADM000010']
+
+
+def test_null_sort_keys_are_paged_through_last():
+    duckdb = pytest.importorskip("duckdb")
+    from local_backend import LocalSession
+
+    con = duckdb.connect()
+    con.execute("ATTACH ':memory:' AS HOSPITAL_DEMO")
+    con.execute("CREATE SCHEMA HOSPITAL_DEMO.RAW_DATA")
+    con.execute("""
+        CREATE TABLE HOSPITAL_DEMO.RAW_DATA.BED_BOOKINGS_RAW AS
+        SELECT printf('B%02d', range) AS booking_id,
+               CASE WHEN range % 3 = 0 THEN NULL ELSE DATE '2024-12-01' + CAST(range % 4 AS INTEGER) END
+                   AS expected_checkout_date
+        FROM range(20)
+    """)
+    spec = TableSpec(
+        base_query="SELECT * FROM HOSPITAL_DEMO.RAW_DATA.BED_BOOKINGS_RAW",
+        unique_key='booking_id',
+        sort_options={'Soonest': [('expected_checkout_date', 'ASC')], 'Latest': [('expected_checkout_date', 'DESC')]},
+        filter_columns={},
+        page_size=4,
+    )
+    session = LocalSession(con)
+    for label in spec.sort_options:
+        seen, cursor = [], None
+        while True:
+            page, cursor = fetch_page(session, spec, label, {}, cursor)
+            seen.extend(page['BOOKING_ID'])
+            if cursor is None:
+                break
+        assert sorted(seen) == [f"B{n:02d}" for n in range(20)] and len(set(seen)) == 20
+        # NULL checkouts come last, in booking order (descending for 'Latest')
+        nulls = [f"B{n:02d}" for n in range(0, 20, 3)]
+        assert seen[-7:] == (nulls if label == 'Soonest' else nulls[::-1])
@@ -0,0 +1,116 @@
+"""Tests for pre-execution query plan guardrails"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from local_backend import LocalSession
+from plan_guard import PlanGuard, PlanLimits, PlanRejected, violations
+from query_guard import mark_stale, query_guard
+
+
+def plan(rows=None, partitions=None):
+    return {'bytes': 0, 'joins': 0, 'rows': rows, 'partitions': partitions}
+
+
+def at(hour):
+    return lambda: datetime(2024, 12, 16, hour, 30)
+
+
+def test_violations_report_each_exceeded_limit():
+    limits = PlanLimits(rows=1000, partitions=10)
+    assert violations(plan(rows=500, partitions=10), limits) == []
+    assert violations(plan(rows=5000, partitions=None), limits) == ['~5,000 estimated rows (limit 1,000)']
+    assert violations(plan(rows=None, partitions=11), limits) == ['11 partitions to scan (limit 10)']
+
+
+def test_plans_are_rejected_in_clinical_hours_and_flagged_outside_them():
+    explain = lambda *args: plan(rows=10 ** 9)
+    alternatives = {'get_department_summary': "join per-department counts"}
+
+    day = PlanGuard(alternatives=alternatives, explain=explain, now=at(10))
+    with pytest.raises(PlanRejected, match="join per-department counts"):
+        day.check(None, 'get_department_summary', "SELECT 1")
+
+    night = PlanGuard(alternatives=alternatives, explain=explain, now=at(23))
+    assert night.check(None, 'get_department_summary', "SELECT 1")['rows'] == 10 ** 9
+    assert night.recent()[['Loader', 'Action', 'Suggested']].iloc[0].tolist() == [
+        'get_department_summary', 'flagged', "join per-department counts"]
+
+    assert PlanGuard(explain=explain, mode='off').check(None, 'x', "SELECT 1") is None
+    with pytest.raises(PlanRejected):
+        PlanGuard(explain=explain, mode='reject', now=at(23)).check(None, 'x', "SELECT 1")
+
+
+def test_per_loader_limits_and_failed_explain():
+    guard = PlanGuard({'get_freshness_probe': PlanLimits(rows=10)}, explain=lambda *args: plan(rows=100),
+                      mode='reject')
+    assert guard.check(None, 'get_basic_stats', "SELECT 1")['rows'] == 100
+    with pytest.raises(PlanRejected):
+        guard.check(None, 'get_freshness_probe', "SELECT 1")
+
+    def broken(*args):
+        raise RuntimeError("EXPLAIN not allowed")
+
+    assert PlanGuard(explain=broken, mode='reject').check(None, 'x', "SELECT 1") is None
+
+
+def test_plans_are_cached_per_query_shape_for_the_ttl():
+    calls = []
+    clock = [0.0]
+    guard = PlanGuard(explain=lambda session, query, params: calls.append((query, params)) or plan(rows=1),
+                      ttl=timedelta(hours=1), clock=lambda: clock[0])
+    guard.explain(None, "SELECT  * FROM t WHERE x >= ?", [7])
+    guard.explain(None, "SELECT * FROM t WHERE x >= ?", [8])
+    guard.explain(None, "SELECT * FROM t WHERE x >= '2024-12-15 10:00:30'")
+    guard.explain(None, "SELECT * FROM t WHERE x >= '2024-12-15 10:01:00'")
+    clock[0] += 3601
+    guard.explain(None, "SELECT * FROM t WHERE x >= ?", [9])
+    # Bound or inlined, the watermark leaves the query's shape unchanged
+    assert calls == [("SELECT  * FROM t WHERE x >= ?", [7]), ("SELECT * FROM t WHERE x >= ?", [9])]
+
+
+def test_expired_plans_are_evicted_and_the_cache_is_bounded(monkeypatch):
+    import plan_guard
+
+    clock = [0.0]
+    guard = PlanGuard(explain=lambda *args: plan(rows=1), ttl=timedelta(hours=1), clock=lambda: clock[0])
+    guard.explain(None, "SELECT a FROM t")
+    clock[0] += 3601
+    guard.explain(None, "SELECT b FROM t")
+    assert list(guard._plans) == ["SELECT b FROM t"]
+
+    monkeypatch.setattr(plan_guard, 'MAX_PLANS', 3)
+    for column in 'cdef':
+        guard.explain(None, f"SELECT {column} FROM t")
+    assert list(guard._plans) == ["SELECT d FROM t", "SELECT e FROM t", "SELECT f FROM t"]
+
+
+def test_rejected_plan_serves_the_last_good_result():
+    reject = [False]
+
+    def get_summary():
+        try:
+            if reject[0]:
+                mark_stale("its plan exceeded the query guardrails and was not run")
+                raise PlanRejected("too big")
+            return pd.DataFrame({'N': [1]})
+        except PlanRejected:
+            return pd.DataFrame()
+
+    loader = query_guard()(get_summary)
+    assert loader()['N'].tolist() == [1]
+    reject[0] = True
+    stale = loader()
+    assert stale['N'].tolist() == [1] and stale.attrs['stale']
+
+
+def test_local_plan_estimates_rows():
+    import duckdb
+    con = duckdb.connect()
+    con.execute("ATTACH ':memory:' AS HOSPITAL_DEMO")
+    con.execute("CREATE SCHEMA HOSPITAL_DEMO.RAW_DATA")
+    con.execute("CREATE TABLE HOSPITAL_DEMO.RAW_DATA.T AS SELECT range AS ID FROM range(1000)")
+    estimate = LocalSession(con).explain_cost("SELECT a.ID FROM T a JOIN T b ON a.ID = b.ID")
+    assert estimate['joins'] == 1 and estimate['rows'] >= 1000 and estimate['partitions'] is None
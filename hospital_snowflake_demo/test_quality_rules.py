@@ -0,0 +1,123 @@
+"""Tests for the data-quality rule engine"""
+
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from quality_rules import (
+    RAW_SCHEMA,
+    RESULTS_TABLE,
+    compile_rules,
+    evaluate_csv_dir,
+    evaluate_frame,
+    evaluate_new_batches,
+    load_rules,
+    parse_rules,
+    summarize_results,
+)
+
+
+def stored_rules(*rows):
+    return pd.DataFrame([
+        {'RULE_ID': n, 'TABLE_NAME': table, 'COLUMN_NAME': column, 'RULE_TYPE': rule_type,
+         'RULE_DESCRIPTION': '', 'RULE_PARAMS': None if params is None else json.dumps(params), 'IS_ACTIVE': True}
+        for n, (table, column, rule_type, params) in enumerate(rows, start=1)
+    ])
+
+
+RULES, _ = parse_rules(stored_rules(
+    ('ADMISSIONS_RAW', 'patient_id', 'NOT_NULL', {}),
+    ('ADMISSIONS_RAW', 'patient_id', 'REFERENTIAL', {'table': 'PATIENTS_RAW', 'column': 'patient_id'}),
+    ('ADMISSIONS_RAW', 'total_charges', 'RANGE', {'min': 0, 'max': 1000}),
+    ('ADMISSIONS_RAW', 'admission_id', 'REGEX', {'pattern': 'ADM[0-9]{3}'}),
+    ('ADMISSIONS_RAW', 'admission_date', 'FRESHNESS', {'max_age_days': 7}),
+    ('PATIENTS_RAW', 'patient_id', 'NOT_NULL', {}),
+))
+
+
+class RecordingSession:
+    """Session wrapper keeping the queries run through it"""
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = []
+
+    def sql(self, query, params=None):
+        self.queries.append(query)
+        return self.session.sql(query, params=params)
+
+    def scans(self):
+        return [query for query in self.queries if f"FROM {RAW_SCHEMA}." in query]
+
+
+def test_one_scan_per_table_for_all_its_rules():
+    queries = compile_rules(RULES)
+    assert sorted(queries) == ['ADMISSIONS_RAW', 'PATIENTS_RAW']
+    query, binds = queries['ADMISSIONS_RAW']
+    assert query.count("FROM HOSPITAL_DEMO.RAW_DATA.ADMISSIONS_RAW") == 1
+    assert query.count("COUNT_IF(") == 4 and "MAX(t.admission_date)" in query
+    assert "SELECT DISTINCT patient_id AS ref_key FROM HOSPITAL_DEMO.RAW_DATA.PATIENTS_RAW" in query
+    assert binds == [0, 1000, 'ADM[0-9]{3}']
+
+    query, binds = compile_rules(RULES, {'ADMISSIONS_RAW': ['b2.csv'], 'PATIENTS_RAW': []})['ADMISSIONS_RAW']
+    assert query.count('?') == len(binds) and binds[-1] == 'b2.csv'
+
+
+def test_rules_without_params_or_with_bad_names_are_not_compiled():
+    rules, skipped = parse_rules(stored_rules(
+        ('DIM_PATIENT', 'patient_id', 'UNIQUENESS', None),
+        ('ADMISSIONS_RAW', 'patient_id', 'REFERENTIAL', {'table': 'PATIENTS_RAW'}),
+        ('ADMISSIONS_RAW', 'id; DROP TABLE x', 'NOT_NULL', {}),
+    ))
+    assert rules == []
+    assert [rule_id for rule_id, _ in skipped] == [1, 2, 3]
+
+
+def test_frame_evaluation_and_summary():
+    frame = pd.DataFrame({
+        'patient_id': ['P1', 'P2', None, 'P9'],
+        'total_charges': ['10', '-5', '2000', 'n/a'],
+        'admission_id': ['ADM001', 'ADM02', 'ADM003', None],
+        'admission_date': ['2024-12-01', '2024-12-10', None, '2024-11-30'],
+    })
+    rows = evaluate_frame(RULES[:5], frame, 'b1.csv', {('PATIENTS_RAW', 'patient_id'): pd.Index(['P1', 'P2'])})
+    assert [row['VIOLATIONS'] for row in rows] == [1, 1, 3, 1, None]
+    assert rows[-1]['LATEST_VALUE'] == '2024-12-10'
+
+    summary = summarize_results(pd.DataFrame(rows), today=date(2024, 12, 20)).set_index('RULE_ID')
+    assert summary.loc[5, 'AGE_DAYS'] == 10 and summary.loc[5, 'STATUS'] == 'FAIL'
+    assert summary.loc[2, 'VIOLATION_PCT'] == 25.0
+    assert set(summary['STATUS']) == {'FAIL'}
+
+
+def test_local_evaluator_matches_the_warehouse_results():
+    pytest.importorskip("duckdb")
+    from local_backend import DEFAULT_DATA_DIR, LocalSession
+
+    session = LocalSession.from_data_dir(as_of='2024-12-15')
+    rules, _ = load_rules(session)
+    assert {rule.rule_type for rule in rules} == {'NOT_NULL', 'RANGE', 'REFERENTIAL', 'REGEX', 'FRESHNESS'}
+    written = evaluate_new_batches(session, rules)
+    assert written == len(rules)
+    # Nothing loaded since: no table is scanned
+    recording = RecordingSession(session)
+    assert evaluate_new_batches(recording, rules) == 0
+    assert recording.scans() == []
+
+    columns = ['RULE_ID', 'LOAD_BATCH', 'ROWS_CHECKED', 'VIOLATIONS', 'LATEST_VALUE']
+    stored = session.sql(f"SELECT * FROM {RESULTS_TABLE}").to_pandas()[columns]
+    local = evaluate_csv_dir(rules, DEFAULT_DATA_DIR)[columns]
+    stored, local = [frame.astype({'RULE_ID': int, 'ROWS_CHECKED': int, 'VIOLATIONS': 'Float64'})
+                     .fillna({'LATEST_VALUE': ''}).sort_values('RULE_ID').reset_index(drop=True)
+                     for frame in (stored, local)]
+    pd.testing.assert_frame_equal(stored, local, check_dtype=False)
+
+    # A new batch: only its table is scanned, once, and only its results are written
+    session.sql("INSERT INTO HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW SELECT * REPLACE ('b2.csv' AS source_file) "
+                "FROM HOSPITAL_DEMO.RAW_DATA.PATIENT_ADMISSIONS_RAW LIMIT 5").collect()
+    admission_rules = [rule for rule in rules if rule.table == 'PATIENT_ADMISSIONS_RAW']
+    recording = RecordingSession(session)
+    assert evaluate_new_batches(recording, rules) == len(admission_rules)
+    assert [query.count('PATIENT_ADMISSIONS_RAW t') for query in recording.scans()] == [1]
@@ -0,0 +1,93 @@
+"""Tests for per-query timeouts and last-known-good fallback"""
+
+import threading
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from query_guard import QueryTimeout, query_guard, recent_timeouts, run_with_timeout
+
+
+class Job:
+    """Async job that finishes when ``release`` is set"""
+
+    def __init__(self, value, release):
+        self.value, self.release, self.cancelled = value, release, False
+
+    def is_done(self):
+        return self.release.is_set()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def result(self):
+        return self.value
+
+
+class Frame:
+    def __init__(self, value, release):
+        self.job = Job(value, release)
+
+    def to_pandas(self, block=True):
+        return self.job
+
+
+def finished():
+    release = threading.Event()
+    release.set()
+    return release
+
+
+def test_slow_query_is_cancelled_and_logged():
+    frame = Frame(pd.DataFrame({'N': [1]}), threading.Event())
+
+    def get_slow():
+        return run_with_timeout(frame, 'SELECT  slow')
+
+    with pytest.raises(QueryTimeout):
+        query_guard({'get_slow': timedelta(seconds=0.05)})(get_slow)()
+    assert frame.job.cancelled
+    assert recent_timeouts().iloc[0][['Timeout (s)', 'Query']].tolist() == [0.05, 'SELECT slow']
+    assert run_with_timeout(Frame(pd.DataFrame({'N': [2]}), finished()))['N'].tolist() == [2]
+
+
+def test_timeout_serves_last_good_result_and_drops_cached_error():
+    releases, cleared = [finished()], []
+
+    def get_counts(days=30):
+        try:
+            return run_with_timeout(Frame(pd.DataFrame({'DAYS': [days]}), releases[-1]))
+        except QueryTimeout:
+            return pd.DataFrame()
+    get_counts.__name__ = 'get_counts'
+    get_counts.clear = lambda *args, **kwargs: cleared.append((args, kwargs))
+    loader = query_guard({'get_counts': timedelta(seconds=0.05)})(get_counts)
+
+    assert loader(days=7)['DAYS'].tolist() == [7]
+    releases.append(threading.Event())
+    stale = loader(days=7)
+    assert stale['DAYS'].tolist() == [7] and stale.attrs['stale']
+    assert cleared == [((), {'days': 7})]
+    assert loader(days=90).empty
+    assert loader.clear is get_counts.clear
+
+
+def test_last_good_results_are_kept_for_the_most_recent_arguments(monkeypatch):
+    import query_guard as guard
+
+    monkeypatch.setattr(guard, 'LAST_GOOD_ENTRIES', 2)
+    releases = [finished()]
+
+    def get_changes(since):
+        try:
+            return run_with_timeout(Frame(pd.DataFrame({'SINCE': [since]}), releases[-1]))
+        except QueryTimeout:
+            return pd.DataFrame()
+    loader = query_guard({'get_changes': timedelta(seconds=0.05)})(get_changes)
+
+    for since in (1, 2, 3):
+        loader(since)
+    releases.append(threading.Event())
+    assert loader(1).empty
+    assert loader(3)['SINCE'].tolist() == [3]
@@ -0,0 +1,54 @@
+"""Tests for metadata-backed record counts"""
+
+import pandas as pd
+import pytest
+
+from record_counts import BASIC_STATS, COUNTER_COLUMNS, RAW_TABLES, exact_count_sql, resolve_counts
+
+TABLES = {'ADMISSIONS_RAW': None, 'PATIENTS_RAW': 'patient_id', 'ORDERS_RAW': None}
+
+
+def probe(**row_counts):
+    return pd.DataFrame({'OBJECT_NAME': list(row_counts), 'ROW_COUNT': list(row_counts.values())})
+
+
+def counters(*rows):
+    return pd.DataFrame(list(rows), columns=COUNTER_COLUMNS)
+
+
+def test_row_counts_prefer_metadata_then_counters():
+    found = resolve_counts(TABLES, probe(ADMISSIONS_RAW=120, ORDERS_RAW=None),
+                           counters(('ADMISSIONS_RAW', 100, None, None), ('ORDERS_RAW', 40, None, None)))
+    assert found['ADMISSIONS_RAW'] == (120, 'metadata')
+    assert found['ORDERS_RAW'] == (40, 'counter')
+
+
+def test_distinct_count_only_while_its_counter_is_current():
+    kept = counters(('PATIENTS_RAW', 50, 48, None))
+    assert resolve_counts(TABLES, probe(PATIENTS_RAW=50), kept)['PATIENTS_RAW'] == (48, 'counter')
+    assert resolve_counts(TABLES, probe(), kept)['PATIENTS_RAW'] == (48, 'counter')
+    # Loaded since the counters were rebuilt: left for an exact count
+    assert 'PATIENTS_RAW' not in resolve_counts(TABLES, probe(PATIENTS_RAW=60), kept)
+
+
+def test_unanswered_tables_are_counted_exactly():
+    missing = {table: column for table, column in TABLES.items()
+               if table not in resolve_counts(TABLES, probe(ADMISSIONS_RAW=5), counters())}
+    assert missing == {'PATIENTS_RAW': 'patient_id', 'ORDERS_RAW': None}
+    sql = exact_count_sql(missing)
+    assert "COUNT(DISTINCT patient_id) AS record_count FROM HOSPITAL_DEMO.RAW_DATA.PATIENTS_RAW" in sql
+    assert "COUNT(*) AS record_count FROM HOSPITAL_DEMO.RAW_DATA.ORDERS_RAW" in sql
+
+
+def test_local_counters_match_exact_counts():
+    pytest.importorskip("duckdb")
+    from local_backend import LocalSession
+
+    session = LocalSession.from_data_dir()
+    kept = session.execute("SELECT * FROM HOSPITAL_DEMO.RAW_DATA.RECORD_COUNTS")
+    kept.columns = [c.upper() for c in kept.columns]
+    assert sorted(kept['TABLE_NAME']) == RAW_TABLES
+    tables = dict(BASIC_STATS.values())
+    exact = session.execute(exact_count_sql(tables))
+    resolved = resolve_counts(tables, probe(), kept)
+    assert {table: count for table, (count, _) in resolved.items()} == dict(zip(exact['table_name'], exact['record_count']))
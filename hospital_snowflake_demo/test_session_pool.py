@@ -0,0 +1,154 @@
+"""Tests for the bounded session pool"""
+
+import threading
+from datetime import timedelta
+
+import pytest
+
+from local_backend import LocalSession
+from session_pool import PoolExhausted, SessionPool
+
+
+class FakeSession:
+    def __init__(self, name):
+        self.name = name
+        self.roles = []
+        self.warehouses = []
+        self.healthy = True
+        self.closed = False
+
+    def get_current_role(self):
+        return 'DASHBOARD_APP'
+
+    def use_role(self, role):
+        if role is None:
+            raise ValueError("role must not be None")  # as Snowpark's use_role
+        self.roles.append(role)
+
+    def use_warehouse(self, warehouse):
+        self.warehouses.append(warehouse)
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_pool(max_size=2, **kwargs):
+    created = []
+
+    def factory():
+        created.append(FakeSession(f"s{len(created)}"))
+        return created[-1]
+
+    def health_check(session):
+        if not session.healthy:
+            raise ConnectionError("session expired")
+
+    return SessionPool(factory, max_size=max_size, health_check=health_check, **kwargs), created
+
+
+def test_pool_is_bounded_and_waits_for_a_free_session():
+    pool, created = fake_pool(max_size=2, acquire_timeout=timedelta(seconds=0.05))
+    first, _ = pool.acquire(), pool.acquire()
+    assert len(created) == 2
+    with pytest.raises(PoolExhausted):
+        pool.acquire()
+
+    threading.Timer(0.01, pool.release, [first]).start()
+    pool.acquire_timeout = timedelta(seconds=5)
+    assert pool.acquire() is first
+    assert pool.status()['in_use'] == 2 and pool.stats['waits'] >= 1
+
+
+def test_sessions_bound_to_a_role_are_reused():
+    pool, created = fake_pool(max_size=2)
+    with pool.session('NURSE') as nurse:
+        with pool.session('PHYSICIAN') as physician:
+            pass
+    for _ in range(3):
+        with pool.session('NURSE') as again:
+            assert again is nurse
+        with pool.session('PHYSICIAN') as again:
+            assert again is physician
+    assert nurse.roles == ['NURSE'] and physician.roles == ['PHYSICIAN']
+    assert len(created) == 2
+
+
+def test_role_bound_session_returns_to_its_own_role_for_default_queries():
+    pool, created = fake_pool(max_size=1)
+    with pool.session('NURSE') as nurse:
+        pass
+    with pool.session() as default:
+        assert default is nurse
+    assert nurse.roles == ['NURSE', 'DASHBOARD_APP']
+    with pool.session('NURSE'):
+        pass
+    assert nurse.roles == ['NURSE', 'DASHBOARD_APP', 'NURSE'] and len(created) == 1
+
+
+def test_role_bound_session_with_an_unknown_own_role_is_replaced():
+    pool, created = fake_pool(max_size=1, default_role=lambda session: None)
+    with pool.session('NURSE') as nurse:
+        pass
+    with pool.session() as default:
+        assert default is not nurse and default.roles == []
+    assert nurse.closed and len(created) == 2
+
+
+def test_sessions_on_a_warehouse_are_reused_for_it():
+    pool, created = fake_pool(max_size=2)
+    with pool.session(warehouse='HOSPITAL_ANALYTICS_WH') as heavy:
+        with pool.session(warehouse='HOSPITAL_ADHOC_WH') as light:
+            pass
+    with pool.session(warehouse='HOSPITAL_ANALYTICS_WH') as again:
+        assert again is heavy
+    with pool.session() as any_warehouse:
+        assert any_warehouse.warehouses
+    assert heavy.warehouses == ['HOSPITAL_ANALYTICS_WH'] and light.warehouses == ['HOSPITAL_ADHOC_WH']
+
+
+def test_idle_sessions_are_health_checked_and_replaced():
+    clock = Clock()
+    pool, created = fake_pool(clock=clock, health_check_after=timedelta(minutes=5))
+    created[0].healthy = False
+    with pool.session() as session:
+        assert session is created[0]     # recently used: not checked
+    clock.now += 600
+    with pool.session() as session:
+        assert session is created[1]
+    assert created[0].closed and pool.stats['discarded'] == 1
+
+
+def test_keepalive_pings_only_sessions_idle_for_the_interval():
+    clock = Clock()
+    pings = []
+    pool = SessionPool(lambda: FakeSession('s'), health_check=pings.append, clock=clock,
+                       keepalive_interval=timedelta(minutes=15))
+    pool.keepalive()
+    assert pings == []
+    clock.now += 900
+    pool.keepalive()
+    assert len(pings) == 1 and pool.status()['idle'] == 1
+
+
+def test_pool_runs_local_queries_and_releases_async_sessions():
+    import duckdb
+    con = duckdb.connect()
+    con.execute("ATTACH ':memory:' AS HOSPITAL_DEMO")
+    con.execute("CREATE SCHEMA HOSPITAL_DEMO.RAW_DATA")
+    base = LocalSession(con)
+    pool = SessionPool(base.connect, max_size=1)
+    assert pool.sql("SELECT 1 AS ONE").to_pandas()['ONE'].tolist() == [1]
+    job = pool.sql("SELECT 2 AS TWO").to_pandas(block=False)
+    assert pool.status()['in_use'] == 1
+    assert job.result()['TWO'].tolist() == [2]
+    assert pool.status()['in_use'] == 0
+    assert pool.bound('NURSE').sql("SELECT 3 AS THREE").collect()[0][0] == 3
+    assert pool.approx_distinct_rse == LocalSession.approx_distinct_rse
@@ -0,0 +1,69 @@
+"""Tests for pre-rendered dashboard snapshots"""
+
+import importlib
+import sys
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import snapshots
+from snapshots import Dashboard, load_snapshot, write_snapshot
+
+VIEW = '''
+import pandas as pd
+import plotly.graph_objects as go
+from snapshots import Dashboard
+
+ROWS = 3
+
+
+def build(approximate: bool = False) -> Dashboard:
+    frame = pd.DataFrame({'DEPARTMENT': ['A', 'B', 'C'][:ROWS], 'REVENUE': [1.5, 2.0, 3.25][:ROWS]})
+    return Dashboard(kpis={'total': 6.75, 'approximate': approximate}, tables={'departments': frame},
+                     figures={'revenue': go.Figure(go.Bar(x=frame['DEPARTMENT'], y=frame['REVENUE']))},
+                     row_counts={'get_departments': len(frame)})
+'''
+
+
+@pytest.fixture
+def view(tmp_path, monkeypatch):
+    (tmp_path / 'snapshot_test_view.py').write_text(VIEW)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    versions = {'DEPARTMENTS': ['2024-12-15 02:00:00', 3]}
+    monkeypatch.setattr(snapshots, 'source_versions', lambda module_name: versions)
+    yield importlib.import_module('snapshot_test_view'), versions
+    sys.modules.pop('snapshot_test_view', None)
+
+
+def test_snapshot_round_trips_kpis_tables_and_figures(view, tmp_path):
+    module, _ = view
+    write_snapshot('Test Role', 'snapshot_test_view', directory=str(tmp_path / 'snaps'))
+    served = load_snapshot('Test Role', module.build, directory=str(tmp_path / 'snaps'))
+    assert served.rendered_at is not None
+    assert served.kpis == {'total': 6.75, 'approximate': False}
+    pd.testing.assert_frame_equal(served.tables['departments'], module.build().tables['departments'])
+    assert isinstance(served.figures['revenue'], go.Figure)
+    assert served.figures['revenue'].to_json() == module.build().figures['revenue'].to_json()
+
+
+def test_changed_filters_or_tables_fall_back_to_live(view, tmp_path):
+    module, versions = view
+    directory = str(tmp_path / 'snaps')
+    write_snapshot('Test Role', 'snapshot_test_view', directory=directory)
+    assert load_snapshot('Test Role', module.build, {'approximate': True}, directory) is None
+    assert load_snapshot('Test Role', module.build, {'approximate': False}, directory) is not None
+    versions['DEPARTMENTS'] = ['2024-12-16 02:00:00', 4]
+    assert load_snapshot('Test Role', module.build, directory=directory) is None
+
+
+def test_incomplete_build_is_not_written(view, tmp_path):
+    module, _ = view
+    module.ROWS = 0
+    assert write_snapshot('Test Role', 'snapshot_test_view', directory=str(tmp_path / 'snaps')) is None
+    assert load_snapshot('Test Role', module.build, directory=str(tmp_path / 'snaps')) is None
+
+
+def test_dashboard_completeness():
+    assert Dashboard(row_counts={'a': 1, 'b': 2}).complete()
+    assert not Dashboard(row_counts={'a': 1, 'b': 0}).complete()
@@ -0,0 +1,106 @@
+"""Tests for stale-while-revalidate loader caching"""
+
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from swr_cache import stale_while_revalidate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_loader(clock, results):
+    calls = []
+    release = threading.Event()
+    release.set()
+
+    @stale_while_revalidate(timedelta(seconds=60), timedelta(seconds=600), clock=clock)
+    def loader():
+        release.wait(5)
+        calls.append(clock())
+        return results[min(len(calls) - 1, len(results) - 1)]
+
+    return loader, calls, release
+
+
+def test_fresh_result_is_served_from_cache():
+    clock = FakeClock()
+    loader, calls, _ = make_loader(clock, [pd.DataFrame({'V': [1]})])
+    loader()
+    clock.now = 30
+    assert loader()['V'].tolist() == [1]
+    assert len(calls) == 1
+
+
+def test_expired_result_is_served_while_refreshing():
+    clock = FakeClock()
+    loader, calls, release = make_loader(clock, [pd.DataFrame({'V': [1]}), pd.DataFrame({'V': [2]})])
+    loader()
+    clock.now = 120
+    release.clear()
+    assert loader()['V'].tolist() == [1]
+    assert loader.status()['refreshing']
+    release.set()
+    loader.wait()
+    assert loader()['V'].tolist() == [2]
+    assert not loader.status()['refreshing']
+    assert len(calls) == 2
+
+
+def test_result_past_max_staleness_blocks_on_reload():
+    clock = FakeClock()
+    loader, calls, _ = make_loader(clock, [pd.DataFrame({'V': [1]}), pd.DataFrame({'V': [2]})])
+    loader()
+    clock.now = 1000
+    assert loader()['V'].tolist() == [2]
+
+
+def test_failed_refresh_keeps_previous_result():
+    clock = FakeClock()
+    loader, _, _ = make_loader(clock, [pd.DataFrame({'V': [1]}), pd.DataFrame()])
+    loader()
+    clock.now = 120
+    loader()
+    loader.wait()
+    assert loader()['V'].tolist() == [1]
+
+
+def test_clear_expires_without_dropping():
+    clock = FakeClock()
+    loader, calls, _ = make_loader(clock, [pd.DataFrame({'V': [1]}), pd.DataFrame({'V': [2]})])
+    loader()
+    loader.clear()
+    assert loader()['V'].tolist() == [1]
+    loader.wait()
+    assert loader()['V'].tolist() == [2]
+
+
+def test_callers_get_copies():
+    clock = FakeClock()
+    loader, _, _ = make_loader(clock, [pd.DataFrame({'V': [1]})])
+    df = loader()
+    df['EXTRA'] = 1
+    assert 'EXTRA' not in loader().columns
+
+
+def test_clear_with_arguments_drops_only_that_result():
+    calls = []
+
+    @stale_while_revalidate(timedelta(seconds=60), timedelta(seconds=600), clock=FakeClock())
+    def loader(days=30):
+        calls.append(days)
+        return pd.DataFrame({'DAYS': [days]})
+
+    loader(days=7)
+    loader(days=30)
+    loader.clear(days=7)
+    loader(days=7)
+    loader(days=30)
+    assert calls == [7, 30, 7]
@@ -0,0 +1,141 @@
+"""Tests for cost-based warehouse routing"""
+
+import json
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from warehouse_router import WarehouseRouter, explain_cost
+
+
+class FakeJob:
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+class FakeFrame:
+    def __init__(self, session, query):
+        self._session = session
+        self._query = query
+
+    def to_pandas(self, block=True):
+        self._session.ran.append((self._query, self._session.warehouse))
+        df = pd.DataFrame({'N': [1]})
+        return df if block else FakeJob(df)
+
+    def collect(self):
+        return [(self._session.plan,)]
+
+
+class FakeSnowparkSession:
+    def __init__(self, plan=None):
+        self.warehouse = 'DEFAULT_WH'
+        self.ran = []
+        self.plan = plan
+
+    def use_warehouse(self, name):
+        self.warehouse = name
+
+    def sql(self, query, params=None):
+        return FakeFrame(self, query)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def snowflake_plan(bytes_assigned, joins):
+    operations = [{'id': 0, 'operation': 'Result'}] + [{'id': i + 1, 'operation': 'InnerJoin'} for i in range(joins)]
+    return json.dumps({'GlobalStats': {'partitionsTotal': 10, 'partitionsAssigned': 4, 'bytesAssigned': bytes_assigned},
+                       'Operations': [operations]})
+
+
+def test_explain_cost_reads_snowflake_plan():
+    session = FakeSnowparkSession(plan=snowflake_plan(1024, joins=3))
+    assert explain_cost(session, "SELECT 1") == {'bytes': 1024, 'partitions': 4, 'rows': None, 'joins': 3}
+
+
+def test_first_run_is_routed_by_explain():
+    small = FakeSnowparkSession(plan=snowflake_plan(1024, joins=0))
+    WarehouseRouter().run(small, 'get_basic_stats', "SELECT 1")
+    assert small.ran == [("SELECT 1", 'HOSPITAL_ADHOC_WH')]
+
+    big = FakeSnowparkSession(plan=snowflake_plan(50 * 1024 ** 3, joins=4))
+    WarehouseRouter().run(big, 'get_strategic_metrics', "SELECT 2")
+    assert big.ran == [("SELECT 2", 'HOSPITAL_ANALYTICS_WH')]
+
+
+def test_history_moves_slow_queries_to_the_heavy_warehouse_and_back():
+    clock = Clock()
+    session = FakeSnowparkSession()
+    router = WarehouseRouter(heavy_after=timedelta(seconds=5), explain=lambda *args: {'bytes': 0, 'joins': 0},
+                             clock=clock)
+
+    def slow(seconds):
+        def execute(frame, query):
+            clock.now += seconds
+            return frame.to_pandas()
+        return execute
+
+    router.run(session, 'get_department_summary', "SELECT 3", execute=slow(8))
+    router.run(session, 'get_department_summary', "SELECT 3", execute=slow(0.5))
+    # 0.5 s on LARGE counts as 2 s on SMALL; the median of 8 and 2 is still heavy
+    router.run(session, 'get_department_summary', "SELECT 3", execute=slow(0.5))
+    router.run(session, 'get_department_summary', "SELECT 3")
+    assert [warehouse for _, warehouse in session.ran] == [
+        'HOSPITAL_ADHOC_WH', 'HOSPITAL_ANALYTICS_WH', 'HOSPITAL_ANALYTICS_WH', 'HOSPITAL_ADHOC_WH']
+    recent = router.recent()
+    assert recent['Estimate from'].tolist() == ['history', 'history', 'history', 'explain']
+
+
+def test_failures_are_logged_and_count_as_history():
+    clock = Clock()
+    session = FakeSnowparkSession()
+    router = WarehouseRouter(explain=lambda *args: {'bytes': 0, 'joins': 0}, clock=clock)
+
+    def timed_out(frame, query):
+        clock.now += 60
+        raise TimeoutError("cancelled")
+
+    with pytest.raises(TimeoutError):
+        router.run(session, 'get_executive_kpis', "SELECT 4", execute=timed_out)
+    router.run(session, 'get_executive_kpis', "SELECT 4")
+    assert router.recent()['Outcome'].tolist() == ['ok', 'TimeoutError']
+    assert session.ran[-1][1] == 'HOSPITAL_ANALYTICS_WH'
+
+
+def test_backend_without_warehouses_is_not_rerouted():
+    class LocalLike:
+        def sql(self, query, params=None):
+            return FakeFrame(session, query)
+
+    session = FakeSnowparkSession()
+    router = WarehouseRouter(explain=lambda *args: {'bytes': 0, 'joins': 0})
+    router.run(LocalLike(), 'get_basic_stats', "SELECT 5")
+    assert session.ran == [("SELECT 5", 'DEFAULT_WH')]
+    assert not router.recent()['Applied'].iloc[0]
+
+
+def test_queries_differing_only_in_literals_share_history_within_a_bound(monkeypatch):
+    import warehouse_router
+
+    explained = []
+    session = FakeSnowparkSession()
+    router = WarehouseRouter(explain=lambda session, query, params: explained.append(query) or {'bytes': 0, 'joins': 0})
+    for second in range(3):
+        router.run(session, 'get_bed_changes', f"SELECT * FROM t WHERE load_timestamp >= '2024-12-15 10:00:{second:02}'")
+    assert len(explained) == 1 and len(router._history) == 1
+
+    monkeypatch.setattr(warehouse_router, 'MAX_QUERIES', 2)
+    for table in ('a', 'b', 'c'):
+        router.run(session, 'get_x', f"SELECT * FROM {table}")
+    assert [query for _, query in router._history] == ["SELECT * FROM b", "SELECT * FROM c"]
+    assert len(router._explained) == 2
@@ -0,0 +1,31 @@
+"""
+Per-role dashboard views
+
+Each role's view lives in its own module and is imported only when that role
+is selected, so a session only pays for the plotly import and the loaders of
+the role it is looking at.
+"""
+
+import importlib
+
+ROLE_VIEWS = {
+    "CEO": "views.ceo",
+    "Clinical Administrator": "views.clinical_admin",
+    "Physician": "views.physician",
+    "Nurse": "views.nurse",
+    "Analyst": "views.analyst",
+    "Capacity Planner": "views.capacity_planner",
+    "Allied Health Coordinator": "views.allied_health",
+}
+
+
+def load_view(role: str):
+    """Import the view module for a role on first use
+
+    Cached loaders whose source tables changed since the last freshness probe
+    are cleared here, before the view reads them.
+    """
+    module = importlib.import_module(ROLE_VIEWS[role])
+    from loaders import refresh_stale_loaders
+    refresh_stale_loaders()
+    return module
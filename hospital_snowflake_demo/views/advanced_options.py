@@ -0,0 +1,134 @@
+"""
+Advanced option panels (data quality and export)
+"""
+
+import streamlit as st
+import plotly.express as px
+from datetime import datetime
+
+from app_session import get_session
+from audit_log import get_audit_writer
+from data_profiler import profile_new_batches
+from freshness import source_freshness
+from quality_rules import evaluate_new_batches
+from loaders import (
+    get_department_summary,
+    get_freshness_probe,
+    get_plan_guard,
+    get_quality_rule_results,
+    get_table_profiles,
+    get_warehouse_router,
+)
+from query_guard import recent_timeouts
+
+
+def render_data_quality():
+    """Render the data quality dashboard panel"""
+    st.markdown("## 📋 Data Quality Dashboard")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Data Completeness")
+        profiles = get_table_profiles()
+        if len(profiles) > 0:
+            profiles = profiles.assign(NULLS=profiles['ROWS'] * profiles['NULL_PCT'] / 100)
+            quality_metrics = profiles.groupby('TABLE_NAME').agg(
+                Rows=('ROWS', 'max'), Cells=('ROWS', 'sum'), Nulls=('NULLS', 'sum'),
+                Violations=('RANGE_VIOLATIONS', 'sum')
+            ).reset_index().rename(columns={'TABLE_NAME': 'Table'})
+            quality_metrics['Completeness %'] = 100 * (1 - quality_metrics['Nulls'] / quality_metrics['Cells'].clip(lower=1))
+            quality_metrics['Quality Score'] = 100 * (1 - quality_metrics['Violations'] / quality_metrics['Rows'].clip(lower=1))
+            
+            fig_quality = px.bar(
+                quality_metrics,
+                x='Table',
+                y='Completeness %',
+                color='Quality Score',
+                title='Data Completeness by Table'
+            )
+            fig_quality.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_quality, use_container_width=True)
+            
+            profile_table = st.selectbox("Column profile", quality_metrics['Table'].tolist())
+            st.dataframe(
+                profiles[profiles['TABLE_NAME'] == profile_table].drop(columns=['TABLE_NAME', 'NULLS']),
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("No data profiles yet - profile the loaded batches to populate this panel")
+        
+        if st.button("Profile new load batches"):
+            with st.spinner("Profiling new load batches..."):
+                profiled = profile_new_batches(get_session())
+            get_table_profiles.clear()
+            st.success(f"Profiled {profiled} new load batches")
+        
+        st.markdown("### Rule Checks")
+        rule_results = get_quality_rule_results()
+        if len(rule_results) > 0:
+            failed = int((rule_results['STATUS'] == 'FAIL').sum())
+            st.metric("Rules passing", f"{len(rule_results) - failed} / {len(rule_results)}")
+            st.dataframe(rule_results, use_container_width=True, hide_index=True)
+        else:
+            st.info("No rule results yet - evaluate the rules in DATA_QUALITY_RULES to populate this panel")
+        
+        if st.button("Evaluate rules on new load batches"):
+            with st.spinner("Evaluating data quality rules..."):
+                written = evaluate_new_batches(get_session())
+            get_quality_rule_results.clear()
+            st.success(f"Wrote {written} rule results")
+    
+    with col2:
+        st.markdown("### Data Freshness")
+        probe = get_freshness_probe()
+        if len(probe) > 0:
+            freshness_data = source_freshness(probe)
+            st.dataframe(freshness_data, use_container_width=True, hide_index=True)
+            with st.expander("Monitored objects"):
+                st.dataframe(probe, use_container_width=True, hide_index=True)
+        else:
+            st.info("Freshness metadata is not available for this role")
+        
+        timeouts = recent_timeouts()
+        if len(timeouts) > 0:
+            with st.expander(f"Cancelled slow queries ({len(timeouts)})"):
+                st.dataframe(timeouts, use_container_width=True, hide_index=True)
+        
+        plans = get_plan_guard().recent()
+        if len(plans) > 0:
+            with st.expander(f"Query plans over guardrails ({len(plans)})"):
+                st.dataframe(plans, use_container_width=True, hide_index=True)
+        
+        routing = get_warehouse_router().recent()
+        if len(routing) > 0:
+            with st.expander(f"Warehouse routing ({len(routing)} recent queries)"):
+                st.dataframe(routing, use_container_width=True, hide_index=True)
+        
+        writer = get_audit_writer()
+        if writer is not None:
+            with st.expander(f"Audit log ({writer.written:,} events written, {writer.pending:,} pending)"):
+                if writer.dropped:
+                    st.warning(f"{writer.dropped:,} access events dropped while the audit log could not be written")
+                st.dataframe(writer.recent(), use_container_width=True, hide_index=True)
+
+
+def render_export():
+    """Render the data export panel"""
+    st.markdown("## 📥 Data Export")
+    
+    export_options = st.multiselect(
+        "Select data to export:",
+        ["Department Summary", "Admission Trends", "Bed Utilization", "Medication Analysis", "Allied Health Summary"]
+    )
+    
+    if st.button("Generate Export"):
+        dept_summary = get_department_summary() if "Department Summary" in export_options else None
+        if dept_summary is not None and len(dept_summary) > 0:
+            csv_data = dept_summary.to_csv(index=False)
+            st.download_button(
+                label="Download Department Summary",
+                data=csv_data,
+                file_name=f"department_summary_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
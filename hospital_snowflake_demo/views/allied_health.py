@@ -0,0 +1,340 @@
+"""
+Allied Health Coordinator dashboard
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from alerts import PROVIDER_ALERT_RULES, SERVICE_OPPORTUNITY_RULES, evaluate_rules, render_alerts
+from approx_query import total_ci
+from snapshots import Dashboard, render_snapshot_badge, snapshot_or_build
+from loaders import (
+    get_allied_health_department_integration,
+    get_allied_health_detailed_analytics,
+    get_allied_health_outcomes_analysis,
+    get_allied_health_provider_performance,
+    get_allied_health_utilization_trends,
+)
+
+
+def build(approximate: bool = False) -> Dashboard:
+    """Run the allied health loaders and build the dashboard's KPIs, tables and figures"""
+    ah_detailed = get_allied_health_detailed_analytics(approximate=approximate)
+    ah_trends = get_allied_health_utilization_trends(approximate=approximate)
+    ah_dept_integration = get_allied_health_department_integration()
+    ah_provider_performance = get_allied_health_provider_performance()
+    ah_outcomes = get_allied_health_outcomes_analysis()
+    dashboard = Dashboard(row_counts={
+        'get_allied_health_detailed_analytics': len(ah_detailed),
+        'get_allied_health_utilization_trends': len(ah_trends),
+        'get_allied_health_department_integration': len(ah_dept_integration),
+        'get_allied_health_provider_performance': len(ah_provider_performance),
+        'get_allied_health_outcomes_analysis': len(ah_outcomes),
+    })
+    figures = dashboard.figures
+    
+    if len(ah_detailed) > 0:
+        # Key metrics
+        dashboard.kpis = {
+            'total_services': int(ah_detailed['TOTAL_SERVICES'].sum()),
+            'unique_patients': int(ah_detailed['UNIQUE_PATIENTS'].sum()),
+            'patients_ci': total_ci(ah_detailed, 'UNIQUE_PATIENTS'),
+            'total_revenue': float(ah_detailed['TOTAL_REVENUE'].sum()),
+            'avg_success_rate': float(ah_detailed['SUCCESS_RATE'].mean()),
+            'total_duration_hours': float(ah_detailed['TOTAL_DURATION_MINUTES'].sum() / 60),
+        }
+        
+        # Services by provider type
+        provider_summary = ah_detailed.groupby('PROVIDER_CREDENTIALS').agg({
+            'TOTAL_SERVICES': 'sum',
+            'TOTAL_REVENUE': 'sum',
+            'SUCCESS_RATE': 'mean'
+        }).reset_index()
+        
+        figures['provider_services'] = px.bar(
+            provider_summary,
+            x='PROVIDER_CREDENTIALS',
+            y='TOTAL_SERVICES',
+            color='SUCCESS_RATE',
+            color_continuous_scale='RdYlGn',
+            title='Services by Provider Type',
+            labels={'PROVIDER_CREDENTIALS': 'Provider Type', 'TOTAL_SERVICES': 'Total Services'}
+        )
+        
+        # Revenue by service type
+        service_summary = ah_detailed.groupby('SERVICE_TYPE').agg({
+            'TOTAL_SERVICES': 'sum',
+            'TOTAL_REVENUE': 'sum'
+        }).reset_index()
+        
+        figures['service_revenue'] = px.pie(
+            service_summary,
+            values='TOTAL_REVENUE',
+            names='SERVICE_TYPE',
+            title='Revenue Distribution by Service Type'
+        )
+    
+    if len(ah_trends) > 0:
+        # Monthly service trends
+        monthly_summary = ah_trends.groupby('SERVICE_MONTH').agg({
+            'MONTHLY_SERVICES': 'sum',
+            'MONTHLY_REVENUE': 'sum',
+            'MONTHLY_SUCCESS_RATE': 'mean'
+        }).reset_index()
+        
+        figures['monthly_trend'] = px.line(
+            monthly_summary,
+            x='SERVICE_MONTH',
+            y='MONTHLY_SERVICES',
+            title='Monthly Service Volume Trend',
+            markers=True
+        )
+        
+        # Success rate trends by provider type
+        provider_trends = ah_trends.groupby(['SERVICE_MONTH', 'PROVIDER_CREDENTIALS']).agg({
+            'MONTHLY_SUCCESS_RATE': 'mean'
+        }).reset_index()
+        
+        figures['success_trends'] = px.line(
+            provider_trends,
+            x='SERVICE_MONTH',
+            y='MONTHLY_SUCCESS_RATE',
+            color='PROVIDER_CREDENTIALS',
+            title='Success Rate Trends by Provider Type',
+            markers=True
+        )
+    
+    if len(ah_dept_integration) > 0:
+        # Services per admission by department
+        dept_summary = ah_dept_integration.groupby('DEPARTMENT_NAME').agg({
+            'SERVICES_PROVIDED': 'sum',
+            'PATIENTS_SERVED': 'sum',
+            'SERVICES_PER_ADMISSION': 'mean'
+        }).reset_index().head(10)
+        
+        fig_dept_services = px.bar(
+            dept_summary,
+            x='DEPARTMENT_NAME',
+            y='SERVICES_PER_ADMISSION',
+            color='SERVICES_PROVIDED',
+            color_continuous_scale='Blues',
+            title='Allied Health Services per Admission by Department'
+        )
+        fig_dept_services.update_xaxes(tickangle=45)
+        figures['department_services'] = fig_dept_services
+        
+        # Department revenue contribution
+        dept_revenue = ah_dept_integration.groupby('DEPARTMENT_NAME')['DEPARTMENT_AH_REVENUE'].sum().reset_index().head(10)
+        
+        fig_dept_revenue = px.bar(
+            dept_revenue,
+            x='DEPARTMENT_NAME',
+            y='DEPARTMENT_AH_REVENUE',
+            title='Allied Health Revenue by Department'
+        )
+        fig_dept_revenue.update_xaxes(tickangle=45)
+        figures['department_revenue'] = fig_dept_revenue
+    
+    if len(ah_provider_performance) > 0:
+        dashboard.tables['provider_performance'] = ah_provider_performance
+        
+        # Top performers by revenue
+        top_providers = ah_provider_performance.head(10)
+        
+        fig_provider_revenue = px.bar(
+            top_providers,
+            x='PROVIDER_NAME',
+            y='TOTAL_PROVIDER_REVENUE',
+            color='PROVIDER_SUCCESS_RATE',
+            color_continuous_scale='RdYlGn',
+            title='Top 10 Providers by Revenue'
+        )
+        fig_provider_revenue.update_xaxes(tickangle=45)
+        figures['provider_revenue'] = fig_provider_revenue
+        
+        # Productivity analysis
+        figures['productivity'] = px.scatter(
+            ah_provider_performance,
+            x='SERVICES_PER_DAY',
+            y='REVENUE_PER_DAY',
+            size='UNIQUE_PATIENTS_SERVED',
+            color='PROVIDER_CREDENTIALS',
+            title='Provider Productivity Analysis',
+            hover_data=['PROVIDER_NAME', 'PROVIDER_SUCCESS_RATE']
+        )
+    
+    if len(ah_outcomes) > 0:
+        dashboard.tables['outcomes'] = ah_outcomes
+        
+        # Success rates by service type
+        fig_outcomes = px.bar(
+            ah_outcomes,
+            x='SERVICE_TYPE',
+            y='SUCCESSFUL_INTERVENTIONS',
+            color='PROVIDER_CREDENTIALS',
+            title='Successful Interventions by Service Type'
+        )
+        fig_outcomes.update_xaxes(tickangle=45)
+        figures['outcomes'] = fig_outcomes
+        
+        # Patient engagement levels
+        engagement_data = ah_outcomes[['SERVICE_TYPE', 'EXCELLENT_ENGAGEMENT', 'GOOD_ENGAGEMENT', 
+                                     'FAIR_ENGAGEMENT', 'POOR_ENGAGEMENT']].head(10)
+        
+        fig_engagement = go.Figure()
+        fig_engagement.add_trace(go.Bar(name='Excellent', x=engagement_data['SERVICE_TYPE'], 
+                                      y=engagement_data['EXCELLENT_ENGAGEMENT']))
+        fig_engagement.add_trace(go.Bar(name='Good', x=engagement_data['SERVICE_TYPE'], 
+                                      y=engagement_data['GOOD_ENGAGEMENT']))
+        fig_engagement.add_trace(go.Bar(name='Fair', x=engagement_data['SERVICE_TYPE'], 
+                                      y=engagement_data['FAIR_ENGAGEMENT']))
+        fig_engagement.add_trace(go.Bar(name='Poor', x=engagement_data['SERVICE_TYPE'], 
+                                      y=engagement_data['POOR_ENGAGEMENT']))
+        
+        fig_engagement.update_layout(title='Patient Engagement Levels by Service Type', barmode='stack')
+        fig_engagement.update_xaxes(tickangle=45)
+        figures['engagement'] = fig_engagement
+    
+    return dashboard
+
+
+def show(dashboard: Dashboard):
+    """Draw the dashboard built by ``build`` (live or from a snapshot)"""
+    figures = dashboard.figures
+    kpis = dashboard.kpis
+    
+    # Allied Health Overview
+    if kpis:
+        st.markdown("### Allied Health Services Overview")
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            st.metric("Total Services", f"{kpis['total_services']:,}")
+        with col2:
+            patients_ci = kpis['patients_ci']
+            st.metric("Patients Served", f"{kpis['unique_patients']:,}",
+                      help=f"Approximate: ±{patients_ci:,.0f} (95% CI)" if patients_ci is not None else None)
+        with col3:
+            st.metric("Revenue", f"${kpis['total_revenue']:,.0f}")
+        with col4:
+            st.metric("Success Rate", f"{kpis['avg_success_rate']:.1f}%")
+        with col5:
+            st.metric("Service Hours", f"{kpis['total_duration_hours']:,.0f}")
+        
+        # Service type analysis
+        st.markdown("### Service Type Performance")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['provider_services'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['service_revenue'], use_container_width=True)
+    
+    # Utilization trends
+    st.markdown("### Utilization Trends")
+    if 'monthly_trend' in figures:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['monthly_trend'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['success_trends'], use_container_width=True)
+    
+    # Department integration
+    st.markdown("### Department Integration Analysis")
+    if 'department_services' in figures:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['department_services'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['department_revenue'], use_container_width=True)
+    
+    # Provider performance
+    st.markdown("### Provider Performance Analysis")
+    ah_provider_performance = dashboard.tables.get('provider_performance', pd.DataFrame())
+    if len(ah_provider_performance) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['provider_revenue'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['productivity'], use_container_width=True)
+        
+        # Provider performance table
+        st.markdown("#### Provider Performance Summary")
+        display_providers = ah_provider_performance[['PROVIDER_NAME', 'PROVIDER_CREDENTIALS', 
+                                                    'TOTAL_SERVICES_PROVIDED', 'UNIQUE_PATIENTS_SERVED',
+                                                    'TOTAL_PROVIDER_REVENUE', 'PROVIDER_SUCCESS_RATE',
+                                                    'SERVICES_PER_DAY', 'REVENUE_PER_DAY']].copy()
+        
+        # Format financial columns
+        display_providers['TOTAL_PROVIDER_REVENUE'] = display_providers['TOTAL_PROVIDER_REVENUE'].apply(
+            lambda x: f"${x:,.0f}" if pd.notnull(x) else "$0"
+        )
+        display_providers['REVENUE_PER_DAY'] = display_providers['REVENUE_PER_DAY'].apply(
+            lambda x: f"${x:.0f}" if pd.notnull(x) else "$0"
+        )
+        display_providers['PROVIDER_SUCCESS_RATE'] = display_providers['PROVIDER_SUCCESS_RATE'].apply(
+            lambda x: f"{x:.1f}%" if pd.notnull(x) else "0%"
+        )
+        
+        st.dataframe(display_providers, use_container_width=True)
+    
+    # Outcomes analysis
+    st.markdown("### Clinical Outcomes & Patient Engagement")
+    ah_outcomes = dashboard.tables.get('outcomes', pd.DataFrame())
+    if len(ah_outcomes) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['outcomes'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['engagement'], use_container_width=True)
+    
+    # Action items and insights
+    st.markdown("### Action Items & Insights")
+    
+    if len(ah_provider_performance) > 0 and len(ah_outcomes) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Performance Alerts")
+            
+            render_alerts(evaluate_rules(ah_provider_performance, PROVIDER_ALERT_RULES))
+            
+            st.success("✅ **Quality Metrics**: All services meeting documentation standards")
+        
+        with col2:
+            st.markdown("#### Optimization Opportunities")
+            
+            # Revenue opportunities
+            render_alerts(evaluate_rules(ah_outcomes, SERVICE_OPPORTUNITY_RULES))
+            
+            # Follow-up optimization
+            st.markdown("**Follow-up Optimization:**")
+            st.markdown("- Standardize follow-up protocols across service types")
+            st.markdown("- Implement patient engagement improvement programs")
+            st.markdown("- Cross-train providers in high-demand service areas")
+
+
+def render(period_days: int):
+    """Render the Allied Health Coordinator dashboard"""
+    st.markdown("## 🏥 Allied Health Coordinator Dashboard")
+    st.markdown("*Comprehensive allied health services management and optimization*")
+    
+    # Served from the nightly snapshot unless approximate mode is on (see snapshots)
+    with st.spinner("Loading allied health analytics..."):
+        dashboard = snapshot_or_build("Allied Health Coordinator", build,
+                                      approximate=st.session_state.get("approximate", False))
+    render_snapshot_badge(dashboard)
+    
+    show(dashboard)
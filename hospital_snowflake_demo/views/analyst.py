@@ -0,0 +1,154 @@
+"""
+Healthcare Analyst dashboard
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from loaders import (
+    get_basic_stats,
+    get_financial_summary,
+    get_medication_analysis,
+    get_patient_demographics_summary,
+)
+
+
+def render(period_days: int):
+    """Render the Healthcare Analyst dashboard"""
+    st.markdown("## 📊 Healthcare Analyst Dashboard")
+    st.markdown("*Advanced analytics and business intelligence*")
+    
+    # Load data
+    with st.spinner("Loading hospital data..."):
+        basic_stats = get_basic_stats()
+    
+    # Executive summary
+    if len(basic_stats) > 0:
+        st.markdown("### Executive Summary")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        stats_dict = dict(zip(basic_stats['METRIC'], basic_stats['VALUE']))
+        
+        with col1:
+            st.metric("Patient Population", f"{stats_dict.get('Patients', 0):,}")
+        with col2:
+            st.metric("Total Admissions", f"{stats_dict.get('Admissions', 0):,}")
+        with col3:
+            st.metric("Clinical Procedures", f"{stats_dict.get('Procedures', 0):,}")
+        with col4:
+            total_services = stats_dict.get('Medications', 0) + stats_dict.get('Allied Health', 0)
+            st.metric("Total Services", f"{total_services:,}")
+    
+    # Advanced analytics
+    st.markdown("### Advanced Analytics")
+    
+    # Patient demographics analysis
+    with st.spinner("Loading demographic analysis..."):
+        demo_data = get_patient_demographics_summary(approximate=st.session_state.get("approximate", False))
+        
+        if len(demo_data) > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Age group distribution
+                age_summary = demo_data.groupby('AGE_GROUP')['PATIENT_COUNT'].sum().reset_index()
+                fig_age = px.pie(
+                    age_summary,
+                    values='PATIENT_COUNT',
+                    names='AGE_GROUP',
+                    title='Patient Population by Age Group'
+                )
+                st.plotly_chart(fig_age, use_container_width=True)
+            
+            with col2:
+                # Insurance distribution
+                insurance_summary = demo_data.groupby('INSURANCE_PROVIDER')['PATIENT_COUNT'].sum().reset_index()
+                fig_insurance = px.bar(
+                    insurance_summary,
+                    x='INSURANCE_PROVIDER',
+                    y='PATIENT_COUNT',
+                    title='Patient Distribution by Insurance'
+                )
+                fig_insurance.update_xaxes(tickangle=45)
+                st.plotly_chart(fig_insurance, use_container_width=True)
+    
+    # Financial performance
+    st.markdown("### Financial Performance Analysis")
+    with st.spinner("Loading financial analysis..."):
+        financial_data = get_financial_summary()
+        
+        if len(financial_data) > 0:
+            # Revenue analysis
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_total_revenue = px.treemap(
+                    financial_data.head(10),
+                    path=['DEPARTMENT_NAME'],
+                    values='TOTAL_REVENUE',
+                    title='Revenue by Department (Treemap)'
+                )
+                st.plotly_chart(fig_total_revenue, use_container_width=True)
+            
+            with col2:
+                # Revenue per admission
+                financial_data['REVENUE_PER_ADMISSION'] = financial_data['TOTAL_REVENUE'] / financial_data['TOTAL_ADMISSIONS']
+                
+                fig_efficiency = px.scatter(
+                    financial_data,
+                    x='TOTAL_ADMISSIONS',
+                    y='REVENUE_PER_ADMISSION',
+                    size='TOTAL_REVENUE',
+                    color='DEPARTMENT_NAME',
+                    title='Volume vs Revenue Efficiency'
+                )
+                st.plotly_chart(fig_efficiency, use_container_width=True)
+            
+            # Financial summary table
+            st.markdown("#### Financial Summary by Department")
+            display_financial = financial_data.copy()
+            financial_cols = ['TOTAL_ADMISSION_REVENUE', 'TOTAL_PROCEDURE_REVENUE', 
+                            'TOTAL_MEDICATION_REVENUE', 'TOTAL_ALLIED_HEALTH_REVENUE', 'TOTAL_REVENUE']
+            for col in financial_cols:
+                if col in display_financial.columns:
+                    display_financial[col] = display_financial[col].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "$0.00")
+            
+            st.dataframe(display_financial, use_container_width=True)
+    
+    # Operational efficiency
+    st.markdown("### Operational Efficiency Metrics")
+    
+    # Medication efficiency
+    with st.spinner("Loading medication efficiency..."):
+        med_data = get_medication_analysis()
+        
+        if len(med_data) > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Orders vs dispensings
+                med_data['DISPENSING_RATE'] = (med_data['TOTAL_DISPENSINGS'] / med_data['TOTAL_ORDERS'] * 100).round(2)
+                
+                fig_med_efficiency = px.bar(
+                    med_data.head(10),
+                    x='THERAPEUTIC_CATEGORY',
+                    y='DISPENSING_RATE',
+                    title='Medication Dispensing Efficiency (%)'
+                )
+                fig_med_efficiency.update_xaxes(tickangle=45)
+                st.plotly_chart(fig_med_efficiency, use_container_width=True)
+            
+            with col2:
+                # Cost per patient
+                med_data['COST_PER_PATIENT'] = med_data['TOTAL_MEDICATION_COST'] / med_data['UNIQUE_PATIENTS']
+                
+                fig_cost_efficiency = px.scatter(
+                    med_data,
+                    x='UNIQUE_PATIENTS',
+                    y='COST_PER_PATIENT',
+                    size='TOTAL_MEDICATION_COST',
+                    color='THERAPEUTIC_CATEGORY',
+                    title='Medication Cost per Patient'
+                )
+                st.plotly_chart(fig_cost_efficiency, use_container_width=True)
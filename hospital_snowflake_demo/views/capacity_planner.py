@@ -0,0 +1,366 @@
+"""
+Capacity Planning dashboard
+"""
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+
+from alerts import CAPACITY_ALERT_RULES, evaluate_rules, recommendation_priority, render_alerts
+from loaders import (
+    get_admission_forecasts,
+    get_bed_booking_patterns,
+    get_bed_capacity_analysis,
+    get_bed_turnover_analysis,
+    get_capacity_recommendations,
+    get_capacity_scenarios,
+)
+
+
+def render(period_days: int):
+    """Render the Capacity Planning dashboard"""
+    st.markdown("## 🛏️ Capacity Planning Dashboard")
+    st.markdown("*Bed utilization optimization and capacity management*")
+    
+    # Load capacity planning data
+    with st.spinner("Loading capacity planning data..."):
+        capacity_analysis = get_bed_capacity_analysis()
+        booking_patterns = get_bed_booking_patterns()
+        turnover_analysis = get_bed_turnover_analysis()
+        recommendations = get_capacity_recommendations()
+    
+    # Capacity overview metrics
+    if len(capacity_analysis) > 0:
+        st.markdown("### Capacity Overview")
+        
+        # Key metrics
+        total_beds = int(capacity_analysis['AVG_TOTAL_BEDS'].sum())
+        avg_utilization = float(capacity_analysis['AVG_UTILIZATION_RATE'].mean())
+        peak_utilization = float(capacity_analysis['PEAK_UTILIZATION'].max())
+        high_util_depts = len(capacity_analysis[capacity_analysis['AVG_UTILIZATION_RATE'] > 80])
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Beds", f"{total_beds:,}")
+        with col2:
+            st.metric("Avg Utilization", f"{avg_utilization:.1f}%")
+        with col3:
+            st.metric("Peak Utilization", f"{peak_utilization:.1f}%")
+        with col4:
+            st.metric("High Util. Depts", high_util_depts)
+    
+    # Utilization analysis
+    st.markdown("### Department Utilization Analysis")
+    if len(capacity_analysis) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Utilization rate by department
+            fig_util = px.bar(
+                capacity_analysis,
+                x='DEPARTMENT_NAME',
+                y='AVG_UTILIZATION_RATE',
+                color='AVG_UTILIZATION_RATE',
+                color_continuous_scale='RdYlGn_r',
+                title='Average Utilization Rate by Department (%)'
+            )
+            fig_util.update_xaxes(tickangle=45)
+            fig_util.add_hline(y=80, line_dash="dash", line_color="red", 
+                              annotation_text="Target Utilization (80%)")
+            st.plotly_chart(fig_util, use_container_width=True)
+        
+        with col2:
+            # Utilization volatility
+            fig_volatility = px.scatter(
+                capacity_analysis,
+                x='AVG_UTILIZATION_RATE',
+                y='UTILIZATION_VOLATILITY',
+                size='AVG_TOTAL_BEDS',
+                color='DEPARTMENT_NAME',
+                title='Utilization Rate vs Volatility',
+                hover_data=['PEAK_UTILIZATION', 'MIN_UTILIZATION']
+            )
+            st.plotly_chart(fig_volatility, use_container_width=True)
+        
+        # Detailed capacity table
+        st.markdown("#### Detailed Capacity Metrics")
+        display_capacity = capacity_analysis.copy()
+        numeric_cols = ['AVG_TOTAL_BEDS', 'AVG_OCCUPIED_BEDS', 'AVG_AVAILABLE_BEDS', 'AVG_MAINTENANCE_BEDS']
+        for col in numeric_cols:
+            if col in display_capacity.columns:
+                display_capacity[col] = display_capacity[col].round(1)
+        
+        # Color code utilization rates
+        def color_utilization(val):
+            if val > 90:
+                return 'background-color: #ffebee'  # Light red
+            elif val > 80:
+                return 'background-color: #fff3e0'  # Light orange
+            elif val < 50:
+                return 'background-color: #e8f5e8'  # Light green
+            return ''
+        
+        styled_df = display_capacity.style.applymap(color_utilization, subset=['AVG_UTILIZATION_RATE'])
+        st.dataframe(styled_df, use_container_width=True)
+    
+    # Booking patterns analysis
+    st.markdown("### Bed Booking Patterns")
+    if len(booking_patterns) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Revenue by bed type
+            fig_revenue_type = px.sunburst(
+                booking_patterns,
+                path=['DEPARTMENT_NAME', 'BED_TYPE'],
+                values='TOTAL_BED_REVENUE',
+                title='Bed Revenue by Department and Type'
+            )
+            st.plotly_chart(fig_revenue_type, use_container_width=True)
+        
+        with col2:
+            # Length of stay by bed type
+            fig_los_type = px.box(
+                booking_patterns,
+                x='BED_TYPE',
+                y='AVG_LENGTH_OF_STAY',
+                color='BED_TYPE',
+                title='Length of Stay Distribution by Bed Type'
+            )
+            fig_los_type.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_los_type, use_container_width=True)
+    
+    # Turnover analysis
+    st.markdown("### Bed Turnover Efficiency")
+    if len(turnover_analysis) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Annual turnover rates
+            fig_turnover = px.bar(
+                turnover_analysis,
+                x='DEPARTMENT_NAME',
+                y='ANNUAL_TURNOVER_RATE',
+                color='TURNOVER_CATEGORY',
+                title='Annual Bed Turnover Rate by Department',
+                color_discrete_map={
+                    'High Turnover': '#ff6b6b',
+                    'Medium Turnover': '#ffd93d',
+                    'Low Turnover': '#6bcf7f'
+                }
+            )
+            fig_turnover.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_turnover, use_container_width=True)
+        
+        with col2:
+            # Revenue efficiency
+            fig_efficiency = px.scatter(
+                turnover_analysis,
+                x='AVG_BOOKINGS_PER_BED',
+                y='AVG_REVENUE_PER_BED',
+                size='BEDS_ANALYZED',
+                color='DEPARTMENT_NAME',
+                title='Booking Volume vs Revenue per Bed'
+            )
+            st.plotly_chart(fig_efficiency, use_container_width=True)
+    
+    # Capacity recommendations
+    st.markdown("### Capacity Planning Recommendations")
+    if len(recommendations) > 0:
+        # Recommendations summary
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Current vs recommended capacity
+            fig_capacity_rec = px.bar(
+                recommendations.head(10),
+                x='DEPARTMENT_NAME',
+                y=['CURRENT_BEDS', 'RECOMMENDED_BED_CHANGE'],
+                title='Current Beds vs Recommended Changes',
+                barmode='group'
+            )
+            fig_capacity_rec.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_capacity_rec, use_container_width=True)
+        
+        with col2:
+            # Utilization vs revenue
+            fig_util_revenue = px.scatter(
+                recommendations,
+                x='UTILIZATION_PERCENTAGE',
+                y='TOTAL_REVENUE',
+                size='CURRENT_BEDS',
+                color='RECOMMENDATION',
+                title='Utilization vs Revenue Performance',
+                hover_data=['AVG_STAY_DAYS', 'TOTAL_BOOKINGS']
+            )
+            st.plotly_chart(fig_util_revenue, use_container_width=True)
+        
+        # Recommendations table
+        st.markdown("#### Capacity Planning Recommendations")
+        
+        # Create priority levels for recommendations
+        recommendations['PRIORITY'] = recommendation_priority(recommendations)
+        
+        # Display recommendations
+        display_rec = recommendations[['DEPARTMENT_NAME', 'CURRENT_BEDS', 'UTILIZATION_PERCENTAGE', 
+                                     'RECOMMENDED_BED_CHANGE', 'RECOMMENDATION', 'PRIORITY']].copy()
+        
+        # Format columns
+        display_rec['UTILIZATION_PERCENTAGE'] = display_rec['UTILIZATION_PERCENTAGE'].apply(lambda x: f"{x:.1f}%")
+        display_rec['RECOMMENDED_BED_CHANGE'] = display_rec['RECOMMENDED_BED_CHANGE'].apply(
+            lambda x: f"+{x}" if x > 0 else str(x) if x < 0 else "No Change"
+        )
+        
+        st.dataframe(display_rec, use_container_width=True)
+        
+        # Action items
+        st.markdown("#### Immediate Action Items")
+        
+        render_alerts(evaluate_rules(recommendations, CAPACITY_ALERT_RULES))
+    
+    # Admission and census forecasts
+    st.markdown("### Admission & Census Forecast")
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        forecast_dept = st.selectbox(
+            "Forecast Department",
+            ["All Departments"] + (recommendations['DEPARTMENT_NAME'].tolist() if len(recommendations) > 0 else [])
+        )
+    with col2:
+        horizon = st.slider("Forecast Horizon (days)", min_value=7, max_value=30, value=14)
+    with col3:
+        use_weather = st.checkbox("Weather covariates", help="Uses marketplace weather data when available")
+    
+    forecasts = get_admission_forecasts(horizon, use_weather)
+    if len(forecasts) > 0:
+        if forecast_dept != "All Departments":
+            dept_forecast = forecasts[forecasts['DEPARTMENT_NAME'] == forecast_dept]
+        else:
+            dept_forecast = forecasts.assign(FORECAST_VARIANCE=forecasts['FORECAST_STD'] ** 2).groupby('FORECAST_DATE').agg({
+                'ADMISSIONS_FORECAST': 'sum',
+                'FORECAST_VARIANCE': 'sum',
+                'CENSUS_FORECAST': 'sum'
+            }).reset_index()
+            std = dept_forecast['FORECAST_VARIANCE'] ** 0.5
+            dept_forecast['LOWER_BOUND'] = (dept_forecast['ADMISSIONS_FORECAST'] - 1.96 * std).clip(lower=0)
+            dept_forecast['UPPER_BOUND'] = dept_forecast['ADMISSIONS_FORECAST'] + 1.96 * std
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_forecast = go.Figure()
+            fig_forecast.add_trace(go.Scatter(x=dept_forecast['FORECAST_DATE'], y=dept_forecast['UPPER_BOUND'],
+                                              line=dict(width=0), showlegend=False, hoverinfo='skip'))
+            fig_forecast.add_trace(go.Scatter(x=dept_forecast['FORECAST_DATE'], y=dept_forecast['LOWER_BOUND'],
+                                              fill='tonexty', line=dict(width=0), name='95% interval'))
+            fig_forecast.add_trace(go.Scatter(x=dept_forecast['FORECAST_DATE'], y=dept_forecast['ADMISSIONS_FORECAST'],
+                                              mode='lines+markers', name='Forecast'))
+            fig_forecast.update_layout(title=f'Daily Admissions Forecast - {forecast_dept}')
+            st.plotly_chart(fig_forecast, use_container_width=True)
+        
+        with col2:
+            fig_census = px.line(
+                dept_forecast,
+                x='FORECAST_DATE',
+                y='CENSUS_FORECAST',
+                title=f'Projected Census - {forecast_dept}',
+                labels={'CENSUS_FORECAST': 'Occupied Beds', 'FORECAST_DATE': 'Date'}
+            )
+            if forecast_dept != "All Departments" and len(recommendations) > 0:
+                beds = recommendations.loc[recommendations['DEPARTMENT_NAME'] == forecast_dept, 'CURRENT_BEDS']
+                if len(beds) > 0:
+                    fig_census.add_hline(y=float(beds.iloc[0]), line_dash="dash", annotation_text="Current beds")
+            st.plotly_chart(fig_census, use_container_width=True)
+    else:
+        st.info("Not enough admission history to forecast")
+    
+    # Capacity planning tools
+    st.markdown("### Capacity Planning Tools")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Scenario Planning")
+        
+        # Interactive capacity planning
+        selected_dept = st.selectbox(
+            "Select Department for Scenario Analysis",
+            recommendations['DEPARTMENT_NAME'].tolist() if len(recommendations) > 0 else []
+        )
+        
+        if selected_dept:
+            dept_data = recommendations[recommendations['DEPARTMENT_NAME'] == selected_dept].iloc[0]
+            
+            st.markdown(f"**Current Status: {selected_dept}**")
+            st.write(f"- Current Beds: {dept_data['CURRENT_BEDS']}")
+            st.write(f"- Utilization: {dept_data['UTILIZATION_PERCENTAGE']:.1f}%")
+            st.write(f"- Monthly Revenue: ${dept_data['TOTAL_REVENUE']:,.2f}")
+            
+            # Scenario inputs
+            capacity_change = st.slider(
+                "Capacity Change (beds)",
+                min_value=-10,
+                max_value=20,
+                value=int(dept_data['RECOMMENDED_BED_CHANGE']),
+                help="Positive numbers add beds, negative numbers remove beds"
+            )
+            
+            # Scenario impact from the cached M/M/c grid (all departments, all bed changes)
+            scenarios = get_capacity_scenarios()
+            dept_scenarios = scenarios[scenarios['DEPARTMENT_NAME'] == selected_dept].set_index('BED_CHANGE')
+            new_capacity = dept_data['CURRENT_BEDS'] + capacity_change
+            if capacity_change in dept_scenarios.index:
+                scenario = dept_scenarios.loc[capacity_change]
+                new_utilization = scenario['UTILIZATION_PERCENTAGE']
+                revenue_impact = capacity_change * dept_data['TOTAL_REVENUE'] / dept_data['CURRENT_BEDS'] if dept_data['CURRENT_BEDS'] > 0 else 0
+                
+                st.markdown("**Scenario Results:**")
+                st.write(f"- New Capacity: {new_capacity} beds")
+                st.write(f"- Projected Utilization: {new_utilization:.1f}%")
+                st.write(f"- Probability No Bed Available: {scenario['WAIT_PROBABILITY']:.1%}")
+                st.write(f"- Expected Wait for a Bed: {scenario['EXPECTED_WAIT_HOURS']:.1f} hours")
+                st.write(f"- Revenue Impact: ${revenue_impact:,.2f}/month")
+                
+                if new_utilization > 95:
+                    st.error("⚠️ Still over capacity - consider larger increase")
+                elif new_utilization > 80:
+                    st.warning("📊 Near optimal utilization")
+                else:
+                    st.success("✅ Good utilization level")
+                
+                fig_scenario = px.line(
+                    dept_scenarios.reset_index(),
+                    x='BED_CHANGE',
+                    y='WAIT_PROBABILITY',
+                    title=f'Probability of Waiting for a Bed - {selected_dept}',
+                    labels={'BED_CHANGE': 'Capacity Change (beds)', 'WAIT_PROBABILITY': 'P(wait)'}
+                )
+                fig_scenario.add_vline(x=capacity_change, line_dash="dash")
+                st.plotly_chart(fig_scenario, use_container_width=True)
+            
+            with st.expander("All departments at this capacity change"):
+                st.dataframe(scenarios[scenarios['BED_CHANGE'] == capacity_change].drop(columns='BED_CHANGE'),
+                             use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.markdown("#### Export Capacity Report")
+        
+        if st.button("Generate Capacity Planning Report"):
+            # Combine all capacity data for export
+            if len(recommendations) > 0:
+                report_data = recommendations.copy()
+                report_data['REPORT_DATE'] = datetime.now().strftime('%Y-%m-%d')
+                report_data['GENERATED_BY'] = 'Capacity Planning Dashboard'
+                
+                csv_data = report_data.to_csv(index=False)
+                st.download_button(
+                    label="Download Capacity Report",
+                    data=csv_data,
+                    file_name=f"capacity_planning_report_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
+                
+                st.success("📄 Capacity planning report generated successfully!")
@@ -0,0 +1,310 @@
+"""
+Chief Executive Officer dashboard
+"""
+
+import json
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from alerts import DEPARTMENT_GROWTH_RULES, evaluate_rules, render_alerts
+from snapshots import Dashboard, render_snapshot_badge, snapshot_or_build
+from swr_cache import render_refresh_badge
+from loaders import (
+    get_department_performance_summary,
+    get_executive_kpis,
+    get_strategic_metrics,
+)
+
+
+def build() -> Dashboard:
+    """Run the executive loaders and build the dashboard's KPIs, tables and figures"""
+    executive_kpis = get_executive_kpis()
+    dept_performance = get_department_performance_summary()
+    strategic_metrics = get_strategic_metrics()
+    dashboard = Dashboard(row_counts={
+        'get_executive_kpis': len(executive_kpis),
+        'get_department_performance_summary': len(dept_performance),
+        'get_strategic_metrics': len(strategic_metrics),
+    })
+    
+    if len(executive_kpis) > 0:
+        kpi_data = executive_kpis.iloc[0]
+        dashboard.kpis = json.loads(kpi_data.to_json())
+        
+        # Revenue by service line
+        revenue_data = pd.DataFrame({
+            'Service Line': ['Admissions', 'Procedures', 'Medications', 'Allied Health', 'Bed Revenue'],
+            'Revenue': [
+                kpi_data['TOTAL_REVENUE'],
+                kpi_data['TOTAL_PROCEDURE_REVENUE'] or 0,
+                kpi_data['TOTAL_MEDICATION_REVENUE'] or 0,
+                kpi_data['TOTAL_ALLIED_REVENUE'] or 0,
+                kpi_data['TOTAL_BED_REVENUE'] or 0
+            ]
+        })
+        
+        dashboard.figures['revenue_breakdown'] = px.pie(
+            revenue_data,
+            values='Revenue',
+            names='Service Line',
+            title='Revenue Distribution by Service Line'
+        )
+        
+        # Key performance indicators
+        kpi_summary = pd.DataFrame({
+            'KPI': ['Total Admissions', 'Total Procedures', 'Medication Orders', 'Allied Services', 'Total Beds'],
+            'Value': [
+                kpi_data['TOTAL_ADMISSIONS'],
+                kpi_data['TOTAL_PROCEDURES'],
+                kpi_data['TOTAL_MEDICATION_ORDERS'],
+                kpi_data['TOTAL_ALLIED_SERVICES'],
+                kpi_data['TOTAL_BEDS']
+            ],
+            'Target': [35000, 42000, 95000, 32000, 250],  # Example targets
+        })
+        kpi_summary['Achievement %'] = (kpi_summary['Value'] / kpi_summary['Target'] * 100).round(1)
+        
+        fig_kpi_achievement = px.bar(
+            kpi_summary,
+            x='KPI',
+            y='Achievement %',
+            color='Achievement %',
+            color_continuous_scale='RdYlGn',
+            title='KPI Achievement vs Targets'
+        )
+        fig_kpi_achievement.add_hline(y=100, line_dash="dash", line_color="black", 
+                                    annotation_text="Target (100%)")
+        fig_kpi_achievement.update_xaxes(tickangle=45)
+        dashboard.figures['kpi_achievement'] = fig_kpi_achievement
+    
+    if len(dept_performance) > 0:
+        dashboard.tables['department_performance'] = dept_performance
+        
+        # Top performing departments by revenue
+        top_depts = dept_performance.head(10)
+        fig_dept_revenue = px.bar(
+            top_depts,
+            x='DEPARTMENT_NAME',
+            y='TOTAL_DEPARTMENT_REVENUE',
+            color='TOTAL_DEPARTMENT_REVENUE',
+            color_continuous_scale='Greens',
+            title='Top 10 Departments by Revenue'
+        )
+        fig_dept_revenue.update_xaxes(tickangle=45)
+        dashboard.figures['department_revenue'] = fig_dept_revenue
+        
+        # Department efficiency (revenue per admission)
+        efficiency = dept_performance.assign(
+            REVENUE_PER_ADMISSION=dept_performance['TOTAL_DEPARTMENT_REVENUE'] / dept_performance['ADMISSIONS']
+        )
+        
+        dashboard.figures['department_efficiency'] = px.scatter(
+            efficiency,
+            x='ADMISSIONS',
+            y='REVENUE_PER_ADMISSION',
+            size='TOTAL_DEPARTMENT_REVENUE',
+            color='SPECIALIZATION_TYPE',
+            title='Department Volume vs Revenue Efficiency',
+            hover_data=['DEPARTMENT_NAME', 'AVG_LENGTH_OF_STAY']
+        )
+    
+    if len(strategic_metrics) > 0:
+        # Monthly revenue trend
+        dashboard.figures['revenue_trend'] = px.line(
+            strategic_metrics.head(12),  # Last 12 months
+            x='month',
+            y='MONTHLY_REVENUE',
+            title='Monthly Revenue Trend (Last 12 Months)',
+            markers=True
+        )
+        
+        # Quality metrics
+        latest_metrics = strategic_metrics.iloc[0]
+        quality_data = pd.DataFrame({
+            'Quality Metric': ['Treatment Success Rate', 'Medication Safety Rate', 'Emergency Care Rate'],
+            'Current %': [
+                latest_metrics['TREATMENT_SUCCESS_RATE'],
+                latest_metrics['MEDICATION_SAFETY_RATE'],
+                latest_metrics['EMERGENCY_RATE']
+            ],
+            'Target %': [85, 95, 25]  # Example targets
+        })
+        
+        fig_quality_metrics = px.bar(
+            quality_data,
+            x='Quality Metric',
+            y=['Current %', 'Target %'],
+            title='Quality Metrics vs Targets',
+            barmode='group'
+        )
+        fig_quality_metrics.update_xaxes(tickangle=45)
+        dashboard.figures['quality_metrics'] = fig_quality_metrics
+    
+    return dashboard
+
+
+def show(dashboard: Dashboard):
+    """Draw the dashboard built by ``build`` (live or from a snapshot)"""
+    figures = dashboard.figures
+    
+    # Executive KPIs
+    if dashboard.kpis:
+        st.markdown("### Hospital Performance Overview")
+        
+        kpi_data = dashboard.kpis
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            # Calculate total hospital revenue properly (avoid double counting)
+            total_hospital_revenue = (
+                float(kpi_data['TOTAL_REVENUE'] or 0) + 
+                float(kpi_data['TOTAL_PROCEDURE_REVENUE'] or 0) + 
+                float(kpi_data['TOTAL_MEDICATION_REVENUE'] or 0) + 
+                float(kpi_data['TOTAL_ALLIED_REVENUE'] or 0) + 
+                float(kpi_data['TOTAL_BED_REVENUE'] or 0)
+            )
+            revenue_millions = total_hospital_revenue / 1000000
+            st.metric(
+                "Revenue", 
+                f"${revenue_millions:.1f}M",
+                help="Combined revenue from all service lines"
+            )
+        with col2:
+            # Format patients in thousands
+            patients_thousands = kpi_data['TOTAL_PATIENTS'] / 1000
+            st.metric(
+                "Patients", 
+                f"{patients_thousands:.0f}K",
+                help="Total unique patients served"
+            )
+        with col3:
+            st.metric(
+                "Bed Util.", 
+                f"{kpi_data['BED_UTILIZATION_RATE']:.1f}%",
+                help="Overall hospital bed utilization rate"
+            )
+        with col4:
+            # Use the emergency rate already calculated in the query
+            emergency_rate = kpi_data['EMERGENCY_RATE'] if 'EMERGENCY_RATE' in kpi_data else 0
+            st.metric(
+                "Emergency", 
+                f"{emergency_rate:.1f}%",
+                help="Percentage of emergency admissions"
+            )
+        with col5:
+            st.metric(
+                "Avg LOS", 
+                f"{kpi_data['AVG_LENGTH_OF_STAY']:.1f}d",
+                help="Average patient length of stay"
+            )
+        
+        # Revenue breakdown
+        st.markdown("### Revenue Analysis")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['revenue_breakdown'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['kpi_achievement'], use_container_width=True)
+    
+    # Department performance
+    st.markdown("### Department Performance Summary")
+    dept_performance = dashboard.tables.get('department_performance', pd.DataFrame())
+    if len(dept_performance) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['department_revenue'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['department_efficiency'], use_container_width=True)
+        
+        # Executive summary table
+        st.markdown("#### Executive Department Summary")
+        display_dept = dept_performance[['DEPARTMENT_NAME', 'ADMISSIONS', 'TOTAL_DEPARTMENT_REVENUE', 
+                                       'AVG_LENGTH_OF_STAY', 'EMERGENCY_RATE']].copy()
+        
+        # Format financial columns
+        display_dept['TOTAL_DEPARTMENT_REVENUE'] = display_dept['TOTAL_DEPARTMENT_REVENUE'].apply(
+            lambda x: f"${x:,.0f}" if pd.notnull(x) else "$0"
+        )
+        display_dept['AVG_LENGTH_OF_STAY'] = display_dept['AVG_LENGTH_OF_STAY'].apply(
+            lambda x: f"{x:.1f} days" if pd.notnull(x) else "N/A"
+        )
+        display_dept['EMERGENCY_RATE'] = display_dept['EMERGENCY_RATE'].apply(
+            lambda x: f"{x:.1f}%" if pd.notnull(x) else "0%"
+        )
+        
+        st.dataframe(display_dept, use_container_width=True)
+    
+    # Strategic trends
+    st.markdown("### Strategic Trends & Quality Metrics")
+    if 'revenue_trend' in figures:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(figures['revenue_trend'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(figures['quality_metrics'], use_container_width=True)
+    
+    # Strategic alerts and insights
+    st.markdown("### Strategic Insights & Alerts")
+    
+    # Executive alerts based on data
+    if len(dept_performance) > 0:
+        # Revenue concentration risk
+        top_3_revenue = dept_performance.head(3)['TOTAL_DEPARTMENT_REVENUE'].sum()
+        total_revenue = dept_performance['TOTAL_DEPARTMENT_REVENUE'].sum()
+        concentration_risk = (top_3_revenue / total_revenue * 100) if total_revenue > 0 else 0
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### Strategic Alerts")
+            
+            if concentration_risk > 60:
+                st.warning(f"⚠️ **Revenue Concentration Risk**: Top 3 departments generate {concentration_risk:.1f}% of revenue")
+            
+            # Check for departments with declining performance
+            low_performers = dept_performance[dept_performance['EMERGENCY_RATE'] > 70]
+            if len(low_performers) > 0:
+                st.error(f"🚨 **High Emergency Rate**: {len(low_performers)} departments have >70% emergency admissions")
+            
+            # Capacity alerts
+            if dashboard.kpis and dashboard.kpis['BED_UTILIZATION_RATE'] > 85:
+                st.warning("🛏️ **Capacity Alert**: Hospital-wide bed utilization above 85%")
+            
+            st.success("✅ **Data Quality**: All systems reporting current data")
+        
+        with col2:
+            st.markdown("#### Growth Opportunities")
+            
+            # Identify growth opportunities
+            render_alerts(evaluate_rules(dept_performance, DEPARTMENT_GROWTH_RULES))
+            
+            # Service line expansion
+            st.markdown("**Service Line Expansion:**")
+            st.markdown("- Allied Health services showing strong growth")
+            st.markdown("- Medication management optimization potential")
+            st.markdown("- Bed utilization efficiency improvements available")
+
+
+def render(period_days: int):
+    """Render the Chief Executive Officer dashboard"""
+    st.markdown("## 🏛️ Chief Executive Officer Dashboard")
+    st.markdown("*Strategic oversight and executive performance metrics*")
+    
+    # Served from the nightly snapshot when current (see snapshots)
+    with st.spinner("Loading executive metrics..."):
+        dashboard = snapshot_or_build("CEO", build)
+    if dashboard.rendered_at is None:
+        render_refresh_badge(get_executive_kpis, get_strategic_metrics)
+    else:
+        render_snapshot_badge(dashboard)
+    
+    show(dashboard)
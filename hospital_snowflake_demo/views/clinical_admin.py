@@ -0,0 +1,163 @@
+"""
+Clinical Administrator dashboard
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from app_session import get_role_session
+from approx_query import ci_column
+from loaders import (
+    CURRENT_ADMISSIONS_TABLE,
+    get_basic_stats,
+    get_bed_utilization,
+    get_department_summary,
+    get_financial_summary,
+)
+from paginated_table import render_paginated_table
+
+
+def render(period_days: int):
+    """Render the Clinical Administrator dashboard"""
+    st.markdown("## 👨‍⚕️ Clinical Administrator Dashboard")
+    st.markdown("*Complete oversight of hospital operations, quality, and performance*")
+    
+    # Load data
+    with st.spinner("Loading hospital data..."):
+        basic_stats = get_basic_stats()
+        dept_summary = get_department_summary(approximate=st.session_state.get("approximate", False))
+        bed_utilization = get_bed_utilization()
+    
+    # High-level metrics
+    if len(basic_stats) > 0:
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        stats_dict = dict(zip(basic_stats['METRIC'], basic_stats['VALUE']))
+        
+        with col1:
+            st.metric("Total Patients", f"{stats_dict.get('Patients', 0):,}")
+        with col2:
+            st.metric("Total Admissions", f"{stats_dict.get('Admissions', 0):,}")
+        with col3:
+            st.metric("Total Procedures", f"{stats_dict.get('Procedures', 0):,}")
+        with col4:
+            st.metric("Medication Orders", f"{stats_dict.get('Medications', 0):,}")
+        with col5:
+            st.metric("Allied Health Services", f"{stats_dict.get('Allied Health', 0):,}")
+    
+    # Department Performance
+    st.markdown("### Department Performance Overview")
+    if len(dept_summary) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_dept_admissions = px.bar(
+                dept_summary, 
+                x='DEPARTMENT_NAME', 
+                y='ADMISSIONS',
+                error_y=ci_column(dept_summary, 'ADMISSIONS'),
+                title='Admissions by Department',
+                color='ADMISSIONS',
+                color_continuous_scale='Blues'
+            )
+            fig_dept_admissions.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_dept_admissions, use_container_width=True)
+        
+        with col2:
+            fig_dept_revenue = px.bar(
+                dept_summary, 
+                x='DEPARTMENT_NAME', 
+                y='AVG_CHARGES',
+                title='Average Charges by Department',
+                color='AVG_CHARGES',
+                color_continuous_scale='Greens'
+            )
+            fig_dept_revenue.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_dept_revenue, use_container_width=True)
+        
+        # Department details table
+        st.markdown("### Department Details")
+        display_df = dept_summary.copy()
+        display_df['AVG_CHARGES'] = display_df['AVG_CHARGES'].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "$0.00")
+        st.dataframe(display_df, use_container_width=True)
+    
+    # Bed Utilization
+    st.markdown("### Bed Utilization Management")
+    if len(bed_utilization) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_bed_util = px.bar(
+                bed_utilization,
+                x='DEPARTMENT_NAME',
+                y='UTILIZATION_RATE',
+                title='Bed Utilization Rate by Department (%)',
+                color='UTILIZATION_RATE',
+                color_continuous_scale='RdYlGn_r'
+            )
+            fig_bed_util.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_bed_util, use_container_width=True)
+        
+        with col2:
+            # Bed capacity overview
+            fig_bed_capacity = px.scatter(
+                bed_utilization,
+                x='TOTAL_BEDS',
+                y='UTILIZATION_RATE',
+                size='OCCUPIED_BEDS',
+                color='DEPARTMENT_NAME',
+                title='Bed Capacity vs Utilization',
+                hover_data=['AVAILABLE_BEDS']
+            )
+            st.plotly_chart(fig_bed_capacity, use_container_width=True)
+    
+    # Patient-level admissions list
+    st.markdown("### Current Admissions")
+    render_paginated_table(
+        get_role_session(),
+        CURRENT_ADMISSIONS_TABLE,
+        key="clinical_admin_admissions",
+        filter_options={
+            'Department': dept_summary['DEPARTMENT_NAME'].tolist() if len(dept_summary) > 0 else [],
+            'Admission Type': ['Emergency', 'Elective', 'Urgent'],
+        }
+    )
+    
+    # Financial Analysis
+    st.markdown("### Financial Performance")
+    with st.spinner("Loading financial data..."):
+        financial_data = get_financial_summary()
+        
+        if len(financial_data) > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_revenue = px.pie(
+                    financial_data,
+                    values='TOTAL_REVENUE',
+                    names='DEPARTMENT_NAME',
+                    title='Revenue Distribution by Department'
+                )
+                st.plotly_chart(fig_revenue, use_container_width=True)
+            
+            with col2:
+                # Revenue breakdown
+                revenue_breakdown = financial_data[['DEPARTMENT_NAME', 'TOTAL_ADMISSION_REVENUE', 
+                                                 'TOTAL_PROCEDURE_REVENUE', 'TOTAL_MEDICATION_REVENUE', 
+                                                 'TOTAL_ALLIED_HEALTH_REVENUE']].head(10)
+                
+                fig_breakdown = go.Figure()
+                fig_breakdown.add_trace(go.Bar(name='Admissions', x=revenue_breakdown['DEPARTMENT_NAME'], 
+                                             y=revenue_breakdown['TOTAL_ADMISSION_REVENUE']))
+                fig_breakdown.add_trace(go.Bar(name='Procedures', x=revenue_breakdown['DEPARTMENT_NAME'], 
+                                             y=revenue_breakdown['TOTAL_PROCEDURE_REVENUE']))
+                fig_breakdown.add_trace(go.Bar(name='Medications', x=revenue_breakdown['DEPARTMENT_NAME'], 
+                                             y=revenue_breakdown['TOTAL_MEDICATION_REVENUE']))
+                fig_breakdown.add_trace(go.Bar(name='Allied Health', x=revenue_breakdown['DEPARTMENT_NAME'], 
+                                             y=revenue_breakdown['TOTAL_ALLIED_HEALTH_REVENUE']))
+                
+                fig_breakdown.update_layout(title='Revenue Breakdown by Service Type', barmode='stack')
+                fig_breakdown.update_xaxes(tickangle=45)
+                st.plotly_chart(fig_breakdown, use_container_width=True)
@@ -0,0 +1,167 @@
+"""
+Nurse dashboard
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+
+from app_session import get_role_session
+from approx_query import ci_column
+from bed_board import REFRESH_INTERVAL
+from loaders import (
+    BED_ASSIGNMENTS_TABLE,
+    get_allied_health_summary,
+    get_bed_board,
+    get_bed_utilization,
+    get_medication_analysis,
+)
+from paginated_table import render_paginated_table
+
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def render_bed_board():
+    """Render the live bed board, refreshed from availability changes only"""
+    bed_utilization = get_bed_utilization()
+    board = get_bed_board()
+    if len(bed_utilization) == 0:
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        total_beds = int(bed_utilization['TOTAL_BEDS'].sum()) if len(bed_utilization) > 0 else 0
+        occupied_beds = int(bed_utilization['OCCUPIED_BEDS'].sum()) if len(bed_utilization) > 0 else 0
+        available_beds = int(bed_utilization['AVAILABLE_BEDS'].sum()) if len(bed_utilization) > 0 else 0
+        
+        st.metric("Total Beds", total_beds)
+        st.metric("Occupied", occupied_beds)
+        st.metric("Available", available_beds)
+    
+    with col2:
+        # Bed status pie chart
+        bed_status_data = pd.DataFrame({
+            'Status': ['Occupied', 'Available'],
+            'Count': [occupied_beds, available_beds]
+        })
+        
+        fig_bed_status = px.pie(
+            bed_status_data,
+            values='Count',
+            names='Status',
+            title='Current Bed Status',
+            color_discrete_map={'Occupied': '#ff6b6b', 'Available': '#51cf66'}
+        )
+        st.plotly_chart(fig_bed_status, use_container_width=True)
+    
+    # Department bed status; departments changed by the last delta are highlighted
+    st.markdown("#### Bed Status by Department")
+    changed = board.changed_departments
+    st.dataframe(
+        bed_utilization.style.apply(
+            lambda row: ['background-color: #fff3bf' if row['DEPARTMENT_NAME'] in changed else ''] * len(row),
+            axis=1
+        ),
+        use_container_width=True
+    )
+    refreshed = f"{len(changed)} department(s) changed" if changed else "no department changed"
+    st.caption(f"Live bed board: {board.last_delta_rows} availability rows applied at the last refresh, "
+               f"{refreshed}; refreshes every {int(REFRESH_INTERVAL.total_seconds())} seconds")
+
+
+def render(period_days: int):
+    """Render the Nurse dashboard"""
+    st.markdown("## 👩‍⚕️ Nurse Dashboard")
+    st.markdown("*Patient care coordination and operational support*")
+    
+    # Load data
+    with st.spinner("Loading hospital data..."):
+        bed_utilization = get_bed_utilization()
+    
+    # Current shift overview
+    current_hour = datetime.now().hour
+    if 7 <= current_hour < 15:
+        shift = "Day Shift (7 AM - 3 PM)"
+    elif 15 <= current_hour < 23:
+        shift = "Evening Shift (3 PM - 11 PM)"
+    else:
+        shift = "Night Shift (11 PM - 7 AM)"
+    
+    st.info(f"🕐 Current Shift: {shift}")
+    
+    # Bed management
+    st.markdown("### Bed Management")
+    render_bed_board()
+    
+    # Patient-level bed assignments
+    st.markdown("### Bed Assignments")
+    render_paginated_table(
+        get_role_session(),
+        BED_ASSIGNMENTS_TABLE,
+        key="nurse_bed_assignments",
+        filter_options={
+            'Department': bed_utilization['DEPARTMENT_NAME'].tolist() if len(bed_utilization) > 0 else [],
+            'Bed Type': ['Standard', 'ICU', 'Private', 'Semi-Private', 'Isolation'],
+        }
+    )
+    
+    # Patient care tasks
+    st.markdown("### Patient Care Coordination")
+    
+    # Allied health scheduling
+    with st.spinner("Loading allied health data..."):
+        allied_data = get_allied_health_summary(approximate=st.session_state.get("approximate", False))
+        
+        if len(allied_data) > 0:
+            st.markdown("#### Allied Health Services Today")
+            
+            # Filter for relevant services
+            nursing_relevant = allied_data[allied_data['PROVIDER_CREDENTIALS'].isin(['PT', 'OT', 'RRT', 'RD'])]
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_services = px.bar(
+                    nursing_relevant,
+                    x='PROVIDER_CREDENTIALS',
+                    y='TOTAL_SERVICES',
+                    error_y=ci_column(nursing_relevant, 'TOTAL_SERVICES'),
+                    title='Services by Provider Type',
+                    color='SUCCESS_RATE',
+                    color_continuous_scale='RdYlGn'
+                )
+                st.plotly_chart(fig_services, use_container_width=True)
+            
+            with col2:
+                # Success rates
+                fig_success = px.scatter(
+                    nursing_relevant,
+                    x='TOTAL_SERVICES',
+                    y='SUCCESS_RATE',
+                    error_x=ci_column(nursing_relevant, 'TOTAL_SERVICES'),
+                    size='TOTAL_REVENUE',
+                    color='PROVIDER_CREDENTIALS',
+                    title='Service Volume vs Success Rate'
+                )
+                st.plotly_chart(fig_success, use_container_width=True)
+    
+    # Medication administration
+    st.markdown("### Medication Administration")
+    with st.spinner("Loading medication data..."):
+        med_data = get_medication_analysis()
+        
+        if len(med_data) > 0:
+            # Top medications by volume
+            top_meds = med_data.head(10)
+            
+            fig_med_volume = px.bar(
+                top_meds,
+                x='MEDICATION_CLASS',
+                y='TOTAL_DISPENSINGS',
+                title='Medication Administration Volume',
+                color='TOTAL_DISPENSINGS',
+                color_continuous_scale='Blues'
+            )
+            fig_med_volume.update_xaxes(tickangle=45)
+            st.plotly_chart(fig_med_volume, use_container_width=True)
@@ -0,0 +1,150 @@
+"""
+Physician dashboard
+"""
+
+import time
+
+import streamlit as st
+import plotly.express as px
+
+from loaders import (
+    get_admission_cube,
+    get_admission_slice,
+    get_admission_trends,
+    get_medication_analysis,
+)
+
+
+def render(period_days: int):
+    """Render the Physician dashboard"""
+    st.markdown("## 👩‍⚕️ Physician Dashboard")
+    st.markdown("*Clinical insights and patient care analytics*")
+    
+    # Load data
+    with st.spinner("Loading hospital data..."):
+        admission_trends = get_admission_trends(period_days)
+    
+    # Patient care metrics
+    if len(admission_trends) > 0:
+        col1, col2, col3 = st.columns(3)
+        
+        total_admissions = int(admission_trends['DAILY_ADMISSIONS'].sum()) if len(admission_trends) > 0 else 0
+        avg_daily_admissions = float(admission_trends['DAILY_ADMISSIONS'].mean()) if len(admission_trends) > 0 else 0
+        emergency_total = int(admission_trends['EMERGENCY_ADMISSIONS'].sum()) if len(admission_trends) > 0 else 0
+        emergency_rate = (emergency_total / total_admissions * 100) if total_admissions > 0 else 0
+        
+        with col1:
+            st.metric("Total Admissions", f"{total_admissions:,}")
+        with col2:
+            st.metric("Daily Average", f"{avg_daily_admissions:.1f}")
+        with col3:
+            st.metric("Emergency Rate", f"{emergency_rate:.1f}%")
+    
+    # Clinical trends
+    st.markdown("### Clinical Trends")
+    if len(admission_trends) > 0:
+        cube = get_admission_cube()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            departments = st.multiselect("Departments", cube.labels('DEPARTMENT_NAME', period_days),
+                                         key="physician_departments")
+        with col2:
+            admission_types = st.multiselect("Admission Types", cube.labels('ADMISSION_TYPE', period_days),
+                                             key="physician_admission_types")
+        with col3:
+            weather_bands = cube.labels('WEATHER', period_days)
+            weather = st.multiselect("Weather", weather_bands, key="physician_weather", disabled=len(weather_bands) < 2,
+                                     help="Daily weather bands from the marketplace weather share")
+        with col4:
+            grain = st.radio("Grain", ['day', 'week', 'month'], format_func=str.title, horizontal=True,
+                             key="physician_grain")
+        
+        # Filter changes are answered from the in-memory cube, not the warehouse
+        slice_start = time.perf_counter()
+        trends = get_admission_slice(period_days, grain, departments, admission_types, weather)
+        by_department = get_admission_slice(period_days, None, departments, admission_types, weather,
+                                            by_department=True)
+        slice_ms = (time.perf_counter() - slice_start) * 1000
+        
+        if len(trends) > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_admissions = px.line(
+                    trends,
+                    x='PERIOD',
+                    y='ADMISSIONS',
+                    title=f'Admission Trends by {grain.title()}'
+                )
+                st.plotly_chart(fig_admissions, use_container_width=True)
+            
+            with col2:
+                fig_emergency = px.area(
+                    trends,
+                    x='PERIOD',
+                    y='EMERGENCY_ADMISSIONS',
+                    title='Emergency Admissions Trend'
+                )
+                st.plotly_chart(fig_emergency, use_container_width=True)
+            
+            fig_departments = px.bar(
+                by_department.sort_values('ADMISSIONS', ascending=False),
+                x='DEPARTMENT_NAME',
+                y='ADMISSIONS',
+                color='AVG_LOS_DAYS',
+                title='Admissions by Department',
+                color_continuous_scale='Blues'
+            )
+            st.plotly_chart(fig_departments, use_container_width=True)
+        else:
+            st.info("No admissions match the selected filters")
+        
+        stats = cube.stats()
+        st.caption(f"Sliced in {slice_ms:.1f} ms from the in-memory admission cube; {stats['local_hits']} of "
+                   f"{stats['requests']} requests answered without a warehouse query ({stats['local_rate']:.0%})")
+    
+    # Medication insights
+    st.markdown("### Medication Management")
+    with st.spinner("Loading medication data..."):
+        med_data = get_medication_analysis()
+        
+        if len(med_data) > 0:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_med_class = px.pie(
+                    med_data.head(10),
+                    values='TOTAL_ORDERS',
+                    names='MEDICATION_CLASS',
+                    title='Medication Orders by Class'
+                )
+                st.plotly_chart(fig_med_class, use_container_width=True)
+            
+            with col2:
+                fig_med_cost = px.bar(
+                    med_data.head(10),
+                    x='THERAPEUTIC_CATEGORY',
+                    y='TOTAL_MEDICATION_COST',
+                    title='Medication Costs by Category'
+                )
+                fig_med_cost.update_xaxes(tickangle=45)
+                st.plotly_chart(fig_med_cost, use_container_width=True)
+    
+    # Patient safety alerts
+    st.markdown("### Patient Safety Alerts")
+    
+    # Simulated alerts for demo
+    alerts = [
+        {"type": "Drug Interaction", "priority": "High", "count": 3, "description": "Potential drug interactions identified"},
+        {"type": "Allergy Alert", "priority": "Medium", "count": 7, "description": "Allergy warnings for new medications"},
+        {"type": "Dosage Review", "priority": "Low", "count": 12, "description": "Dosages requiring physician review"}
+    ]
+    
+    for alert in alerts:
+        priority_class = f"{alert['priority'].lower()}-priority"
+        st.markdown(f"""
+        <div class="persona-card">
+            <strong class="{priority_class}">{alert['type']}</strong> - {alert['count']} items<br>
+            <small>{alert['description']}</small>
+        </div>
+        """, unsafe_allow_html=True)
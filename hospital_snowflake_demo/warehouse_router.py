@@ -0,0 +1,205 @@
+"""
+Cost-based warehouse routing for dashboard queries
+
+The setup scripts create warehouses of different sizes, but every loader
+used to run on whatever warehouse its session had. WarehouseRouter sends each
+query to a warehouse tier by its estimated cost:
+
+- ``light`` (HOSPITAL_ADHOC_WH, SMALL): lookups and small aggregations
+- ``heavy`` (HOSPITAL_ANALYTICS_WH, LARGE): queries estimated to run for
+  HEAVY_AFTER or longer on the light warehouse, such as multi-join
+  aggregations over the admission history
+
+A query's cost is estimated in seconds on the light warehouse:
+
+- From history: the median of its recent run times, scaled by warehouse size.
+  For example, a second on a LARGE warehouse (8 nodes) counts as four on a
+  SMALL one (2 nodes).
+- From ``EXPLAIN USING JSON`` when it has not run yet: bytes to scan at
+  SCAN_RATE, plus JOIN_COST for each join.
+
+EXPLAIN runs once per query per process, because history takes over after
+the first run. A query cancelled by its timeout records at least the time it
+ran, so it moves to the heavy warehouse next time.
+
+Queries are keyed by loader and query shape: the SQL text with its literals
+replaced by placeholders, so runs differing only in their values (a new
+watermark, another date range) share their history. At most MAX_QUERIES
+shapes are kept, least recently run first out. Every decision and its outcome is
+logged and kept in ``recent()``. On a session pool, routing checks out a
+session bound to the warehouse. On a single Snowpark session, ``USE
+WAREHOUSE`` and the query submission happen under one lock. The local DuckDB
+backend has no warehouses, so decisions are logged but not applied.
+"""
+
+import json
+import logging
+import os
+import re
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Tier -> (warehouse, size); names can be overridden per deployment
+WAREHOUSE_TIERS = {
+    'light': (os.environ.get("HOSPITAL_DEMO_LIGHT_WAREHOUSE", "HOSPITAL_ADHOC_WH"), 'SMALL'),
+    'heavy': (os.environ.get("HOSPITAL_DEMO_HEAVY_WAREHOUSE", "HOSPITAL_ANALYTICS_WH"), 'LARGE'),
+}
+WAREHOUSE_NODES = {'X-SMALL': 1, 'SMALL': 2, 'MEDIUM': 4, 'LARGE': 8, 'X-LARGE': 16}
+HEAVY_AFTER = timedelta(seconds=float(os.environ.get("HOSPITAL_DEMO_HEAVY_QUERY_SECONDS", 5)))
+SCAN_RATE = 200 * 1024 ** 2  # bytes per second scanned by the light warehouse
+JOIN_COST = 0.5              # seconds per join on the light warehouse
+HISTORY_SIZE = 20
+MAX_QUERIES = 500
+RECENT_DECISIONS = 100
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def query_shape(query: str) -> str:
+    """A query's text with whitespace collapsed and string and numeric literals replaced by ?"""
+    return LITERALS.sub('?', ' '.join(query.split()))
+
+
+def _bounded_put(entries: OrderedDict, key, value, limit: int):
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > limit:
+        entries.popitem(last=False)
+
+
+def explain_cost(session, query: str, params=None) -> dict:
+    """Bytes and partitions to scan, joins and peak estimated rows in a query's plan
+
+    From EXPLAIN USING JSON, or the local backend's plan. Snowflake plans
+    carry no row estimates and DuckDB plans no partitions; those are None.
+    """
+    if hasattr(session, 'explain_cost'):
+        return session.explain_cost(query, params)
+    plan = json.loads(session.sql(f"EXPLAIN USING JSON {query}", params=params).collect()[0][0])
+    operations = [op for step in plan.get('Operations', []) for op in step]
+    stats = plan.get('GlobalStats', {})
+    return {'bytes': stats.get('bytesAssigned', 0), 'partitions': stats.get('partitionsAssigned'), 'rows': None,
+            'joins': sum('Join' in op.get('operation', '') for op in operations)}
+
+
+class WarehouseSession:
+    """A Snowpark session whose queries are submitted on one warehouse"""
+
+    def __init__(self, session, warehouse: str, lock: threading.Lock):
+        self._session = session
+        self.warehouse = warehouse
+        self._lock = lock
+
+    def sql(self, query: str, params=None) -> 'WarehouseFrame':
+        return WarehouseFrame(self, self._session.sql(query, params=params))
+
+
+class WarehouseFrame:
+    """DataFrame submitted right after ``USE WAREHOUSE``, under the session's routing lock"""
+
+    def __init__(self, session: WarehouseSession, frame):
+        self._session = session
+        self._frame = frame
+
+    def to_pandas(self, block: bool = True):
+        # A query runs on the warehouse current at submission, so the lock is only held until then
+        with self._session._lock:
+            try:
+                self._session._session.use_warehouse(self._session.warehouse)
+            except Exception:
+                logger.warning("Cannot use %s; running on the session's warehouse", self._session.warehouse,
+                               exc_info=True)
+            job = self._frame.to_pandas(block=False)
+        return job if not block else job.result()
+
+
+class WarehouseRouter:
+    """Routes queries to a warehouse tier by estimated cost and logs the outcomes"""
+
+    def __init__(self, tiers: dict = None, heavy_after: timedelta = HEAVY_AFTER, explain=explain_cost,
+                 clock=time.monotonic):
+        self.tiers = tiers or WAREHOUSE_TIERS
+        self.heavy_after = heavy_after
+        self._explain = explain
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._history = OrderedDict()
+        self._explained = OrderedDict()
+        self._recent = deque(maxlen=RECENT_DECISIONS)
+
+    def _nodes(self, tier: str) -> int:
+        return WAREHOUSE_NODES[self.tiers[tier][1]]
+
+    def estimate(self, session, key, query: str, params=None) -> tuple:
+        """(seconds on the light warehouse, source) from history, else EXPLAIN"""
+        with self._lock:
+            history = list(self._history.get(key, ()))
+            explained = key in self._explained
+            estimate = self._explained.get(key)
+        if history:
+            return statistics.median(history), 'history'
+        if not explained:
+            try:
+                plan = self._explain(session, query, params)
+                estimate = plan['bytes'] / SCAN_RATE + plan['joins'] * JOIN_COST
+            except Exception:
+                logger.debug("EXPLAIN failed; routing without an estimate", exc_info=True)
+            with self._lock:
+                _bounded_put(self._explained, key, estimate, MAX_QUERIES)
+        return estimate, 'explain' if estimate is not None else 'unknown'
+
+    def choose(self, estimate) -> str:
+        """Tier for an estimate; unknown costs go to the light warehouse until they have history"""
+        if estimate is not None and estimate >= self.heavy_after.total_seconds():
+            return 'heavy'
+        return 'light'
+
+    def route(self, session, warehouse: str):
+        """(session-like object whose queries run on ``warehouse``, whether the backend has warehouses)"""
+        if not hasattr(session, 'use_warehouse'):
+            return session, False
+        if hasattr(session, 'bound'):
+            return session.bound(warehouse=warehouse), True
+        return WarehouseSession(session, warehouse, self._submit_lock), True
+
+    def run(self, session, loader, query: str, params=None, execute=None) -> pd.DataFrame:
+        """Run a query on the warehouse its estimated cost calls for, recording how long it took"""
+        key = (loader, query_shape(query))
+        estimate, source = self.estimate(session, key, query, params)
+        tier = self.choose(estimate)
+        warehouse = self.tiers[tier][0]
+        routed, applied = self.route(session, warehouse)
+        logger.info("Routing %s to %s (%s estimate %s)", loader or 'query', warehouse, source,
+                    'n/a' if estimate is None else f"{estimate:.2f} s")
+        frame = routed.sql(query, params=params)
+        started = self._clock()
+        outcome = 'ok'
+        try:
+            return execute(frame, query) if execute is not None else frame.to_pandas()
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            elapsed = self._clock() - started
+            with self._lock:
+                # Normalized to the light warehouse, so estimates compare across tiers
+                history = self._history.get(key) or deque(maxlen=HISTORY_SIZE)
+                history.append(elapsed * self._nodes(tier) / self._nodes('light'))
+                _bounded_put(self._history, key, history, MAX_QUERIES)
+                self._recent.append((datetime.now(), loader or '-', warehouse, tier, source,
+                                     estimate, round(elapsed, 3), outcome, applied))
+            logger.info("%s on %s: %s in %.2f s", loader or 'query', warehouse, outcome, elapsed)
+
+    def recent(self) -> pd.DataFrame:
+        """The most recent routing decisions and outcomes, newest first"""
+        with self._lock:
+            rows = list(self._recent)[::-1]
+        return pd.DataFrame(rows, columns=['At', 'Loader', 'Warehouse', 'Tier', 'Estimate from', 'Estimate (s)',
+                                           'Elapsed (s)', 'Outcome', 'Applied'])